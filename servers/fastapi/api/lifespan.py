@@ -3,7 +3,21 @@ import os
 
 from fastapi import FastAPI
 
+from api.v1.ppt.endpoints.presentation import get_presentation_generation_worker
+from crud.asset_crud import asset_crud
+from crud.generation_checkpoint_crud import generation_checkpoint_crud
+from crud.llm_cache_crud import llm_cache_crud
+from crud.task_crud import task_crud
 from db.mongo import connect_to_mongo, close_mongo_connection
+from services.event_loop_monitor import (
+    EVENT_LOOP_MONITOR,
+    is_event_loop_monitor_enabled,
+)
+from services.executor_service import EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.image_transform_cache_service import IMAGE_TRANSFORM_CACHE_SERVICE
+from services.llm_sdk_client_registry import LLM_SDK_CLIENT_REGISTRY
+from services.task_queue_worker import is_in_process_worker_enabled
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -15,17 +29,52 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and connects to MongoDB.
+    Runs a task queue worker unless workers are deployed separately.
+    Samples the event loop lag unless the monitor is disabled.
+    Prunes the image transform cache.
+    Creates the shared HTTP sessions used for outbound calls.
+    Closes the LLM provider clients, the HTTP sessions and the executor pools on shutdown.
 
     """
     app_data_dir = get_app_data_directory_env() or "./app_data"
     os.makedirs(app_data_dir, exist_ok=True)
+
+    if is_event_loop_monitor_enabled():
+        EVENT_LOOP_MONITOR.start()
     
+    HTTP_CLIENT_SERVICE.start()
+
     # Connect to MongoDB
     await connect_to_mongo()
+    await llm_cache_crud.ensure_indexes()
+    await task_crud.ensure_indexes()
+    await generation_checkpoint_crud.ensure_indexes()
+    await asset_crud.ensure_image_cache_indexes()
+    await EXECUTOR_SERVICE.io.run(IMAGE_TRANSFORM_CACHE_SERVICE.prune)
+
+    presentation_generation_worker = None
+    if is_in_process_worker_enabled():
+        presentation_generation_worker = get_presentation_generation_worker()
+        presentation_generation_worker.start()
     
     # Temporarily disabled to debug startup issues
     # await check_llm_and_image_provider_api_or_model_availability()
     yield
+
+    # Running tasks are handed back to the queue for other workers
+    if presentation_generation_worker:
+        await presentation_generation_worker.stop()
     
+    # Close LLM provider clients and their connection pools
+    await LLM_SDK_CLIENT_REGISTRY.close()
+
+    # Close the shared HTTP sessions and their connection pools
+    await HTTP_CLIENT_SERVICE.close()
+
+    # Stop the threads and processes running blocking work
+    EXECUTOR_SERVICE.shutdown()
+
     # Close MongoDB connection
     await close_mongo_connection()
+
+    await EVENT_LOOP_MONITOR.stop()
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends
+
+from auth.dependencies import get_current_active_user
+from crud.task_crud import task_crud
+from models.mongo.task import TaskType
+from services.event_loop_monitor import EVENT_LOOP_MONITOR
+from services.executor_service import EXECUTOR_SERVICE
+from services.generation_checkpoint_service import GENERATION_CHECKPOINT_METRICS
+from services.image_cache_service import IMAGE_CACHE_SERVICE
+from services.image_transform_cache_service import IMAGE_TRANSFORM_CACHE_SERVICE
+from services.llm_client import LLM_RATE_LIMITERS, LLM_ROUTER, LLM_USAGE_TRACKER
+from services.slide_content_cache_service import SLIDE_CONTENT_CACHE_SERVICE
+from services.speculative_layout_selector import SPECULATIVE_LAYOUT_METRICS
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(get_current_active_user)],
+)
+
+
+@router.get("/llm")
+async def llm_metrics():
+    """Queue depth, in-flight calls and wait times of the LLM rate limiters"""
+    return {
+        provider.value: limiter.get_metrics()
+        for provider, limiter in LLM_RATE_LIMITERS.items()
+    }
+
+
+@router.get("/llm_routes")
+async def llm_route_metrics():
+    """Rolling latency and error rate of each LLM route, failovers and hedged calls"""
+    return LLM_ROUTER.get_metrics()
+
+
+@router.get("/llm_usage")
+async def llm_usage_metrics():
+    """Input, cached input and output tokens reported by the LLM providers"""
+    return LLM_USAGE_TRACKER.get_metrics()
+
+
+@router.get("/slide_content_cache")
+async def slide_content_cache_metrics():
+    """Hit and miss counters of the slide content cache"""
+    return SLIDE_CONTENT_CACHE_SERVICE.get_metrics()
+
+
+@router.get("/image_cache")
+async def image_cache_metrics():
+    """Provider images read from the image cache, stored and evicted"""
+    return IMAGE_CACHE_SERVICE.get_metrics()
+
+
+@router.get("/image_transform_cache")
+async def image_transform_cache_metrics():
+    """Picture transforms of exported decks read from the cache or shared by pictures"""
+    return IMAGE_TRANSFORM_CACHE_SERVICE.get_metrics()
+
+
+@router.get("/speculative_layout")
+async def speculative_layout_metrics():
+    """How often layouts picked while outlines were streaming were kept"""
+    return SPECULATIVE_LAYOUT_METRICS.get_metrics()
+
+
+@router.get("/task_queue")
+async def task_queue_metrics():
+    """Queued presentation generation tasks by status"""
+    return await task_crud.get_queue_metrics(TaskType.PRESENTATION_GENERATION)
+
+
+@router.get("/generation_checkpoints")
+async def generation_checkpoint_metrics():
+    """Slides saved as they complete and reused by resumed generations"""
+    return GENERATION_CHECKPOINT_METRICS.get_metrics()
+
+
+@router.get("/event_loop")
+async def event_loop_metrics():
+    """Lag histogram of the event loop, and the blocking calls caught in debug mode"""
+    return EVENT_LOOP_MONITOR.get_metrics()
+
+
+@router.get("/executors")
+async def executor_metrics():
+    """Size, queue depth and wait times of the pools running blocking work"""
+    return EXECUTOR_SERVICE.get_metrics()
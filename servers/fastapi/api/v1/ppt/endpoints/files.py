@@ -5,9 +5,11 @@ from fastapi import APIRouter, Body, File, UploadFile
 
 from constants.documents import UPLOAD_ACCEPTED_FILE_TYPES
 from models.decomposed_file_info import DecomposedFileInfo
+from services.executor_service import EXECUTOR_SERVICE
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.documents_loader import DocumentsLoader
 import uuid
+from utils.file_utils import write_file
 from utils.validators import validate_files
 
 FILES_ROUTER = APIRouter(prefix="/files", tags=["Files"])
@@ -28,9 +30,8 @@ async def upload_files(files: Optional[List[UploadFile]]):
             temp_path = TEMP_FILE_SERVICE.create_temp_file_path(
                 each_file.filename, temp_dir
             )
-            with open(temp_path, "wb") as f:
-                content = await each_file.read()
-                f.write(content)
+            content = await each_file.read()
+            await EXECUTOR_SERVICE.io.run(write_file, temp_path, content)
 
             temp_files.append(temp_path)
 
@@ -59,8 +60,7 @@ async def decompose_files(file_paths: Annotated[List[str], Body(embed=True)]):
             f"{uuid.uuid4()}.txt", temp_dir
         )
         parsed_doc = parsed_doc.replace("<br>", "\n")
-        with open(file_path, "w") as text_file:
-            text_file.write(parsed_doc)
+        await EXECUTOR_SERVICE.io.run(write_file, file_path, parsed_doc.encode())
         response.append(
             DecomposedFileInfo(
                 name=os.path.basename(other_files[index]), file_path=file_path
@@ -81,7 +81,6 @@ async def update_files(
     file_path: Annotated[str, Body()],
     file: Annotated[UploadFile, File()],
 ):
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    await EXECUTOR_SERVICE.io.run(write_file, file_path, await file.read())
 
     return {"message": "File updated successfully"}
@@ -1,11 +1,12 @@
 import os
 import uuid
-import shutil
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, File, UploadFile
 from pydantic import BaseModel
+from services.executor_service import EXECUTOR_SERVICE
 from utils.asset_directory_utils import get_app_data_directory_env
+from utils.file_utils import write_file
 import uuid
 
 try:
@@ -164,8 +165,7 @@ async def upload_font(
         font_path = os.path.join(fonts_dir, unique_filename)
         
         # Save the uploaded file
-        with open(font_path, "wb") as buffer:
-            shutil.copyfileobj(font_file.file, buffer)
+        await EXECUTOR_SERVICE.io.run(write_file, font_path, await font_file.read())
         
         # Generate accessible URL
         font_url = f"/app_data/fonts/{unique_filename}"
@@ -3,12 +3,13 @@ from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
 from models.image_prompt import ImagePrompt
 from models.mongo.asset import Asset, AssetCreate
 from crud.asset_crud import asset_crud
+from services.executor_service import EXECUTOR_SERVICE
 from services.image_generation_service import ImageGenerationService
 from services.s3_service import s3_service
 from utils.asset_directory_utils import get_images_directory
 import os
 import uuid
-from utils.file_utils import get_file_name_with_random_uuid
+from utils.file_utils import get_file_name_with_random_uuid, write_file
 from auth.dependencies import get_current_active_user
 from models.mongo.user import User
 
@@ -18,11 +19,14 @@ IMAGES_ROUTER = APIRouter(prefix="/images", tags=["Images"])
 @IMAGES_ROUTER.get("/generate")
 async def generate_image(
     prompt: str, 
+    use_cache: bool = True,
     current_user: User = Depends(get_current_active_user)
 ):
     images_directory = get_images_directory()
     image_prompt = ImagePrompt(prompt=prompt)
-    image_generation_service = ImageGenerationService(images_directory)
+    image_generation_service = ImageGenerationService(
+        images_directory, use_image_cache=use_cache
+    )
 
     image = await image_generation_service.generate_image(image_prompt)
     if not isinstance(image, Asset):
@@ -72,10 +76,11 @@ async def upload_image(
         
         try:
             # Upload to S3
-            s3_url = s3_service.upload_file_from_bytes(
-                file_content, 
-                new_filename, 
-                content_type
+            s3_url = await EXECUTOR_SERVICE.io.run(
+                s3_service.upload_file_from_bytes,
+                file_content,
+                new_filename,
+                content_type,
             )
             print(f"✅ IMAGE UPLOAD: Successfully uploaded to S3: {s3_url}")
             
@@ -99,8 +104,7 @@ async def upload_image(
                 get_images_directory(), os.path.basename(new_filename)
             )
 
-            with open(image_path, "wb") as f:
-                f.write(file_content)
+            await EXECUTOR_SERVICE.io.run(write_file, image_path, file_content)
 
             # Convert absolute path to relative path for static serving
             from utils.get_env import get_app_data_directory_env
@@ -166,7 +170,7 @@ async def delete_uploaded_image_by_id(
             # Delete from S3
             s3_key = s3_service.extract_s3_key_from_url(image.file_path)
             if s3_key:
-                s3_service.delete_file(s3_key)
+                await EXECUTOR_SERVICE.io.run(s3_service.delete_file, s3_key)
                 print(f"🗑️ IMAGE DELETE: Deleted from S3: {s3_key}")
             else:
                 print(f"⚠️ IMAGE DELETE: Could not extract S3 key from URL: {image.file_path}")
@@ -178,8 +182,9 @@ async def delete_uploaded_image_by_id(
             else:
                 print(f"⚠️ IMAGE DELETE: Local file not found: {image.file_path}")
         
-        # Delete from database
+        # Delete from database, with the cached images pointing to the file
         await asset_crud.delete_asset(str(id))
+        await asset_crud.delete_image_cache_entries_by_file_path(image.file_path)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete image: {str(e)}")
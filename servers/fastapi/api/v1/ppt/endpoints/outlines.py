@@ -1,4 +1,5 @@
 import asyncio
+from contextlib import aclosing
 import json
 import math
 import traceback
@@ -19,6 +20,7 @@ from crud.presentation_crud import presentation_crud
 from services.documents_loader import DocumentsLoader
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
+from utils.streaming_json_parser import StreamingJsonParser
 from auth.dependencies import get_current_active_user, get_current_active_user_with_query_fallback
 from models.mongo.user import User
 
@@ -54,7 +56,8 @@ async def stream_outlines(
             if documents:
                 additional_context = "\n\n".join(documents)
 
-        presentation_outlines_text = ""
+        # Outlines are parsed as they stream, so each is sent once its object closes
+        outlines_parser = StreamingJsonParser(array_key="slides")
 
         n_slides_to_generate = presentation.n_slides
         if presentation.include_table_of_contents:
@@ -63,30 +66,45 @@ async def stream_outlines(
                 (presentation.n_slides - needed_toc_count) / 10
             )
 
-        async for chunk in generate_ppt_outline(
-            presentation.content,
-            n_slides_to_generate,
-            presentation.language,
-            additional_context,
-            presentation.tone,
-            presentation.verbosity,
-            presentation.instructions,
-            presentation.include_title_slide,
-            presentation.web_search,
-        ):
-            # Give control to the event loop
-            await asyncio.sleep(0)
-
-            if isinstance(chunk, HTTPException):
-                yield SSEErrorResponse(detail=chunk.detail).to_string()
-                return
-
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": chunk}),
-            ).to_string()
+        async with aclosing(
+            generate_ppt_outline(
+                presentation.content,
+                n_slides_to_generate,
+                presentation.language,
+                additional_context,
+                presentation.tone,
+                presentation.verbosity,
+                presentation.instructions,
+                presentation.include_title_slide,
+                presentation.web_search,
+            )
+        ) as outline_stream:
+            async for chunk in outline_stream:
+                # Give control to the event loop
+                await asyncio.sleep(0)
+
+                if isinstance(chunk, HTTPException):
+                    yield SSEErrorResponse(detail=chunk.detail).to_string()
+                    return
+
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": chunk}),
+                ).to_string()
+
+                for outline in outlines_parser.feed(chunk):
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps(
+                            {
+                                "type": "outline",
+                                "index": len(outlines_parser.items) - 1,
+                                "outline": outline,
+                            }
+                        ),
+                    ).to_string()
 
-            presentation_outlines_text += chunk
+        presentation_outlines_text = outlines_parser.text
 
         try:
             # Add defensive logging
@@ -94,9 +112,22 @@ async def stream_outlines(
             
             # Try to parse as JSON first
             try:
-                presentation_outlines_json = dict(
-                    dirtyjson.loads(presentation_outlines_text)
-                )
+                if (
+                    outlines_parser.is_complete
+                    and len(outlines_parser.items) == n_slides_to_generate
+                ):
+                    # Already parsed while streaming
+                    presentation_outlines_json = {"slides": outlines_parser.items}
+                elif outlines_parser.is_complete:
+                    # Some streamed items failed to parse, the whole object is
+                    # parsed again leniently so none of them are lost
+                    presentation_outlines_json = dict(
+                        dirtyjson.loads(outlines_parser.root_text)
+                    )
+                else:
+                    presentation_outlines_json = dict(
+                        dirtyjson.loads(presentation_outlines_text)
+                    )
                 
                 # Check if the JSON has the expected structure
                 if "slides" not in presentation_outlines_json:
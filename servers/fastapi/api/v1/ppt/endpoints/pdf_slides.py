@@ -7,7 +7,9 @@ from fastapi import APIRouter, UploadFile, File, HTTPException
 from pydantic import BaseModel
 
 from services.documents_loader import DocumentsLoader
+from services.executor_service import EXECUTOR_SERVICE
 from utils.asset_directory_utils import get_images_directory
+from utils.file_utils import write_file
 import uuid
 from constants.documents import PDF_MIME_TYPES
 
@@ -63,9 +65,8 @@ async def process_pdf_slides(
         try:
             # Save uploaded PDF file
             pdf_path = os.path.join(temp_dir, "presentation.pdf")
-            with open(pdf_path, "wb") as f:
-                pdf_content = await pdf_file.read()
-                f.write(pdf_content)
+            pdf_content = await pdf_file.read()
+            await EXECUTOR_SERVICE.io.run(write_file, pdf_path, pdf_content)
 
             # Generate screenshots from PDF using ImageMagick
             screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
@@ -93,7 +94,9 @@ async def process_pdf_slides(
                     and os.path.getsize(screenshot_path) > 0
                 ):
                     # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
+                    await EXECUTOR_SERVICE.io.run(
+                        shutil.copy2, screenshot_path, permanent_screenshot_path
+                    )
                     screenshot_url = (
                         f"/app_data/images/{presentation_id}/{screenshot_filename}"
                     )
@@ -13,7 +13,10 @@ import xml.etree.ElementTree as ET
 import re
 
 from services.documents_loader import DocumentsLoader
+from services.executor_service import EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
 from utils.asset_directory_utils import get_images_directory
+from utils.file_utils import write_file
 import uuid
 from constants.documents import POWERPOINT_TYPES
 
@@ -229,11 +232,11 @@ async def check_google_font_availability(font_name: str) -> bool:
         formatted_name = font_name.replace(" ", "+")
         url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
+        session = HTTP_CLIENT_SERVICE.get_session(trust_env=True)
+        async with session.head(
+            url, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            return response.status == 200
 
     except Exception as e:
         print(f"Error checking Google Font availability for {font_name}: {e}")
@@ -324,16 +327,17 @@ async def process_pptx_slides(
         if True:
             # Save uploaded PPTX file
             pptx_path = os.path.join(temp_dir, "presentation.pptx")
-            with open(pptx_path, "wb") as f:
-                pptx_content = await pptx_file.read()
-                f.write(pptx_content)
+            pptx_content = await pptx_file.read()
+            await EXECUTOR_SERVICE.io.run(write_file, pptx_path, pptx_content)
 
             # Install fonts if provided
             if fonts:
                 await _install_fonts(fonts, temp_dir)
 
             # Extract slide XMLs from PPTX
-            slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+            slide_xmls = await EXECUTOR_SERVICE.io.run(
+                _extract_slide_xmls, pptx_path, temp_dir
+            )
 
             # Convert PPTX to PDF
             pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir)
@@ -372,7 +376,9 @@ async def process_pptx_slides(
                     and os.path.getsize(screenshot_path) > 0
                 ):
                     # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
+                    await EXECUTOR_SERVICE.io.run(
+                        shutil.copy2, screenshot_path, permanent_screenshot_path
+                    )
                     screenshot_url = (
                         f"/app_data/images/{presentation_id}/{screenshot_filename}"
                     )
@@ -424,12 +430,13 @@ async def process_pptx_fonts(
     with tempfile.TemporaryDirectory() as temp_dir:
         # Save uploaded PPTX file
         pptx_path = os.path.join(temp_dir, "presentation.pptx")
-        with open(pptx_path, "wb") as f:
-            pptx_content = await pptx_file.read()
-            f.write(pptx_content)
+        pptx_content = await pptx_file.read()
+        await EXECUTOR_SERVICE.io.run(write_file, pptx_path, pptx_content)
 
         # Extract slide XMLs from PPTX
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        slide_xmls = await EXECUTOR_SERVICE.io.run(
+            _extract_slide_xmls, pptx_path, temp_dir
+        )
 
         # Analyze fonts across all slides (same logic as in /pptx-slides)
         font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
@@ -486,23 +493,20 @@ async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
     for font_file in fonts:
         # Save font file
         font_path = os.path.join(fonts_dir, font_file.filename)
-        with open(font_path, "wb") as f:
-            font_content = await font_file.read()
-            f.write(font_content)
+        font_content = await font_file.read()
+        await EXECUTOR_SERVICE.io.run(write_file, font_path, font_content)
 
         # Install font (copy to system fonts directory)
         try:
-            subprocess.run(
-                ["cp", font_path, "/usr/share/fonts/truetype/"],
-                check=True,
-                capture_output=True,
+            await EXECUTOR_SERVICE.libreoffice.run_subprocess(
+                ["cp", font_path, "/usr/share/fonts/truetype/"]
             )
         except subprocess.CalledProcessError as e:
             print(f"Warning: Failed to install font {font_file.filename}: {e}")
 
     # Refresh font cache
     try:
-        subprocess.run(["fc-cache", "-f", "-v"], check=True, capture_output=True)
+        await EXECUTOR_SERVICE.libreoffice.run_subprocess(["fc-cache", "-f", "-v"])
     except subprocess.CalledProcessError as e:
         print(f"Warning: Failed to refresh font cache: {e}")
 
@@ -550,7 +554,9 @@ async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
 
     try:
         # First, get the number of slides by extracting XMLs
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        slide_xmls = await EXECUTOR_SERVICE.io.run(
+            _extract_slide_xmls, pptx_path, temp_dir
+        )
         slide_count = len(slide_xmls)
 
         # Build font alias config to force variant families to resolve to normalized root families
@@ -558,7 +564,9 @@ async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
         for xml in slide_xmls:
             raw_fonts.extend(extract_fonts_from_oxml(xml))
         raw_fonts = list({f for f in raw_fonts if f})
-        fonts_conf_path = _create_font_alias_config(raw_fonts)
+        fonts_conf_path = await EXECUTOR_SERVICE.io.run(
+            _create_font_alias_config, raw_fonts
+        )
         env = os.environ.copy()
         env["FONTCONFIG_FILE"] = fonts_conf_path
 
@@ -570,7 +578,7 @@ async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
         pdf_path = os.path.join(screenshots_dir, pdf_filename)
 
         try:
-            result = subprocess.run(
+            result = await EXECUTOR_SERVICE.libreoffice.run_subprocess(
                 [
                     "libreoffice",
                     "--headless",
@@ -580,9 +588,6 @@ async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
                     screenshots_dir,
                     pptx_path,
                 ],
-                check=True,
-                capture_output=True,
-                text=True,
                 timeout=500,
                 env=env,
             )
@@ -1,20 +1,22 @@
 import asyncio
+from contextlib import aclosing
 from datetime import datetime, timezone
 import json
 import math
 import os
 import random
+import time
 import traceback
 import logging
-from typing import Annotated, List, Literal, Optional, Tuple
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path
 from fastapi.responses import StreamingResponse
 from fastapi.encoders import jsonable_encoder
 from crud.presentation_crud import presentation_crud
 from crud.slide_crud import slide_crud
 from crud.template_crud import template_crud
-from crud import task_crud
+from crud.task_crud import task_crud
 from auth.dependencies import get_current_active_user, get_current_active_user_with_query_fallback
 from models.mongo.user import User
 from constants.presentation import DEFAULT_TEMPLATES
@@ -38,8 +40,13 @@ from models.presentation_with_slides import (
 from models.mongo.template import Template
 
 from services.documents_loader import DocumentsLoader
+from services.generation_checkpoint_service import (
+    GenerationCheckpoints,
+    get_slide_fingerprint,
+)
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
+from services.asset_fetch_deduplicator import AssetFetchDeduplicator
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
 from utils.export_utils import export_presentation
@@ -47,17 +54,26 @@ from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from models.mongo.slide import Slide, SlideCreate, SlideUpdateFromFrontend
 from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
 
+from services.speculative_layout_selector import (
+    SpeculativeLayoutSelector,
+    is_speculative_layout_selection_enabled,
+)
+from services.task_queue_worker import TaskQueueWorker, get_task_queue_max_attempts
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
 from models.mongo.presentation import Presentation, PresentationCreate, PresentationUpdate
 from services.pptx_presentation_creator import PptxPresentationCreator
-from models.mongo.task import Task
+from models.mongo.task import Task, TaskCreate, TaskInDB, TaskType, TaskUpdate
 from utils.asset_directory_utils import get_exports_directory, get_images_directory
+from utils.async_iterator import map_in_order, map_in_order_with_progress
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
 )
 from utils.llm_calls.generate_slide_content import (
     get_slide_content_from_type_and_outline,
+    get_failed_slide_content,
+    get_slides_content_from_types_and_outlines,
+    stream_slide_content_with_retries,
 )
 from utils.ppt_utils import (
     get_presentation_title_from_outlines,
@@ -67,6 +83,13 @@ from utils.process_slides import (
     process_slide_add_placeholder_assets,
     process_slide_and_fetch_assets,
 )
+from utils.slide_generation_utils import (
+    get_global_slide_generation_semaphore,
+    get_slide_generation_batch_size,
+    get_slide_generation_concurrency,
+    get_slide_generation_window_size,
+)
+from utils.streaming_json_parser import StreamingJsonParser
 import uuid
 
 # Set up logger
@@ -408,7 +431,11 @@ async def prepare_presentation(
 
 @PRESENTATION_ROUTER.get("/stream/{id}", response_model=PresentationWithSlides)
 async def stream_presentation(
-    id: str, current_user: User = Depends(get_current_active_user_with_query_fallback)
+    id: str,
+    use_cache: bool = True,
+    resume: bool = False,
+    allow_partial: bool = True,
+    current_user: User = Depends(get_current_active_user_with_query_fallback),
 ):
     presentation = await presentation_crud.get_presentation_by_id(id)
     if not presentation:
@@ -464,61 +491,160 @@ async def stream_presentation(
             event="response",
             data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
         ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
-            slide_layout = layout.slides[slide_layout_index]
 
-            try:
-                slide_content = await get_slide_content_from_type_and_outline(
-                    slide_layout,
+        slide_layouts = [layout.slides[index] for index in structure.slides]
+
+        # Finished slides are saved as they complete, so a failed stream can be
+        # resumed with only the missing slides generated again
+        checkpoints = GenerationCheckpoints(id)
+        await checkpoints.load_slides(
+            [
+                get_slide_fingerprint(
+                    slide_layouts[i],
                     outline.slides[i],
                     presentation.language,
                     presentation.tone,
                     presentation.verbosity,
                     presentation.instructions,
                 )
-            except HTTPException as e:
-                yield SSEErrorResponse(detail=e.detail).to_string()
-                return
+                for i in range(len(slide_layouts))
+            ],
+            resume,
+        )
 
-            slide = Slide(
-                presentation_id=id,
-                slide_number=i,
-                layout=slide_layout.id,
-                layout_group=layout.name,
-                notes=slide_content.get("__speaker_note__", slide_content.get("speaker_note", "")),
-                content=json.dumps(slide_content),  # Convert dict to JSON string
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc),
-            )
-            slides.append(slide)
+        # Slides that still fail after their retries, by slide number
+        failed_slides: Dict[int, str] = {}
 
-            # This will mutate slide and add placeholder assets
-            process_slide_add_placeholder_assets(slide)
-            print(f"🖼️ Added placeholder assets to slide {i}")
+        async def generate_slide_content(i: int, report_progress):
+            slide_content = checkpoints.get_content(i)
+            if slide_content:
+                return slide_content
 
-            # This will mutate slide
-            print(f"🖼️ Starting image generation for slide {i}")
-            async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
+            try:
+                async with aclosing(
+                    stream_slide_content_with_retries(
+                        slide_layouts[i],
+                        outline.slides[i],
+                        presentation.language,
+                        presentation.tone,
+                        presentation.verbosity,
+                        presentation.instructions,
+                        use_cache,
+                    )
+                ) as slide_stream:
+                    async for each in slide_stream:
+                        if isinstance(each, str):
+                            report_progress(each)
+                        else:
+                            slide_content = each
+            except Exception as e:
+                if not allow_partial:
+                    raise
+                # The other slides carry on, this one can be regenerated later
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                print(f"❌ Slide {i} failed to generate: {detail}")
+                failed_slides[i] = detail
+                return get_failed_slide_content(slide_layouts[i], outline.slides[i], detail)
+
+            await checkpoints.save_content(i, slide_content)
+            return slide_content
+
+        # Slides asking for the same image or icon share one request
+        asset_deduplicator = AssetFetchDeduplicator(image_generation_service)
+
+        async def fetch_slide_assets(slide: Slide):
+            assets = await process_slide_and_fetch_assets(
+                image_generation_service, slide, asset_deduplicator
+            )
+            await checkpoints.save_completed(slide.slide_number, json.loads(slide.content))
+            return assets
+
+        # Slides are generated concurrently and their partial content is forwarded
+        # as it arrives, but complete slides are streamed in slide order
+        async with aclosing(
+            map_in_order_with_progress(
+                generate_slide_content,
+                range(len(slide_layouts)),
+                get_slide_generation_concurrency(),
+                get_global_slide_generation_semaphore(),
             )
+        ) as slide_events:
+            while True:
+                try:
+                    i, slide_content, is_complete = await anext(slide_events)
+                except StopAsyncIteration:
+                    break
+                except HTTPException as e:
+                    yield SSEErrorResponse(detail=e.detail).to_string()
+                    return
+
+                if not is_complete:
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps(
+                            {"type": "slide_chunk", "index": i, "chunk": slide_content}
+                        ),
+                    ).to_string()
+                    continue
+
+                if i in failed_slides:
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps(
+                            {"type": "slide_failed", "index": i, "detail": failed_slides[i]}
+                        ),
+                    ).to_string()
 
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
-            ).to_string()
+                slide_layout = slide_layouts[i]
+                slide = Slide(
+                    presentation_id=id,
+                    slide_number=i,
+                    layout=slide_layout.id,
+                    layout_group=layout.name,
+                    notes=slide_content.get("__speaker_note__", slide_content.get("speaker_note", "")),
+                    content=json.dumps(slide_content),  # Convert dict to JSON string
+                    created_at=datetime.now(timezone.utc),
+                    updated_at=datetime.now(timezone.utc),
+                )
+                slides.append(slide)
+
+                # Assets of a slide completed by an earlier attempt are in its content
+                if not checkpoints.is_completed(i):
+                    # This will mutate slide and add placeholder assets
+                    process_slide_add_placeholder_assets(slide)
+                    print(f"🖼️ Added placeholder assets to slide {i}")
+
+                    # This will mutate slide
+                    print(f"🖼️ Starting image generation for slide {i}")
+                    async_assets_generation_tasks.append(fetch_slide_assets(slide))
+
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
+                ).to_string()
 
         yield SSEResponse(
             event="response",
             data=json.dumps({"type": "chunk", "chunk": " ] }"}),
         ).to_string()
 
+        if slides and len(failed_slides) == len(slides):
+            yield SSEErrorResponse(detail=next(iter(failed_slides.values()))).to_string()
+            return
+
         print(f"🖼️ Waiting for {len(async_assets_generation_tasks)} asset generation tasks to complete...")
-        generated_assets_lists = await asyncio.gather(*async_assets_generation_tasks)
+        try:
+            generated_assets_lists = await asyncio.gather(
+                *async_assets_generation_tasks
+            )
+        finally:
+            asset_deduplicator.cancel()
         generated_assets = []
         for assets_list in generated_assets_lists:
             generated_assets.extend(assets_list)
 
         print(f"🖼️ Asset generation completed. Generated {len(generated_assets)} assets")
+        print(f"🖼️ Asset requests: {asset_deduplicator.get_metrics()}")
         print(f"🖼️ Sending updated slides with real images to frontend")
         for slide in slides:
             yield SSEResponse(
@@ -546,6 +672,8 @@ async def stream_presentation(
             )
             await slide_crud.create_slide(slide_create)
 
+        await checkpoints.clear()
+
         # Auto-save to presentation_final_edits collection when generation is complete
         try:
             from crud.presentation_final_edit_crud import presentation_final_edit_crud
@@ -601,7 +729,11 @@ async def stream_presentation(
 
         yield SSECompleteResponse(
             key="presentation",
-            value=response.model_dump(mode="json"),
+            value={
+                **response.model_dump(mode="json"),
+                # Placeholders of these slides are saved, regenerate them with /slide/regenerate
+                "failed_slides": sorted(failed_slides),
+            },
         ).to_string()
 
     return StreamingResponse(inner(), media_type="text/event-stream")
@@ -703,13 +835,12 @@ async def export_presentation_as_pptx(
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
     pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
 
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
+    await pptx_creator.create_and_save(pptx_path)
 
     return pptx_path
 
@@ -787,9 +918,10 @@ async def check_if_api_request_is_valid(
 async def generate_presentation_handler(
     request: GeneratePresentationRequest,
     presentation_id: str,
-    async_status: Optional[Task],
+    async_status: Optional[TaskInDB],
     current_user: User = Depends(get_current_active_user),
 ):
+    speculative_layout_selector: Optional[SpeculativeLayoutSelector] = None
     try:
         using_slides_markdown = False
 
@@ -797,14 +929,24 @@ async def generate_presentation_handler(
             using_slides_markdown = True
             request.n_slides = len(request.slides_markdown)
 
-        if not using_slides_markdown:
+        # Parse Layouts
+        layout_model = await get_layout_by_name(request.template)
+        total_slide_layouts = len(layout_model.slides)
+
+        # A retried task continues from the outlines, layouts and slides of its earlier attempts
+        checkpoints = GenerationCheckpoints(presentation_id)
+        resume = bool(async_status and async_status.attempts > 1)
+        plan = await checkpoints.load_plan() if resume else None
+
+        if plan:
+            presentation_outlines, presentation_structure = plan
+            print("Resuming with the outlines and layouts of an earlier attempt")
+
+        elif not using_slides_markdown:
             additional_context = ""
 
             # Updating async status
-            if async_status:
-                async_status.message = "Generating presentation outlines"
-                async_status.updated_at = datetime.now()
-                await task_crud.update_task(str(async_status.id), async_status)
+            await update_async_status(async_status, message="Generating presentation outlines")
 
             if request.files:
                 documents_loader = DocumentsLoader(file_paths=request.files)
@@ -828,23 +970,46 @@ async def generate_presentation_handler(
                     (request.n_slides - needed_toc_count) / 10
                 )
 
-            presentation_outlines_text = ""
-            async for chunk in generate_ppt_outline(
-                request.content,
-                n_slides_to_generate,
-                request.language,
-                additional_context,
-                request.tone.value,
-                request.verbosity.value,
-                request.instructions,
-                request.include_title_slide,
-                request.web_search,
+            # Layouts are picked for the outlines while the rest are still streaming
+            outlines_parser = StreamingJsonParser(array_key="slides")
+            if (
+                is_speculative_layout_selection_enabled()
+                and not layout_model.ordered
             ):
+                speculative_layout_selector = SpeculativeLayoutSelector(
+                    layout_model, request.instructions
+                )
+
+            # Chunks are joined once the stream ends instead of on every chunk
+            outline_chunks = []
+            async with aclosing(
+                generate_ppt_outline(
+                    request.content,
+                    n_slides_to_generate,
+                    request.language,
+                    additional_context,
+                    request.tone.value,
+                    request.verbosity.value,
+                    request.instructions,
+                    request.include_title_slide,
+                    request.web_search,
+                )
+            ) as outline_stream:
+                async for chunk in outline_stream:
+
+                    if isinstance(chunk, HTTPException):
+                        raise chunk
 
-                if isinstance(chunk, HTTPException):
-                    raise chunk
+                    outline_chunks.append(chunk)
 
-                presentation_outlines_text += chunk
+                    if speculative_layout_selector:
+                        for outline in outlines_parser.feed(chunk):
+                            if isinstance(outline, dict) and "content" in outline:
+                                speculative_layout_selector.add_outline(
+                                    SlideOutlineModel(content=str(outline["content"]))
+                                )
+
+            presentation_outlines_text = "".join(outline_chunks)
 
             try:
                 # Add defensive logging
@@ -889,77 +1054,77 @@ async def generate_presentation_handler(
             )
             total_outlines = len(request.slides_markdown)
 
-        # Updating async status
-        if async_status:
-            async_status.message = f"Selecting layout for each slide"
-            async_status.updated_at = datetime.now()
-            await task_crud.update_task(str(async_status.id), async_status)
-
-        print("-" * 40)
-        print(f"Generated {total_outlines} outlines for the presentation")
+        if not plan:
+            # Updating async status
+            await update_async_status(async_status, message="Selecting layout for each slide")
 
-        # Parse Layouts
-        layout_model = await get_layout_by_name(request.template)
-        total_slide_layouts = len(layout_model.slides)
+            print("-" * 40)
+            print(f"Generated {total_outlines} outlines for the presentation")
 
-        # Generate Structure
-        if layout_model.ordered:
-            presentation_structure = layout_model.to_presentation_structure()
-        else:
-            presentation_structure: PresentationStructureModel = (
-                await generate_presentation_structure(
-                    presentation_outlines,
-                    layout_model,
-                    request.instructions,
-                    using_slides_markdown,
+            # Generate Structure
+            if layout_model.ordered:
+                presentation_structure = layout_model.to_presentation_structure()
+            elif speculative_layout_selector:
+                presentation_structure = await speculative_layout_selector.reconcile(
+                    presentation_outlines
                 )
-            )
-
-        presentation_structure.slides = presentation_structure.slides[:total_outlines]
-        for index in range(total_outlines):
-            random_slide_index = random.randint(0, total_slide_layouts - 1)
-            if index >= total_outlines:
-                presentation_structure.slides.append(random_slide_index)
-                continue
-            if presentation_structure.slides[index] >= total_slide_layouts:
-                presentation_structure.slides[index] = random_slide_index
-
-        # Injecting table of contents to the presentation structure and outlines
-        if request.include_table_of_contents and not using_slides_markdown:
-            n_toc_slides = request.n_slides - total_outlines
-            toc_slide_layout_index = select_toc_or_list_slide_layout_index(layout_model)
-            if toc_slide_layout_index != -1:
-                outline_index = 1 if request.include_title_slide else 0
-                for i in range(n_toc_slides):
-                    outlines_to = outline_index + 10
-                    if total_outlines == outlines_to:
-                        outlines_to -= 1
-
-                    presentation_structure.slides.insert(
-                        i + 1 if request.include_title_slide else i,
-                        toc_slide_layout_index,
+            else:
+                presentation_structure: PresentationStructureModel = (
+                    await generate_presentation_structure(
+                        presentation_outlines,
+                        layout_model,
+                        request.instructions,
+                        using_slides_markdown,
                     )
-                    toc_outline = f"Table of Contents\n\n"
+                )
 
-                    for outline in presentation_outlines.slides[
-                        outline_index:outlines_to
-                    ]:
-                        page_number = (
-                            outline_index - i + n_toc_slides + 1
-                            if request.include_title_slide
-                            else outline_index - i + n_toc_slides
+            presentation_structure.slides = presentation_structure.slides[:total_outlines]
+            for index in range(total_outlines):
+                random_slide_index = random.randint(0, total_slide_layouts - 1)
+                if index >= total_outlines:
+                    presentation_structure.slides.append(random_slide_index)
+                    continue
+                if presentation_structure.slides[index] >= total_slide_layouts:
+                    presentation_structure.slides[index] = random_slide_index
+
+            # Injecting table of contents to the presentation structure and outlines
+            if request.include_table_of_contents and not using_slides_markdown:
+                n_toc_slides = request.n_slides - total_outlines
+                toc_slide_layout_index = select_toc_or_list_slide_layout_index(layout_model)
+                if toc_slide_layout_index != -1:
+                    outline_index = 1 if request.include_title_slide else 0
+                    for i in range(n_toc_slides):
+                        outlines_to = outline_index + 10
+                        if total_outlines == outlines_to:
+                            outlines_to -= 1
+
+                        presentation_structure.slides.insert(
+                            i + 1 if request.include_title_slide else i,
+                            toc_slide_layout_index,
                         )
-                        toc_outline += f"Slide page number: {page_number}\n Slide Content: {outline.content[:100]}\n\n"
+                        toc_outline = f"Table of Contents\n\n"
+
+                        for outline in presentation_outlines.slides[
+                            outline_index:outlines_to
+                        ]:
+                            page_number = (
+                                outline_index - i + n_toc_slides + 1
+                                if request.include_title_slide
+                                else outline_index - i + n_toc_slides
+                            )
+                            toc_outline += f"Slide page number: {page_number}\n Slide Content: {outline.content[:100]}\n\n"
+                            outline_index += 1
+
                         outline_index += 1
 
-                    outline_index += 1
+                        presentation_outlines.slides.insert(
+                            i + 1 if request.include_title_slide else i,
+                            SlideOutlineModel(
+                                content=toc_outline,
+                            ),
+                        )
 
-                    presentation_outlines.slides.insert(
-                        i + 1 if request.include_title_slide else i,
-                        SlideOutlineModel(
-                            content=toc_outline,
-                        ),
-                    )
+            await checkpoints.save_plan(presentation_outlines, presentation_structure)
 
         # Create Presentation
         presentation = Presentation(
@@ -977,30 +1142,18 @@ async def generate_presentation_handler(
         )
 
         # Updating async status
-        if async_status:
-            async_status.message = "Generating slides"
-            async_status.updated_at = datetime.now()
-            await task_crud.update_task(str(async_status.id), async_status)
+        await update_async_status(async_status, message="Generating slides")
 
         image_generation_service = ImageGenerationService(get_images_directory())
-        async_assets_generation_tasks = []
-
-        # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-        slides: List[Slide] = []
+        # Slides asking for the same image or icon share one request
+        asset_deduplicator = AssetFetchDeduplicator(image_generation_service)
 
+        # 7. Generate slide content with a sliding window and fetch assets as soon as each slide is ready
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
-
-        # Schedule slide content generation and asset fetching in batches of 10
-        batch_size = 10
-        for start in range(0, len(slide_layouts), batch_size):
-            end = min(start + batch_size, len(slide_layouts))
-
-            print(f"Generating slides from {start} to {end}")
-
-            # Generate contents for this batch concurrently
-            content_tasks = [
-                get_slide_content_from_type_and_outline(
+        await checkpoints.load_slides(
+            [
+                get_slide_fingerprint(
                     slide_layouts[i],
                     presentation_outlines.slides[i],
                     request.language,
@@ -1008,47 +1161,142 @@ async def generate_presentation_handler(
                     request.verbosity.value,
                     request.instructions,
                 )
-                for i in range(start, end)
-            ]
-            batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-
-            # Build slides for this batch
-            batch_slides: List[Slide] = []
-            for offset, slide_content in enumerate(batch_contents):
-                i = start + offset
-                slide_layout = slide_layouts[i]
-                slide = Slide(
-                    presentation_id=presentation_id,
-                    slide_number=i,
-                    layout=slide_layout.id,
-                    layout_group=layout_model.name,
-                    notes=slide_content.get("__speaker_note__", ""),
-                    content=json.dumps(slide_content),
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc),
+                for i in range(len(slide_layouts))
+            ],
+            resume,
+        )
+        resumed_slide_numbers = checkpoints.completed_slide_numbers
+
+        window_size = get_slide_generation_window_size()
+        window_semaphore = asyncio.Semaphore(window_size)
+        global_semaphore = get_global_slide_generation_semaphore()
+        generation_started_at = time.perf_counter()
+
+        # Slides of a batch share one LLM call, the window is counted in calls
+        batch_size = get_slide_generation_batch_size()
+        batch_tasks: Dict[int, asyncio.Task] = {}
+
+        async def generate_batch(batch_number: int) -> Tuple[Dict[int, dict], float]:
+            indices = range(
+                batch_number * batch_size,
+                min((batch_number + 1) * batch_size, len(slide_layouts)),
+            )
+            # Slides done by an earlier attempt are left out of the LLM call
+            slide_contents = {}
+            for i in indices:
+                slide_content = checkpoints.get_content(i)
+                if slide_content:
+                    slide_contents[i] = slide_content
+            missing_indices = [i for i in indices if i not in slide_contents]
+
+            content_started_at = time.perf_counter()
+            if not missing_indices:
+                return slide_contents, content_started_at
+
+            async with window_semaphore:
+                async with global_semaphore:
+                    content_started_at = time.perf_counter()
+                    generated_contents = await get_slides_content_from_types_and_outlines(
+                        [slide_layouts[i] for i in missing_indices],
+                        [presentation_outlines.slides[i] for i in missing_indices],
+                        request.language,
+                        request.tone.value,
+                        request.verbosity.value,
+                        request.instructions,
+                        request.use_cache,
+                    )
+            for i, slide_content in zip(missing_indices, generated_contents):
+                slide_contents[i] = slide_content
+                await checkpoints.save_content(i, slide_content)
+            return slide_contents, content_started_at
+
+        async def generate_slide(i: int) -> Tuple[Slide, list, dict]:
+            queued_at = time.perf_counter()
+            batch_number = i // batch_size
+            if batch_number not in batch_tasks:
+                batch_tasks[batch_number] = asyncio.create_task(
+                    generate_batch(batch_number)
                 )
-                slides.append(slide)
-                batch_slides.append(slide)
+            slide_contents, content_started_at = await asyncio.shield(
+                batch_tasks[batch_number]
+            )
+            slide_content = slide_contents[i]
+            content_completed_at = time.perf_counter()
 
-            # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-            asset_tasks = [
-                process_slide_and_fetch_assets(image_generation_service, slide)
-                for slide in batch_slides
-            ]
-            async_assets_generation_tasks.extend(asset_tasks)
+            slide = Slide(
+                presentation_id=presentation_id,
+                slide_number=i,
+                layout=slide_layouts[i].id,
+                layout_group=layout_model.name,
+                notes=slide_content.get("__speaker_note__", ""),
+                content=json.dumps(slide_content),
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
+            )
 
-        if async_status:
-            async_status.message = "Fetching assets for slides"
-            async_status.updated_at = datetime.now()
-            await task_crud.update_task(str(async_status.id), async_status)
+            # Assets are fetched outside the window so the next slide's content can start
+            assets = []
+            if not checkpoints.is_completed(i):
+                assets = await process_slide_and_fetch_assets(
+                    image_generation_service, slide, asset_deduplicator
+                )
+                await checkpoints.save_completed(i, json.loads(slide.content))
+            assets_completed_at = time.perf_counter()
+
+            timing = {
+                "slide_number": i,
+                "queued_seconds": round(content_started_at - queued_at, 3),
+                "content_seconds": round(content_completed_at - content_started_at, 3),
+                "assets_seconds": round(assets_completed_at - content_completed_at, 3),
+                "completed_at_seconds": round(
+                    assets_completed_at - generation_started_at, 3
+                ),
+            }
+            print(f"Generated slide {i}: {timing}")
+            return slide, assets, timing
 
-        # Run all asset tasks concurrently while batches may still be generating content
-        generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
+        slides: List[Slide] = []
         generated_assets = []
-        for assets_list in generated_assets_list:
-            generated_assets.extend(assets_list)
+        slide_timings = []
+        try:
+            async with aclosing(
+                map_in_order(
+                    generate_slide, range(len(slide_layouts)), len(slide_layouts)
+                )
+            ) as generated_slides:
+                async for slide, assets, timing in generated_slides:
+                    slides.append(slide)
+                    generated_assets.extend(assets)
+                    slide_timings.append(timing)
+        finally:
+            for batch_task in batch_tasks.values():
+                if not batch_task.done():
+                    batch_task.cancel()
+                elif not batch_task.cancelled():
+                    batch_task.exception()
+            asset_deduplicator.cancel()
+
+        if async_status:
+            await update_async_status(
+                async_status,
+                metadata={
+                    **(async_status.metadata or {}),
+                    "slide_generation_window_size": window_size,
+                    "slide_generation_batch_size": batch_size,
+                    "slide_generation_seconds": round(
+                        time.perf_counter() - generation_started_at, 3
+                    ),
+                    "slide_timings": slide_timings,
+                    "resumed_slides": resumed_slide_numbers,
+                    "asset_deduplication": asset_deduplicator.get_metrics(),
+                },
+            )
 
         # 8. Save Presentation and Slides
+        # Slides of an earlier attempt of a retried task are replaced
+        if async_status:
+            await slide_crud.delete_slides_by_presentation(presentation_id)
+
         # Save slides to MongoDB
         for slide in slides:
             slide_create = SlideCreate(
@@ -1064,10 +1312,7 @@ async def generate_presentation_handler(
             )
             await slide_crud.create_slide(slide_create)
 
-        if async_status:
-            async_status.message = "Exporting presentation"
-            async_status.updated_at = datetime.now()
-            # Add operations handled by CRUD
+        await update_async_status(async_status, message="Exporting presentation")
 
         # 9. Export
         presentation_and_path = await export_presentation(
@@ -1079,12 +1324,12 @@ async def generate_presentation_handler(
             edit_path=f"/presentation?id={presentation_id}",
         )
 
-        if async_status:
-            async_status.message = "Presentation generation completed"
-            async_status.status = "completed"
-            async_status.data = response.model_dump(mode="json")
-            async_status.updated_at = datetime.now()
-            await task_crud.update_task(str(async_status.id), async_status)
+        await checkpoints.clear()
+
+        # The task queue marks the task completed with the response as its result
+        await update_async_status(
+            async_status, message="Presentation generation completed"
+        )
 
         # Triggering webhook on success
         CONCURRENT_SERVICE.run_task(
@@ -1097,29 +1342,62 @@ async def generate_presentation_handler(
         return jsonable_encoder(response)
 
     except Exception as e:
+        if speculative_layout_selector:
+            speculative_layout_selector.cancel()
+
         if not isinstance(e, HTTPException):
             traceback.print_exc()
             e = HTTPException(status_code=500, detail="Presentation generation failed")
 
-        api_error_model = APIErrorModel.from_exception(e)
+        # Queued tasks are retried, the webhook is sent once the last attempt fails
+        if async_status:
+            await update_async_status(
+                async_status, message="Presentation generation failed"
+            )
+        else:
+            send_presentation_generation_failed_webhook(e)
+        raise e
+
 
-        # Triggering webhook on failure
-        CONCURRENT_SERVICE.run_task(
-            None,
-            WebhookService.send_webhook,
-            WebhookEvent.PRESENTATION_GENERATION_FAILED,
-            api_error_model.model_dump(mode="json"),
-        )
+def send_presentation_generation_failed_webhook(e: Exception):
+    api_error_model = APIErrorModel.from_exception(e)
 
-        if async_status:
-            async_status.status = "error"
-            async_status.message = "Presentation generation failed"
-            async_status.updated_at = datetime.now()
-            async_status.error = api_error_model.model_dump(mode="json")
-            await task_crud.update_task(str(async_status.id), async_status)
+    # Triggering webhook on failure
+    CONCURRENT_SERVICE.run_task(
+        None,
+        WebhookService.send_webhook,
+        WebhookEvent.PRESENTATION_GENERATION_FAILED,
+        api_error_model.model_dump(mode="json"),
+    )
 
-        else:
-            raise e
+
+async def update_async_status(async_status: Optional[TaskInDB], **fields):
+    """Saves the progress of a queued task, its status is owned by the task queue"""
+    if not async_status:
+        return
+    for key, value in fields.items():
+        setattr(async_status, key, value)
+    await task_crud.update_task(str(async_status.id), TaskUpdate(**fields))
+
+
+async def run_presentation_generation_task(task: TaskInDB) -> dict:
+    """Runs a presentation generation task claimed from the task queue"""
+    request = GeneratePresentationRequest(**task.payload["request"])
+    return await generate_presentation_handler(
+        request, task.payload["presentation_id"], task, None
+    )
+
+
+async def on_presentation_generation_task_failed(task: TaskInDB, e: Exception):
+    send_presentation_generation_failed_webhook(e)
+
+
+def get_presentation_generation_worker() -> TaskQueueWorker:
+    return TaskQueueWorker(
+        TaskType.PRESENTATION_GENERATION,
+        run_presentation_generation_task,
+        on_failed=on_presentation_generation_task_failed,
+    )
 
 
 @PRESENTATION_ROUTER.post("/generate", response_model=PresentationPathAndEditPath)
@@ -1142,25 +1420,26 @@ async def generate_presentation_sync(
 )
 async def generate_presentation_async(
     request: GeneratePresentationRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
 ):
     try:
         (presentation_id,) = await check_if_api_request_is_valid(request, current_user)
 
-        async_status = Task(
-            status="pending",
-            message="Queued for generation",
-            data=None,
-        )
-        await task_crud.update_task(str(async_status.id), async_status)
-
-        background_tasks.add_task(
-            generate_presentation_handler,
-            request,
-            presentation_id,
-            async_status=async_status,
+        # Queued in MongoDB, so the task survives restarts and any worker can run it
+        task_id = await task_crud.enqueue_task(
+            TaskCreate(
+                user_id=str(current_user.id),
+                presentation_id=presentation_id,
+                task_type=TaskType.PRESENTATION_GENERATION,
+                message="Queued for generation",
+            ),
+            payload={
+                "request": request.model_dump(mode="json"),
+                "presentation_id": presentation_id,
+            },
+            max_attempts=get_task_queue_max_attempts(),
         )
+        async_status = await task_crud.get_task_by_id(task_id)
         return jsonable_encoder(async_status)
 
     except Exception as e:
@@ -1179,7 +1458,8 @@ async def check_async_presentation_generation_status(
     current_user: User = Depends(get_current_active_user),
 ):
     status = await task_crud.get_task_by_id(str(id))
-    if not status:
+    # Tasks of other users are reported as missing
+    if not status or status.user_id != str(current_user.id):
         raise HTTPException(
             status_code=404, detail="No presentation generation task found"
         )
@@ -1,17 +1,25 @@
+from contextlib import aclosing
 from typing import Annotated, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException
+import json
 import uuid
 
 from models.mongo.presentation import Presentation
 from models.mongo.slide import Slide, SlideUpdate
+from models.presentation_layout import PresentationLayoutModel
+from models.presentation_outline_model import PresentationOutlineModel
 from crud.presentation_crud import presentation_crud
 from crud.slide_crud import slide_crud
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 from utils.llm_calls.edit_slide import get_edited_slide_content
 from utils.llm_calls.edit_slide_html import get_edited_slide_html
+from utils.llm_calls.generate_slide_content import stream_slide_content_with_retries
 from utils.llm_calls.select_slide_type_on_edit import get_slide_layout_from_prompt
-from utils.process_slides import process_old_and_new_slides_and_fetch_assets
+from utils.process_slides import (
+    process_old_and_new_slides_and_fetch_assets,
+    process_slide_and_fetch_assets,
+)
 from auth.dependencies import get_current_active_user
 from models.mongo.user import User
 
@@ -91,3 +99,59 @@ async def edit_slide_html(
     updated_slide = await slide_crud.update_slide(slide.id, slide_update)
 
     return updated_slide
+
+
+@SLIDE_ROUTER.post("/regenerate")
+async def regenerate_slide(
+    id: Annotated[str, Body(embed=True)],
+    current_user: User = Depends(get_current_active_user)
+):
+    """Generates the content of a slide again from its outline, e.g. a slide that failed"""
+    slide = await slide_crud.get_slide_by_id(str(id))
+    if not slide:
+        raise HTTPException(status_code=404, detail="Slide not found")
+
+    presentation = await presentation_crud.get_presentation_by_id(slide.presentation_id)
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+    if presentation.user_id != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized to access this presentation")
+
+    outlines = PresentationOutlineModel(**(presentation.outlines or {"slides": []}))
+    layout = PresentationLayoutModel(**(presentation.layout or {"name": "", "slides": []}))
+    slide_layout = next(
+        (each for each in layout.slides if each.id == slide.layout), None
+    )
+    if slide.slide_number >= len(outlines.slides) or not slide_layout:
+        raise HTTPException(
+            status_code=400, detail="Outline or layout of the slide not found"
+        )
+
+    slide_content = None
+    async with aclosing(
+        stream_slide_content_with_retries(
+            slide_layout,
+            outlines.slides[slide.slide_number],
+            presentation.language,
+            presentation.tone,
+            presentation.verbosity,
+            presentation.instructions,
+            use_cache=False,
+        )
+    ) as slide_stream:
+        async for each in slide_stream:
+            if not isinstance(each, str):
+                slide_content = each
+
+    # This will mutate slide
+    slide.content = json.dumps(slide_content)
+    image_generation_service = ImageGenerationService(get_images_directory())
+    await process_slide_and_fetch_assets(image_generation_service, slide)
+
+    return await slide_crud.update_slide(
+        slide.id,
+        SlideUpdate(
+            content=slide.content,
+            notes=slide_content.get("__speaker_note__", ""),
+        ),
+    )
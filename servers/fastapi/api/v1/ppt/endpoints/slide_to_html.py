@@ -5,8 +5,10 @@ from typing import Optional, List, Dict
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Depends
 from pydantic import BaseModel
-from openai import OpenAI
 from openai import APIError
+from services.executor_service import EXECUTOR_SERVICE
+from services.llm_sdk_client_registry import LLM_SDK_CLIENT_REGISTRY
+from utils.file_utils import read_file
 from utils.asset_directory_utils import get_images_directory
 from models.mongo.presentation_layout_code import PresentationLayoutCode
 from .prompts import (
@@ -155,7 +157,7 @@ async def generate_html_from_slide(
         f"Generating HTML from slide image and XML using OpenAI GPT-5 Responses API..."
     )
     try:
-        client = OpenAI(api_key=api_key)
+        client = LLM_SDK_CLIENT_REGISTRY.get_openai_client(api_key)
 
         # Compose input for Responses API. Include system prompt, image (separate), OXML and optional fonts text.
         data_url = f"data:{media_type};base64,{base64_image}"
@@ -177,7 +179,7 @@ async def generate_html_from_slide(
         ]
 
         print("Making Responses API request for HTML generation...")
-        response = client.responses.create(
+        response = await client.responses.create(
             model="gpt-5",
             input=input_payload,
             reasoning={"effort": "high"},
@@ -247,7 +249,7 @@ async def generate_react_component_from_html(
         HTTPException: If API call fails or no content is generated
     """
     try:
-        client = OpenAI(api_key=api_key)
+        client = LLM_SDK_CLIENT_REGISTRY.get_openai_client(api_key)
 
         print("Making Responses API request for React component generation...")
 
@@ -262,7 +264,7 @@ async def generate_react_component_from_html(
             {"role": "user", "content": content_parts},
         ]
 
-        response = client.responses.create(
+        response = await client.responses.create(
             model="gpt-5",
             input=input_payload,
             reasoning={"effort": "minimal"},
@@ -357,7 +359,7 @@ async def edit_html_with_images(
         HTTPException: If API call fails or no content is generated
     """
     try:
-        client = OpenAI(api_key=api_key)
+        client = LLM_SDK_CLIENT_REGISTRY.get_openai_client(api_key)
 
         print("Making Responses API request for HTML editing...")
 
@@ -384,7 +386,7 @@ async def edit_html_with_images(
             {"role": "user", "content": content_parts},
         ]
 
-        response = client.responses.create(
+        response = await client.responses.create(
             model="gpt-5",
             input=input_payload,
             reasoning={"effort": "low"},
@@ -503,8 +505,7 @@ async def convert_slide_to_html(request: SlideToHtmlRequest):
             )
 
         # Read and encode image to base64
-        with open(actual_image_path, "rb") as image_file:
-            image_content = image_file.read()
+        image_content = await EXECUTOR_SERVICE.io.run(read_file, actual_image_path)
         base64_image = base64.b64encode(image_content).decode("utf-8")
 
         # Determine media type from file extension
@@ -607,8 +608,10 @@ async def convert_html_to_react(request: HtmlToReactRequest):
                     else os.path.join(get_images_directory(), image_path)
                 )
             if os.path.exists(actual_image_path):
-                with open(actual_image_path, "rb") as f:
-                    image_b64 = base64.b64encode(f.read()).decode("utf-8")
+                image_content = await EXECUTOR_SERVICE.io.run(
+                    read_file, actual_image_path
+                )
+                image_b64 = base64.b64encode(image_content).decode("utf-8")
                 ext = os.path.splitext(actual_image_path)[1].lower()
                 media_type = {
                     ".png": "image/png",
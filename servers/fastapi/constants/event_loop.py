@@ -0,0 +1,23 @@
+# Event loop lag monitor
+# How often the scheduling delay of the event loop is sampled
+EVENT_LOOP_MONITOR_INTERVAL_SECONDS = 0.1
+# Upper bounds of the lag histogram buckets, the last bucket is everything above
+EVENT_LOOP_LAG_BUCKETS_SECONDS = [
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+]
+# Recent samples that the lag percentiles are computed from
+EVENT_LOOP_LAG_WINDOW_SIZE = 600
+
+# Blocking call detector, only runs in debug mode
+DEFAULT_EVENT_LOOP_BLOCKING_THRESHOLD_MS = 100
+# Stack traces of the last blocking calls that are kept
+EVENT_LOOP_BLOCKING_CALLS_KEPT = 20
@@ -0,0 +1,9 @@
+import os
+
+# Executor pools for blocking work, each kind of work gets its own pool and size
+# Threads for blocking IO like boto3 uploads, file reads and writes and saving pptx files
+DEFAULT_IO_EXECUTOR_WORKERS = 16
+# Processes for CPU heavy work like docling, pdfplumber and PIL
+DEFAULT_CPU_EXECUTOR_WORKERS = min(os.cpu_count() or 1, 4)
+# LibreOffice conversions running at the same time
+DEFAULT_LIBREOFFICE_CONCURRENCY = 2
@@ -0,0 +1,21 @@
+# Connection pool of the shared aiohttp sessions used for outbound HTTP calls
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_CONNECTIONS_PER_HOST = 10
+HTTP_KEEPALIVE_TIMEOUT = 30
+HTTP_DNS_CACHE_TTL = 300
+
+# Timeouts of the outbound HTTP calls in seconds
+HTTP_TOTAL_TIMEOUT = 60
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_SOCK_READ_TIMEOUT = 30
+# Exports wait for the Next.js service to render the whole deck
+HTTP_EXPORT_TIMEOUT = 600
+
+# Bulk downloads of the network images of exported decks
+DEFAULT_BULK_DOWNLOAD_CONCURRENCY = 16
+DEFAULT_BULK_DOWNLOAD_PER_HOST_CONCURRENCY = 4
+DEFAULT_BULK_DOWNLOAD_TIMEOUT_SECONDS = 30
+DEFAULT_BULK_DOWNLOAD_MAX_RETRIES = 2
+# Retries wait base * 2^(retry - 1) seconds, capped and with jitter
+BULK_DOWNLOAD_RETRY_BASE_SECONDS = 0.5
+BULK_DOWNLOAD_RETRY_MAX_SECONDS = 5
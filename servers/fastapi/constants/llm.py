@@ -4,3 +4,35 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# LLM admission control
+DEFAULT_LLM_MAX_CONCURRENCY = 16
+# 0 disables the requests/tokens per minute limits
+DEFAULT_LLM_REQUESTS_PER_MINUTE = 0
+DEFAULT_LLM_TOKENS_PER_MINUTE = 0
+
+# LLM routing between providers
+# Latencies and outcomes of the last calls of a route that its health is computed from
+LLM_ROUTE_WINDOW_SIZE = 100
+# A route that fails this many times in a row is skipped for a while
+LLM_ROUTE_MAX_CONSECUTIVE_FAILURES = 3
+LLM_ROUTE_COOLDOWN_SECONDS = 30
+# Calls are only hedged once the p95 latency of the route is known
+LLM_HEDGE_MIN_SAMPLES = 20
+
+# Connection pools of the provider SDK clients
+LLM_HTTP_MAX_CONNECTIONS = 100
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_HTTP_KEEPALIVE_EXPIRY = 60
+
+# Clients kept per provider, like the OpenAI client used with an LLM key and a
+# DALL-E key, the least recently used one is closed after a grace period
+LLM_SDK_MAX_CLIENTS_PER_PROVIDER = 4
+LLM_SDK_STALE_CLIENT_GRACE_SECONDS = 120
+
+# Slide content cache
+DEFAULT_SLIDE_CONTENT_CACHE_SIZE = 512
+DEFAULT_SLIDE_CONTENT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Part of every cache key, bump it when the slide content prompts change
+# (SYSTEM_PROMPT, get_schema_prompt, ...) so stale content is not served
+SLIDE_CONTENT_PROMPT_VERSION = 1
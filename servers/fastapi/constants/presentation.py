@@ -1 +1,45 @@
 DEFAULT_TEMPLATES = ["general", "modern", "standard", "swift"]
+
+# Slide generation concurrency
+DEFAULT_SLIDE_GENERATION_CONCURRENCY = 5
+DEFAULT_SLIDE_GENERATION_WINDOW_SIZE = 10
+DEFAULT_GLOBAL_SLIDE_GENERATION_CONCURRENCY = 20
+# 1 disables batching, each slide is generated with its own LLM call
+DEFAULT_SLIDE_GENERATION_BATCH_SIZE = 1
+MAX_SLIDE_BATCH_OUTPUT_TOKENS = 16000
+# A slide whose content fails is retried with exponential backoff
+DEFAULT_SLIDE_GENERATION_MAX_RETRIES = 2
+SLIDE_GENERATION_RETRY_BASE_SECONDS = 1.0
+SLIDE_GENERATION_RETRY_MAX_SECONDS = 8.0
+
+# Speculative layout selection picks layouts while the outlines are streaming
+DEFAULT_SPECULATIVE_LAYOUT_CHUNK_SIZE = 4
+
+# Layouts picked by the local matcher below this confidence are left to the LLM
+DEFAULT_LAYOUT_MATCHING_MIN_CONFIDENCE = 0.5
+
+# Progress of unfinished generations is kept this long so they can be resumed
+DEFAULT_GENERATION_CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+# Marks the placeholder content of a slide that failed to generate
+FAILED_SLIDE_KEY = "__generation_failed__"
+
+# Transformed pictures of exported decks are kept on disk while in use this recently
+DEFAULT_IMAGE_TRANSFORM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Images resolved by the image providers are cached in the assets collection
+DEFAULT_IMAGE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_IMAGE_CACHE_MAX_ENTRIES = 10000
+# Hotlinked provider URLs can expire or be taken down, so URL only entries
+# are kept for a shorter time than the images stored as assets
+DEFAULT_IMAGE_URL_CACHE_TTL_SECONDS = 24 * 60 * 60
+IMAGE_PROVIDER_URL_CACHE_TTL_SECONDS = {
+    "pexels": 24 * 60 * 60,
+    "pixabay": 24 * 60 * 60,
+}
+# Size of the images returned by each provider, part of the cache key
+IMAGE_PROVIDER_IMAGE_SIZES = {
+    "pexels": "large",
+    "pixabay": "large",
+    "gemini_flash": "default",
+    "dall-e-3": "1024x1024",
+}
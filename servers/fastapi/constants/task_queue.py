@@ -0,0 +1,13 @@
+# Background job queue on the tasks collection
+DEFAULT_TASK_QUEUE_WORKER_CONCURRENCY = 4
+DEFAULT_TASK_QUEUE_PER_USER_CONCURRENCY = 2
+DEFAULT_TASK_QUEUE_MAX_ATTEMPTS = 3
+DEFAULT_TASK_QUEUE_POLL_SECONDS = 2
+
+# A running job is given back to the queue if its worker stops heartbeating
+DEFAULT_TASK_QUEUE_LEASE_SECONDS = 60
+DEFAULT_TASK_QUEUE_HEARTBEAT_SECONDS = 15
+
+# Retries wait base * 2^(attempt - 1) seconds, capped and with jitter
+DEFAULT_TASK_QUEUE_RETRY_BASE_SECONDS = 10
+DEFAULT_TASK_QUEUE_RETRY_MAX_SECONDS = 300
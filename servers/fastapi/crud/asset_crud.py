@@ -1,9 +1,11 @@
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 from bson import ObjectId
 from models.mongo.asset import Asset, AssetCreate, AssetUpdate, AssetInDB
 from db.mongo import get_assets_collection
 
+IMAGE_CACHE_ASSET_TYPE = "image_cache"
+
 class AssetCRUD:
     def __init__(self):
         self._collection = None
@@ -93,5 +95,70 @@ class AssetCRUD:
             assets.append(AssetInDB(**asset_data))
         return assets
 
+    async def ensure_image_cache_indexes(self):
+        """Cached images are looked up by key, evicted by last use and expired by TTL"""
+        await self.collection.create_index(
+            "cache_key",
+            unique=True,
+            partialFilterExpression={"asset_type": IMAGE_CACHE_ASSET_TYPE},
+        )
+        await self.collection.create_index([("asset_type", 1), ("last_used_at", 1)])
+        # Only cache entries have expires_at, other assets never expire
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get_image_cache_entry(self, cache_key: str) -> Optional[dict]:
+        """Get a cached image and mark it as used, ignoring expired entries"""
+        return await self.collection.find_one_and_update(
+            {
+                "asset_type": IMAGE_CACHE_ASSET_TYPE,
+                "cache_key": cache_key,
+                "expires_at": {"$gt": datetime.utcnow()},
+            },
+            {"$set": {"last_used_at": datetime.utcnow()}, "$inc": {"hits": 1}},
+        )
+
+    async def set_image_cache_entry(
+        self, cache_key: str, entry: dict, ttl_seconds: int
+    ):
+        """Create or replace a cached image"""
+        now = datetime.utcnow()
+        await self.collection.replace_one(
+            {"asset_type": IMAGE_CACHE_ASSET_TYPE, "cache_key": cache_key},
+            {
+                **entry,
+                "user_id": "system",
+                "asset_type": IMAGE_CACHE_ASSET_TYPE,
+                "cache_key": cache_key,
+                "hits": 0,
+                "created_at": now,
+                "updated_at": now,
+                "last_used_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds),
+            },
+            upsert=True,
+        )
+
+    async def evict_image_cache_entries(self, max_entries: int) -> int:
+        """Delete the least recently used cached images above max_entries"""
+        query = {"asset_type": IMAGE_CACHE_ASSET_TYPE}
+        overflow = await self.collection.count_documents(query) - max_entries
+        if overflow <= 0:
+            return 0
+        cursor = (
+            self.collection.find(query, {"_id": 1})
+            .sort("last_used_at", 1)
+            .limit(overflow)
+        )
+        ids = [each["_id"] async for each in cursor]
+        result = await self.collection.delete_many({"_id": {"$in": ids}})
+        return result.deleted_count
+
+    async def delete_image_cache_entries_by_file_path(self, file_path: str) -> int:
+        """Forget cached images whose stored file is being deleted"""
+        result = await self.collection.delete_many(
+            {"asset_type": IMAGE_CACHE_ASSET_TYPE, "file_path": file_path}
+        )
+        return result.deleted_count
+
 # Global instance
 asset_crud = AssetCRUD()
@@ -0,0 +1,82 @@
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from db.mongo import get_generation_checkpoints_collection
+
+class GenerationCheckpointCRUD:
+    """
+    Progress of presentation generations that have not finished yet.
+    One document holds the plan (outlines and structure) of a presentation
+    and one document per slide holds its content once it is generated.
+    """
+
+    def __init__(self):
+        self._collection = None
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = get_generation_checkpoints_collection()
+        return self._collection
+
+    async def ensure_indexes(self):
+        """Find checkpoints by presentation and expire abandoned ones"""
+        await self.collection.create_index("presentation_id")
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def _save(self, key: str, document: dict, ttl_seconds: int):
+        now = datetime.utcnow()
+        await self.collection.replace_one(
+            {"_id": key},
+            {
+                **document,
+                "updated_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds),
+            },
+            upsert=True,
+        )
+
+    async def get_plan(self, presentation_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": f"{presentation_id}:plan"})
+
+    async def save_plan(self, presentation_id: str, plan: dict, ttl_seconds: int):
+        await self._save(
+            f"{presentation_id}:plan",
+            {"presentation_id": presentation_id, "kind": "plan", **plan},
+            ttl_seconds,
+        )
+
+    async def get_slides(self, presentation_id: str) -> Dict[int, dict]:
+        """Slide checkpoints of a presentation by slide number"""
+        cursor = self.collection.find(
+            {"presentation_id": presentation_id, "kind": "slide"}
+        )
+        return {doc["slide_number"]: doc async for doc in cursor}
+
+    async def save_slide(
+        self,
+        presentation_id: str,
+        slide_number: int,
+        fingerprint: str,
+        status: str,
+        content: dict,
+        ttl_seconds: int,
+    ):
+        await self._save(
+            f"{presentation_id}:slide:{slide_number}",
+            {
+                "presentation_id": presentation_id,
+                "kind": "slide",
+                "slide_number": slide_number,
+                "fingerprint": fingerprint,
+                "status": status,
+                "content": content,
+            },
+            ttl_seconds,
+        )
+
+    async def delete_checkpoints(self, presentation_id: str) -> int:
+        result = await self.collection.delete_many({"presentation_id": presentation_id})
+        return result.deleted_count
+
+# Global instance
+generation_checkpoint_crud = GenerationCheckpointCRUD()
@@ -0,0 +1,42 @@
+from typing import Optional
+from datetime import datetime, timedelta
+from db.mongo import get_llm_cache_collection
+
+class LLMCacheCRUD:
+    def __init__(self):
+        self._collection = None
+    
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = get_llm_cache_collection()
+        return self._collection
+    
+    async def ensure_indexes(self):
+        """Expire entries once their expires_at is reached"""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+    
+    async def get_entry(self, key: str) -> Optional[dict]:
+        """Get cached value by key, ignoring entries that expired but are not yet removed"""
+        entry = await self.collection.find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.utcnow()}}
+        )
+        if entry:
+            return entry["value"]
+        return None
+    
+    async def set_entry(self, key: str, value: dict, ttl_seconds: int):
+        """Create or replace cached value"""
+        now = datetime.utcnow()
+        await self.collection.replace_one(
+            {"_id": key},
+            {
+                "value": value,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds),
+            },
+            upsert=True,
+        )
+
+# Global instance
+llm_cache_crud = LLMCacheCRUD()
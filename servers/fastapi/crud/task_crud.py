@@ -1,7 +1,8 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime, timedelta
 from bson import ObjectId
-from models.mongo.task import Task, TaskCreate, TaskUpdate, TaskInDB, TaskStatus
+from pymongo import ReturnDocument
+from models.mongo.task import Task, TaskCreate, TaskUpdate, TaskInDB, TaskStatus, TaskType
 from db.mongo import get_tasks_collection
 
 class TaskCRUD:
@@ -14,6 +15,19 @@ class TaskCRUD:
             self._collection = get_tasks_collection()
         return self._collection
     
+    def _to_task(self, task_data: Optional[dict]) -> Optional[TaskInDB]:
+        if not task_data:
+            return None
+        task_data["id"] = str(task_data["_id"])
+        del task_data["_id"]
+        return TaskInDB(**task_data)
+    
+    async def ensure_indexes(self):
+        """Indexes used to claim queued tasks and count running tasks per user"""
+        await self.collection.create_index([("status", 1), ("available_at", 1)])
+        await self.collection.create_index([("user_id", 1), ("status", 1)])
+        await self.collection.create_index([("status", 1), ("lease_expires_at", 1)])
+    
     async def create_task(self, task: TaskCreate) -> str:
         """Create a new task"""
         task_data = {
@@ -107,5 +121,250 @@ class TaskCRUD:
         })
         return result.deleted_count
 
+    # Job queue
+    # Queued tasks are pending with a payload, running tasks hold a lease that
+    # their worker extends with heartbeats. A task whose lease expired is queued
+    # again with backoff, or failed once it used all its attempts.
+    
+    async def enqueue_task(
+        self, task: TaskCreate, payload: Dict[str, Any], max_attempts: int
+    ) -> str:
+        """Create a pending task that workers can claim"""
+        task_id = await self.create_task(task)
+        await self.collection.update_one(
+            {"_id": ObjectId(task_id)},
+            {
+                "$set": {
+                    "status": TaskStatus.PENDING,
+                    "payload": payload,
+                    "attempts": 0,
+                    "max_attempts": max_attempts,
+                    "available_at": datetime.utcnow(),
+                    "lease_expires_at": None,
+                    "worker_id": None,
+                }
+            },
+        )
+        return task_id
+    
+    def _claimable_filter(self, task_type: TaskType, now: datetime) -> dict:
+        return {
+            "task_type": task_type,
+            "payload": {"$ne": None},
+            "$or": [
+                {"status": TaskStatus.PENDING, "available_at": {"$lte": now}},
+                # Expired leases are normally handled by expire_lease first
+                {
+                    "status": TaskStatus.RUNNING,
+                    "lease_expires_at": {"$lt": now},
+                    "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                },
+            ],
+        }
+    
+    async def count_running_tasks_by_user(self, user_id: str) -> int:
+        return await self.collection.count_documents(
+            {
+                "user_id": user_id,
+                "status": TaskStatus.RUNNING,
+                "lease_expires_at": {"$gte": datetime.utcnow()},
+            }
+        )
+    
+    async def get_busy_user_ids(self, per_user_limit: int) -> List[str]:
+        """Users that already have per_user_limit tasks running"""
+        cursor = self.collection.aggregate(
+            [
+                {
+                    "$match": {
+                        "status": TaskStatus.RUNNING,
+                        "lease_expires_at": {"$gte": datetime.utcnow()},
+                    }
+                },
+                {"$group": {"_id": "$user_id", "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gte": per_user_limit}}},
+            ]
+        )
+        return [each["_id"] async for each in cursor]
+    
+    async def claim_task(
+        self,
+        task_type: TaskType,
+        worker_id: str,
+        lease_seconds: int,
+        per_user_limit: int,
+    ) -> Optional[TaskInDB]:
+        """
+        Atomically moves the oldest claimable task to running under a lease.
+        Users at their concurrency limit are skipped. Two workers can still
+        claim for the same user at once, so the limit is checked again after
+        the claim and the task is handed back if it was exceeded.
+        """
+        now = datetime.utcnow()
+        query = self._claimable_filter(task_type, now)
+        busy_user_ids = await self.get_busy_user_ids(per_user_limit)
+        if busy_user_ids:
+            query["user_id"] = {"$nin": busy_user_ids}
+        
+        task_data = await self.collection.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": TaskStatus.RUNNING,
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "started_at": now,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", 1), ("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        task = self._to_task(task_data)
+        if task is None:
+            return None
+        
+        if await self.count_running_tasks_by_user(task.user_id) > per_user_limit:
+            await self.release_task(task.id, worker_id)
+            return None
+        return task
+    
+    async def heartbeat_task(self, task_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extends the lease, returns False if the task is no longer held by the worker"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": ObjectId(task_id), "worker_id": worker_id, "status": TaskStatus.RUNNING},
+            {
+                "$set": {
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                }
+            },
+        )
+        return result.matched_count > 0
+    
+    async def release_task(self, task_id: str, worker_id: str) -> bool:
+        """Gives a claimed task back to the queue without counting the attempt"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": ObjectId(task_id), "worker_id": worker_id, "status": TaskStatus.RUNNING},
+            {
+                "$set": {
+                    "status": TaskStatus.PENDING,
+                    "available_at": now,
+                    "lease_expires_at": None,
+                    "worker_id": None,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": -1},
+            },
+        )
+        return result.matched_count > 0
+    
+    async def complete_task(
+        self, task_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        now = datetime.utcnow()
+        update_result = await self.collection.update_one(
+            {"_id": ObjectId(task_id), "worker_id": worker_id, "status": TaskStatus.RUNNING},
+            {
+                "$set": {
+                    "status": TaskStatus.COMPLETED,
+                    "result": result,
+                    "progress": 100,
+                    "lease_expires_at": None,
+                    "completed_at": now,
+                    "updated_at": now,
+                }
+            },
+        )
+        return update_result.matched_count > 0
+    
+    async def fail_task(
+        self,
+        task_id: str,
+        worker_id: str,
+        error: str,
+        retry_delay_seconds: Optional[float] = None,
+    ) -> bool:
+        """Queues the task again after the delay, or fails it if no delay is given"""
+        now = datetime.utcnow()
+        if retry_delay_seconds is None:
+            update_data = {
+                "status": TaskStatus.FAILED,
+                "completed_at": now,
+            }
+        else:
+            update_data = {
+                "status": TaskStatus.PENDING,
+                "available_at": now + timedelta(seconds=retry_delay_seconds),
+                "worker_id": None,
+            }
+        update_data.update({"error": error, "lease_expires_at": None, "updated_at": now})
+        result = await self.collection.update_one(
+            {"_id": ObjectId(task_id), "worker_id": worker_id, "status": TaskStatus.RUNNING},
+            {"$set": update_data},
+        )
+        return result.matched_count > 0
+    
+    async def get_tasks_with_expired_lease(
+        self, task_type: TaskType, limit: int = 100
+    ) -> List[TaskInDB]:
+        """Running tasks whose worker stopped heartbeating, like a crashed or hung worker"""
+        cursor = self.collection.find(
+            {
+                "task_type": task_type,
+                "payload": {"$ne": None},
+                "status": TaskStatus.RUNNING,
+                "lease_expires_at": {"$lt": datetime.utcnow()},
+            }
+        ).limit(limit)
+        return [self._to_task(task_data) async for task_data in cursor]
+    
+    async def expire_lease(
+        self,
+        task_id: str,
+        error: str,
+        retry_delay_seconds: Optional[float] = None,
+    ) -> bool:
+        """
+        Queues a task whose lease expired again after the delay, or fails it if no
+        delay is given. Returns False if another worker handled the task first.
+        """
+        now = datetime.utcnow()
+        if retry_delay_seconds is None:
+            update_data = {
+                "status": TaskStatus.FAILED,
+                "completed_at": now,
+            }
+        else:
+            update_data = {
+                "status": TaskStatus.PENDING,
+                "available_at": now + timedelta(seconds=retry_delay_seconds),
+            }
+        update_data.update(
+            {"error": error, "lease_expires_at": None, "worker_id": None, "updated_at": now}
+        )
+        result = await self.collection.update_one(
+            {
+                "_id": ObjectId(task_id),
+                "status": TaskStatus.RUNNING,
+                "lease_expires_at": {"$lt": now},
+            },
+            {"$set": update_data},
+        )
+        return result.matched_count > 0
+    
+    async def get_queue_metrics(self, task_type: TaskType) -> Dict[str, int]:
+        """Number of tasks of the type by status"""
+        cursor = self.collection.aggregate(
+            [
+                {"$match": {"task_type": task_type, "payload": {"$ne": None}}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ]
+        )
+        return {each["_id"]: each["count"] async for each in cursor}
+
 # Global instance
 task_crud = TaskCRUD()
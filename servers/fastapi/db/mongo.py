@@ -186,3 +186,9 @@ def get_webhooks_collection():
 
 def get_presentation_final_edits_collection():
     return db.presentation_final_edits
+
+def get_llm_cache_collection():
+    return db.llm_cache
+
+def get_generation_checkpoints_collection():
+    return db.generation_checkpoints
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class LLMRequestPriority(Enum):
+    # Lower values are admitted first
+    INTERACTIVE = 0
+    BULK = 1
@@ -40,3 +40,6 @@ class GeneratePresentationRequest(BaseModel):
     trigger_webhook: bool = Field(
         default=False, description="Whether to trigger subscribed webhooks"
     )
+    use_cache: bool = Field(
+        default=True, description="Whether to reuse cached slide content"
+    )
@@ -46,6 +46,13 @@ class TaskInDB(TaskBase):
     updated_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Job queue
+    payload: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+    max_attempts: int = 1
+    available_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
 
 class Task(TaskBase):
     id: Optional[str] = None
@@ -55,6 +62,11 @@ class Task(TaskBase):
     updated_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Job queue, the request payload and the worker stay internal
+    attempts: int = 0
+    max_attempts: int = 1
+    available_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
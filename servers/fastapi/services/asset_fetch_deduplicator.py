@@ -0,0 +1,74 @@
+import asyncio
+from typing import Dict, List, Tuple
+
+from models.image_prompt import ImagePrompt
+from models.mongo.asset import AssetInDB
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.image_generation_service import ImageGenerationService
+
+
+class AssetFetchDeduplicator:
+    """
+    Single flight for the images and icons of one generation.
+    - Slides asking for the same image prompt or icon query share one provider
+    request, started by the first slide and awaited by every other one.
+    - Results are kept for the rest of the generation, failed requests are
+    forgotten so the next slide asking for them tries again.
+    """
+
+    def __init__(self, image_generation_service: ImageGenerationService):
+        self.image_generation_service = image_generation_service
+        self._tasks: Dict[Tuple[str, ...], asyncio.Task] = {}
+        self.image_requests = 0
+        self.images_deduplicated = 0
+        self.icon_requests = 0
+        self.icons_deduplicated = 0
+
+    async def _single_flight(self, key: Tuple[str, ...], get_coroutine):
+        task = self._tasks.get(key)
+        deduplicated = task is not None
+        if not deduplicated:
+            task = asyncio.create_task(get_coroutine())
+            task.add_done_callback(lambda done: self._forget_if_failed(key, done))
+            self._tasks[key] = task
+        # A cancelled slide must not cancel the request the other slides await
+        return await asyncio.shield(task), deduplicated
+
+    def _forget_if_failed(self, key: Tuple[str, ...], task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+    async def generate_image(self, prompt: ImagePrompt) -> str | AssetInDB:
+        self.image_requests += 1
+        image, deduplicated = await self._single_flight(
+            ("image", prompt.prompt, prompt.theme_prompt or ""),
+            lambda: self.image_generation_service.generate_image(prompt),
+        )
+        self.images_deduplicated += 1 if deduplicated else 0
+        return image
+
+    async def search_icons(self, query: str) -> List[str]:
+        self.icon_requests += 1
+        icons, deduplicated = await self._single_flight(
+            ("icon", query),
+            lambda: ICON_FINDER_SERVICE.search_icons(query),
+        )
+        self.icons_deduplicated += 1 if deduplicated else 0
+        return icons
+
+    def cancel(self):
+        """Cancels the requests still running when the generation stops"""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+    def get_metrics(self) -> dict:
+        return {
+            "image_requests": self.image_requests,
+            "images_deduplicated": self.images_deduplicated,
+            "icon_requests": self.icon_requests,
+            "icons_deduplicated": self.icons_deduplicated,
+        }
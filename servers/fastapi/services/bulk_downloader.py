@@ -0,0 +1,184 @@
+import asyncio
+import os
+import random
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from constants.http import (
+    BULK_DOWNLOAD_RETRY_BASE_SECONDS,
+    BULK_DOWNLOAD_RETRY_MAX_SECONDS,
+    DEFAULT_BULK_DOWNLOAD_CONCURRENCY,
+    DEFAULT_BULK_DOWNLOAD_MAX_RETRIES,
+    DEFAULT_BULK_DOWNLOAD_PER_HOST_CONCURRENCY,
+    DEFAULT_BULK_DOWNLOAD_TIMEOUT_SECONDS,
+)
+from services.executor_service import EXECUTOR_SERVICE
+from services.image_transform_cache_service import get_file_hash
+from utils.download_helpers import fetch_file
+from utils.get_env import (
+    get_bulk_download_concurrency_env,
+    get_bulk_download_max_retries_env,
+    get_bulk_download_per_host_concurrency_env,
+    get_bulk_download_timeout_seconds_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+# Called with the number of finished downloads and the total
+ProgressCallback = Callable[[int, int], None]
+
+
+def get_bulk_download_concurrency() -> int:
+    """Downloads running at the same time across all hosts"""
+    return max(
+        parse_int_or_none(get_bulk_download_concurrency_env())
+        or DEFAULT_BULK_DOWNLOAD_CONCURRENCY,
+        1,
+    )
+
+
+def get_bulk_download_per_host_concurrency() -> int:
+    """Downloads running at the same time from a single host"""
+    return max(
+        parse_int_or_none(get_bulk_download_per_host_concurrency_env())
+        or DEFAULT_BULK_DOWNLOAD_PER_HOST_CONCURRENCY,
+        1,
+    )
+
+
+def get_bulk_download_timeout_seconds() -> int:
+    return (
+        parse_int_or_none(get_bulk_download_timeout_seconds_env())
+        or DEFAULT_BULK_DOWNLOAD_TIMEOUT_SECONDS
+    )
+
+
+def get_bulk_download_max_retries() -> int:
+    """Retries of a failing download, 0 disables retries"""
+    max_retries = parse_int_or_none(get_bulk_download_max_retries_env())
+    if max_retries is None:
+        return DEFAULT_BULK_DOWNLOAD_MAX_RETRIES
+    return max(max_retries, 0)
+
+
+def get_bulk_download_retry_delay_seconds(retry: int) -> float:
+    """Exponential backoff with jitter, `retry` starts at 1"""
+    delay = min(
+        BULK_DOWNLOAD_RETRY_BASE_SECONDS * 2 ** (retry - 1),
+        BULK_DOWNLOAD_RETRY_MAX_SECONDS,
+    )
+    return random.uniform(delay / 2, delay)
+
+
+def is_retryable_download_error(error: Exception) -> bool:
+    """Timeouts, connection errors, rate limits and server errors are retried"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+class BulkDownloader:
+    """
+    Downloads many files into one directory without flooding their hosts.
+    - Downloads are capped globally and per host, and each attempt has a timeout.
+    - Failing downloads are retried with jittered backoff, the slots are given
+    back to the other downloads while waiting.
+    - Each URL is downloaded once, and files with identical content are kept
+    once, so the pictures using them share one path.
+    """
+
+    def __init__(
+        self,
+        save_directory: str,
+        headers: Optional[dict] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.save_directory = save_directory
+        self.headers = headers
+        self.on_progress = on_progress
+        self.concurrency = get_bulk_download_concurrency()
+        self.per_host_concurrency = get_bulk_download_per_host_concurrency()
+        self.timeout_seconds = get_bulk_download_timeout_seconds()
+        self.max_retries = get_bulk_download_max_retries()
+        self._paths_by_hash: Dict[str, str] = {}
+        self.downloaded = 0
+        self.failed = 0
+        self.retries = 0
+        self.deduplicated = 0
+
+    async def _deduplicate(self, path: str) -> str:
+        file_hash = await EXECUTOR_SERVICE.io.run(get_file_hash, path)
+        existing_path = self._paths_by_hash.get(file_hash)
+        if existing_path:
+            os.remove(path)
+            self.deduplicated += 1
+            return existing_path
+        self._paths_by_hash[file_hash] = path
+        self.downloaded += 1
+        return path
+
+    async def _download_with_retries(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        host_semaphore: asyncio.Semaphore,
+    ) -> Optional[str]:
+        for retry in range(self.max_retries + 1):
+            if retry:
+                self.retries += 1
+                await asyncio.sleep(get_bulk_download_retry_delay_seconds(retry))
+            try:
+                # The host slot is taken first, so a busy host doesn't hold global slots
+                async with host_semaphore:
+                    async with semaphore:
+                        path = await asyncio.wait_for(
+                            fetch_file(
+                                url,
+                                self.save_directory,
+                                self.headers,
+                                unique_filename=True,
+                            ),
+                            self.timeout_seconds,
+                        )
+                return await self._deduplicate(path)
+            except Exception as e:
+                if retry == self.max_retries or not is_retryable_download_error(e):
+                    print(f"Error downloading file from {url}: {e!r}")
+                    self.failed += 1
+                    return None
+                print(f"Retrying download of {url} after error: {e!r}")
+
+    async def download(self, urls: List[str]) -> List[Optional[str]]:
+        """Paths of the downloaded files in the order of the URLs, None for failures"""
+        unique_urls = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        completed = 0
+
+        async def download_url(url: str) -> Optional[str]:
+            nonlocal completed
+            host = urlparse(url).netloc
+            if host not in host_semaphores:
+                host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+            try:
+                return await self._download_with_retries(
+                    url, semaphore, host_semaphores[host]
+                )
+            finally:
+                completed += 1
+                if self.on_progress:
+                    self.on_progress(completed, len(unique_urls))
+
+        paths = await asyncio.gather(*[download_url(url) for url in unique_urls])
+        paths_by_url = dict(zip(unique_urls, paths))
+        return [paths_by_url[url] for url in urls]
+
+    def get_metrics(self) -> dict:
+        return {
+            "downloaded": self.downloaded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "deduplicated": self.deduplicated,
+        }
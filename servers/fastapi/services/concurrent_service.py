@@ -1,11 +1,12 @@
 import asyncio
 from asyncio import Task
-from typing import Any, Callable, Coroutine, Optional
+from typing import Any, Callable, Coroutine, Dict, Optional
 
 
 class ConcurrentService:
     def __init__(self):
         self._background_tasks = set[Task]()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
 
     def run_task(
         self,
@@ -31,5 +32,14 @@ class ConcurrentService:
 
         self._background_tasks.discard(task)
 
+    def get_semaphore(self, name: str, limit: int) -> asyncio.Semaphore:
+        """
+        Returns a process-wide semaphore shared by every caller using the same name.
+        The limit is only applied when the semaphore is first created.
+        """
+        if name not in self._semaphores:
+            self._semaphores[name] = asyncio.Semaphore(max(limit, 1))
+        return self._semaphores[name]
+
 
 CONCURRENT_SERVICE = ConcurrentService()
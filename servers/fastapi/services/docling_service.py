@@ -31,3 +31,17 @@ class DoclingService:
     def parse_to_markdown(self, file_path: str) -> str:
         result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+
+_DOCLING_SERVICE = None
+
+
+def parse_to_markdown(file_path: str) -> str:
+    """
+    Runs in the workers of the CPU pool, each worker loads the docling
+    converter once and reuses it for the following files
+    """
+    global _DOCLING_SERVICE
+    if _DOCLING_SERVICE is None:
+        _DOCLING_SERVICE = DoclingService()
+    return _DOCLING_SERVICE.parse_to_markdown(file_path)
@@ -1,6 +1,6 @@
 import mimetypes
 from fastapi import HTTPException
-import os, asyncio
+import os
 from typing import List, Tuple
 import pdfplumber
 
@@ -10,7 +10,8 @@ from constants.documents import (
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.docling_service import parse_to_markdown
+from services.executor_service import EXECUTOR_SERVICE
 
 
 class DocumentsLoader:
@@ -18,8 +19,6 @@ class DocumentsLoader:
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
-
         self._documents: List[str] = []
         self._images: List[List[str]] = []
 
@@ -57,9 +56,9 @@ class DocumentsLoader:
             elif mime_type in TEXT_MIME_TYPES:
                 document = await self.load_text(file_path)
             elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
+                document = await self.load_powerpoint(file_path)
             elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+                document = await self.load_msword(file_path)
 
             documents.append(document)
             images.append(imgs)
@@ -78,22 +77,26 @@ class DocumentsLoader:
         document: str = ""
 
         if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+            document = await EXECUTOR_SERVICE.cpu.run(parse_to_markdown, file_path)
 
         if load_images:
             image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
 
         return document, image_paths
 
-    async def load_text(self, file_path: str) -> str:
+    @classmethod
+    def read_text(cls, file_path: str) -> str:
         with open(file_path, "r") as file:
-            return await asyncio.to_thread(file.read)
+            return file.read()
+
+    async def load_text(self, file_path: str) -> str:
+        return await EXECUTOR_SERVICE.io.run(self.read_text, file_path)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await EXECUTOR_SERVICE.cpu.run(parse_to_markdown, file_path)
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await EXECUTOR_SERVICE.cpu.run(parse_to_markdown, file_path)
 
     @classmethod
     def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
@@ -108,6 +111,6 @@ class DocumentsLoader:
 
     @classmethod
     async def get_page_images_from_pdf_async(cls, file_path: str, temp_dir: str):
-        return await asyncio.to_thread(
+        return await EXECUTOR_SERVICE.cpu.run(
             cls.get_page_images_from_pdf, file_path, temp_dir
         )
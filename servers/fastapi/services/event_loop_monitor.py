@@ -0,0 +1,187 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from constants.event_loop import (
+    DEFAULT_EVENT_LOOP_BLOCKING_THRESHOLD_MS,
+    EVENT_LOOP_BLOCKING_CALLS_KEPT,
+    EVENT_LOOP_LAG_BUCKETS_SECONDS,
+    EVENT_LOOP_LAG_WINDOW_SIZE,
+    EVENT_LOOP_MONITOR_INTERVAL_SECONDS,
+)
+from utils.get_env import (
+    get_disable_event_loop_monitor_env,
+    get_event_loop_blocking_threshold_ms_env,
+    get_event_loop_monitor_debug_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+
+def is_event_loop_monitor_enabled() -> bool:
+    return not (parse_bool_or_none(get_disable_event_loop_monitor_env()) or False)
+
+
+def is_event_loop_monitor_debug_enabled() -> bool:
+    return parse_bool_or_none(get_event_loop_monitor_debug_env()) or False
+
+
+def get_event_loop_blocking_threshold_seconds() -> float:
+    return (
+        parse_int_or_none(get_event_loop_blocking_threshold_ms_env())
+        or DEFAULT_EVENT_LOOP_BLOCKING_THRESHOLD_MS
+    ) / 1000
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop runs a callback scheduled every `interval`.
+    Anything running on the loop without yielding (sync SDK calls, file IO,
+    CPU heavy work) shows up as lag.
+    - Lag samples are kept in a histogram, like a Prometheus histogram with
+    cumulative buckets, and in a window of recent samples for percentiles.
+    - In debug mode a watchdog thread captures the stack of the loop thread
+    whenever the loop is blocked for longer than the threshold, which points
+    at the blocking call.
+    """
+
+    def __init__(
+        self,
+        interval: float = EVENT_LOOP_MONITOR_INTERVAL_SECONDS,
+        buckets: List[float] = EVENT_LOOP_LAG_BUCKETS_SECONDS,
+        debug: Optional[bool] = None,
+        blocking_threshold: Optional[float] = None,
+    ):
+        self.interval = interval
+        self.buckets = buckets
+        self.debug = debug
+        self.blocking_threshold = blocking_threshold
+
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=EVENT_LOOP_LAG_WINDOW_SIZE)
+        self.blocking_calls = deque(maxlen=EVENT_LOOP_BLOCKING_CALLS_KEPT)
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_tick = 0.0
+        self._loop_thread_id: Optional[int] = None
+
+    def record(self, lag: float):
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if lag <= bound),
+            len(self.buckets),
+        )
+        self.bucket_counts[index] += 1
+        self.count += 1
+        self.total += lag
+        self.max = max(self.max, lag)
+        self._recent.append(lag)
+
+    async def _run(self):
+        while True:
+            expected_at = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - expected_at, 0)
+            self._last_tick = time.monotonic()
+            self.record(lag)
+
+    def _watch(self):
+        """Runs in its own thread, since the loop cannot observe itself while blocked"""
+        reported_tick = None
+        while not self._stopped.wait(self.blocking_threshold / 4):
+            last_tick = self._last_tick
+            blocked_for = time.monotonic() - last_tick - self.interval
+            if blocked_for < self.blocking_threshold or reported_tick == last_tick:
+                continue
+            # One stack per stall, taken while the blocking call is still running
+            reported_tick = last_tick
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            # Full stacks only go to the logs, the metrics keep the innermost frame
+            innermost = stack[-1]
+            self.blocking_calls.append(
+                {
+                    "detected_at": datetime.now(timezone.utc).isoformat(),
+                    "blocked_seconds": round(blocked_for, 3),
+                    "location": (
+                        f"{os.path.basename(innermost.filename)}:"
+                        f"{innermost.lineno} in {innermost.name}"
+                    ),
+                }
+            )
+            print(
+                f"⚠️ Event loop blocked for over {blocked_for * 1000:.0f}ms at:\n"
+                + "".join(stack.format())
+            )
+
+    def start(self):
+        """Starts sampling the running loop, and the watchdog in debug mode"""
+        if self.debug is None:
+            self.debug = is_event_loop_monitor_debug_enabled()
+        if self.blocking_threshold is None:
+            self.blocking_threshold = get_event_loop_blocking_threshold_seconds()
+
+        self._last_tick = time.monotonic()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run())
+        if self.debug:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="event-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    def get_percentile(self, percentile: float) -> float:
+        if not self._recent:
+            return 0
+        recent = sorted(self._recent)
+        return recent[min(int(len(recent) * percentile), len(recent) - 1)]
+
+    def get_metrics(self) -> dict:
+        cumulative = 0
+        histogram = []
+        for bound, count in zip(self.buckets + [None], self.bucket_counts):
+            cumulative += count
+            histogram.append(
+                {"le": bound if bound is not None else "+Inf", "count": cumulative}
+            )
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "count": self.count,
+            "sum_seconds": self.total,
+            "max_seconds": self.max,
+            "p50_seconds": self.get_percentile(0.5),
+            "p99_seconds": self.get_percentile(0.99),
+            "histogram": histogram,
+            "debug": bool(self.debug),
+            "blocking_threshold_seconds": self.blocking_threshold,
+            "blocking_calls": list(self.blocking_calls),
+        }
+
+
+EVENT_LOOP_MONITOR = EventLoopLagMonitor()
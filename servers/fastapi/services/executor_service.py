@@ -0,0 +1,260 @@
+import asyncio
+import functools
+import multiprocessing
+import subprocess
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.thread import BrokenThreadPool
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+from constants.executors import (
+    DEFAULT_CPU_EXECUTOR_WORKERS,
+    DEFAULT_IO_EXECUTOR_WORKERS,
+    DEFAULT_LIBREOFFICE_CONCURRENCY,
+)
+from utils.get_env import (
+    get_cpu_executor_workers_env,
+    get_io_executor_workers_env,
+    get_libreoffice_concurrency_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+def get_thread_pool(max_workers: int, name: str) -> Executor:
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+
+def get_process_pool(max_workers: int, name: str) -> Executor:
+    # Spawned workers do not inherit the threads and sockets of the API process
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+class ExecutorPool:
+    """
+    A named pool for one kind of blocking work.
+    - At most `max_workers` calls run at the same time, the rest wait in the
+    queue of this pool, so one kind of work can not starve the others.
+    - Calls run in the executor of the pool, created on first use. Pools
+    without an executor only limit work awaited on the loop, like subprocesses.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        get_executor: Optional[Callable[[int, str], Executor]] = None,
+    ):
+        self.name = name
+        self.max_workers = max(max_workers, 1)
+        self._get_executor = get_executor
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._queued = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self._get_executor is None:
+                raise ValueError(f"Executor pool {self.name} has no executor")
+            self._executor = self._get_executor(self.max_workers, self.name)
+        return self._executor
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop, like the one of each test
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _acquire(self) -> float:
+        queued_at = time.perf_counter()
+        semaphore = self.semaphore
+        self._queued += 1
+        if semaphore.locked():
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        started_at = time.perf_counter()
+        wait_seconds = started_at - queued_at
+        self._total_wait_seconds += wait_seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        self._running += 1
+        return started_at
+
+    def _release(self, started_at: float, failed: bool):
+        self._running -= 1
+        self._semaphore.release()
+        self._total_run_seconds += time.perf_counter() - started_at
+        if failed:
+            self._failed += 1
+        else:
+            self._completed += 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one worker of the pool while the block runs"""
+        started_at = await self._acquire()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self._release(started_at, failed)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Runs func in the executor of the pool without blocking the event loop.
+        Functions sent to a process pool must be importable module level functions.
+        """
+        started_at = await self._acquire()
+        executor = None
+        try:
+            executor = self.executor
+            future = asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(func, *args, **kwargs)
+            )
+        except BaseException as e:
+            self._release(started_at, True)
+            self._reset_if_broken(executor, e)
+            raise
+
+        # A worker can not be interrupted, so it keeps its slot until the call
+        # returns even when the caller is cancelled
+        future.add_done_callback(
+            lambda done: self._release(
+                started_at, done.cancelled() or done.exception() is not None
+            )
+        )
+        try:
+            return await asyncio.shield(future)
+        except (BrokenProcessPool, BrokenThreadPool) as e:
+            self._reset_if_broken(executor, e)
+            raise
+
+    def _reset_if_broken(self, executor: Optional[Executor], error: BaseException):
+        # A worker died, e.g. killed for memory, the next call starts a new executor
+        if not isinstance(error, (BrokenProcessPool, BrokenThreadPool)):
+            return
+        if executor is not None and executor is self._executor:
+            print(f"Executor pool {self.name} is broken, restarting it: {error}")
+            self.shutdown()
+
+    async def run_subprocess(
+        self,
+        args: List[str],
+        timeout: Optional[float] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Runs a command in a slot of the pool, like subprocess.run with
+        check=True, capture_output=True and text=True.
+        Raises subprocess.TimeoutExpired and subprocess.CalledProcessError.
+        """
+        async with self.slot():
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                process.kill()
+                await process.wait()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise subprocess.TimeoutExpired(args, timeout)
+                raise
+
+        result = subprocess.CompletedProcess(
+            args,
+            process.returncode,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+        )
+        result.check_returncode()
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_metrics(self) -> dict:
+        finished = self._completed + self._failed
+        admitted = finished + self._running
+        return {
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "queue_depth": self._queued,
+            "max_queue_depth": self._max_queue_depth,
+            "completed": self._completed,
+            "failed": self._failed,
+            "average_wait_seconds": (
+                self._total_wait_seconds / admitted if admitted else 0
+            ),
+            "max_wait_seconds": self._max_wait_seconds,
+            "average_run_seconds": (
+                self._total_run_seconds / finished if finished else 0
+            ),
+        }
+
+
+class ExecutorService:
+    """
+    Blocking work is never run on the event loop, every kind of work has its pool
+    - io: threads for boto3 calls, file reads and writes and saving pptx files
+    - cpu: processes for docling, pdfplumber and PIL
+    - libreoffice: slots for LibreOffice and font cache subprocesses
+    """
+
+    def __init__(self):
+        self.io = ExecutorPool(
+            "io",
+            parse_int_or_none(get_io_executor_workers_env())
+            or DEFAULT_IO_EXECUTOR_WORKERS,
+            get_thread_pool,
+        )
+        self.cpu = ExecutorPool(
+            "cpu",
+            parse_int_or_none(get_cpu_executor_workers_env())
+            or DEFAULT_CPU_EXECUTOR_WORKERS,
+            get_process_pool,
+        )
+        self.libreoffice = ExecutorPool(
+            "libreoffice",
+            parse_int_or_none(get_libreoffice_concurrency_env())
+            or DEFAULT_LIBREOFFICE_CONCURRENCY,
+        )
+
+    @property
+    def pools(self) -> List[ExecutorPool]:
+        return [self.io, self.cpu, self.libreoffice]
+
+    def shutdown(self):
+        for pool in self.pools:
+            pool.shutdown()
+
+    def get_metrics(self) -> dict:
+        return {pool.name: pool.get_metrics() for pool in self.pools}
+
+
+EXECUTOR_SERVICE = ExecutorService()
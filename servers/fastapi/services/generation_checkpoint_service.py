@@ -0,0 +1,221 @@
+import copy
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from constants.presentation import (
+    DEFAULT_GENERATION_CHECKPOINT_TTL_SECONDS,
+    FAILED_SLIDE_KEY,
+)
+from crud.generation_checkpoint_crud import generation_checkpoint_crud
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from models.presentation_structure_model import PresentationStructureModel
+from utils.get_env import get_generation_checkpoint_ttl_seconds_env
+from utils.parsers import parse_int_or_none
+
+
+# Content of the slide is generated, its images and icons are not fetched yet
+SLIDE_CONTENT_GENERATED = "content_generated"
+# Content and assets of the slide are done
+SLIDE_COMPLETED = "completed"
+
+
+def get_generation_checkpoint_ttl_seconds() -> int:
+    return (
+        parse_int_or_none(get_generation_checkpoint_ttl_seconds_env())
+        or DEFAULT_GENERATION_CHECKPOINT_TTL_SECONDS
+    )
+
+
+def get_slide_fingerprint(
+    slide_layout: SlideLayoutModel,
+    outline: SlideOutlineModel,
+    language: Optional[str],
+    tone: Optional[str],
+    verbosity: Optional[str],
+    instructions: Optional[str],
+) -> str:
+    """Changes whenever the inputs of a slide change, so stale checkpoints are ignored"""
+    payload = json.dumps(
+        {
+            "layout": slide_layout.id,
+            "schema": slide_layout.json_schema,
+            "outline": outline.content,
+            "language": language,
+            "tone": tone,
+            "verbosity": verbosity,
+            "instructions": instructions,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCheckpointMetrics:
+    def __init__(self):
+        self.resumed_generations = 0
+        self.slides_reused = 0
+        self.slide_contents_reused = 0
+        self.slides_saved = 0
+        self.save_errors = 0
+
+    def get_metrics(self) -> dict:
+        return {
+            "resumed_generations": self.resumed_generations,
+            "slides_reused": self.slides_reused,
+            "slide_contents_reused": self.slide_contents_reused,
+            "slides_saved": self.slides_saved,
+            "save_errors": self.save_errors,
+        }
+
+
+GENERATION_CHECKPOINT_METRICS = GenerationCheckpointMetrics()
+
+
+class GenerationCheckpoints:
+    """
+    Per-slide progress of one presentation generation.
+    Each slide is saved once its content is generated and again once its assets
+    are fetched. A resumed generation reuses the slides whose inputs are unchanged
+    and only generates the missing ones.
+    Saving is best effort, a failed save never fails the generation.
+    """
+
+    def __init__(self, presentation_id: str):
+        self.presentation_id = presentation_id
+        self.ttl_seconds = get_generation_checkpoint_ttl_seconds()
+        self.fingerprints: List[str] = []
+        self._slides: Dict[int, dict] = {}
+
+    async def load_plan(
+        self,
+    ) -> Optional[Tuple[PresentationOutlineModel, PresentationStructureModel]]:
+        """Outlines and structure picked by an earlier attempt"""
+        try:
+            plan = await generation_checkpoint_crud.get_plan(self.presentation_id)
+        except Exception as e:
+            print(f"Error reading generation checkpoint: {e}")
+            return None
+        if not plan:
+            return None
+        return (
+            PresentationOutlineModel(**plan["outlines"]),
+            PresentationStructureModel(**plan["structure"]),
+        )
+
+    async def save_plan(
+        self,
+        outlines: PresentationOutlineModel,
+        structure: PresentationStructureModel,
+    ):
+        try:
+            await generation_checkpoint_crud.save_plan(
+                self.presentation_id,
+                {
+                    "outlines": outlines.model_dump(mode="json"),
+                    "structure": structure.model_dump(mode="json"),
+                },
+                self.ttl_seconds,
+            )
+        except Exception as e:
+            GENERATION_CHECKPOINT_METRICS.save_errors += 1
+            print(f"Error saving generation checkpoint: {e}")
+
+    async def load_slides(self, fingerprints: List[str], resume: bool):
+        """
+        Tracks the slides of this generation.
+        On resume, picks up the slides of an earlier attempt with the same inputs.
+        """
+        self.fingerprints = fingerprints
+        self._slides = {}
+        if not resume:
+            return
+
+        try:
+            checkpoints = await generation_checkpoint_crud.get_slides(
+                self.presentation_id
+            )
+        except Exception as e:
+            print(f"Error reading generation checkpoints: {e}")
+            return
+
+        for slide_number, checkpoint in checkpoints.items():
+            if (
+                slide_number < len(fingerprints)
+                and checkpoint.get("fingerprint") == fingerprints[slide_number]
+            ):
+                self._slides[slide_number] = checkpoint
+
+        if self._slides:
+            GENERATION_CHECKPOINT_METRICS.resumed_generations += 1
+        print(
+            f"Resuming presentation {self.presentation_id}: "
+            f"{len(self.completed_slide_numbers)} of {len(fingerprints)} slides completed, "
+            f"{len(self._slides) - len(self.completed_slide_numbers)} with content only"
+        )
+
+    @property
+    def completed_slide_numbers(self) -> List[int]:
+        return sorted(
+            slide_number
+            for slide_number, checkpoint in self._slides.items()
+            if checkpoint["status"] == SLIDE_COMPLETED
+        )
+
+    def is_completed(self, slide_number: int) -> bool:
+        checkpoint = self._slides.get(slide_number)
+        return bool(checkpoint) and checkpoint["status"] == SLIDE_COMPLETED
+
+    def get_content(self, slide_number: int) -> Optional[dict]:
+        """Content of the slide from an earlier attempt, with its assets if completed"""
+        checkpoint = self._slides.get(slide_number)
+        if not checkpoint:
+            return None
+        if checkpoint["status"] == SLIDE_COMPLETED:
+            GENERATION_CHECKPOINT_METRICS.slides_reused += 1
+        else:
+            GENERATION_CHECKPOINT_METRICS.slide_contents_reused += 1
+        return copy.deepcopy(checkpoint["content"])
+
+    async def _save_slide(self, slide_number: int, status: str, content: dict):
+        # Placeholders of failed slides are generated again on resume, failed
+        # generations raise before their content gets here
+        if not isinstance(content, dict) or content.get(FAILED_SLIDE_KEY):
+            return
+        checkpoint = {
+            "fingerprint": self.fingerprints[slide_number],
+            "status": status,
+            "content": copy.deepcopy(content),
+        }
+        self._slides[slide_number] = checkpoint
+        try:
+            await generation_checkpoint_crud.save_slide(
+                self.presentation_id,
+                slide_number,
+                checkpoint["fingerprint"],
+                status,
+                checkpoint["content"],
+                self.ttl_seconds,
+            )
+            GENERATION_CHECKPOINT_METRICS.slides_saved += 1
+        except Exception as e:
+            GENERATION_CHECKPOINT_METRICS.save_errors += 1
+            print(f"Error saving checkpoint of slide {slide_number}: {e}")
+
+    async def save_content(self, slide_number: int, content: dict):
+        await self._save_slide(slide_number, SLIDE_CONTENT_GENERATED, content)
+
+    async def save_completed(self, slide_number: int, content: dict):
+        await self._save_slide(slide_number, SLIDE_COMPLETED, content)
+
+    async def clear(self):
+        """Called once the slides are saved, the checkpoints are not needed anymore"""
+        self._slides = {}
+        try:
+            await generation_checkpoint_crud.delete_checkpoints(self.presentation_id)
+        except Exception as e:
+            print(f"Error deleting generation checkpoints: {e}")
@@ -6,6 +6,8 @@ from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 from db.mongo import get_database
 from models.mongo.asset import AssetCreate
 from crud.asset_crud import asset_crud
+from services.executor_service import EXECUTOR_SERVICE
+from utils.file_utils import read_file
 import logging
 
 logger = logging.getLogger(__name__)
@@ -50,8 +52,7 @@ class GridFSService:
         """
         try:
             # Read file content
-            with open(file_path, 'rb') as file:
-                file_content = file.read()
+            file_content = await EXECUTOR_SERVICE.io.run(read_file, file_path)
             
             # Get file size
             file_size = len(file_content)
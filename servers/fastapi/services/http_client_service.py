@@ -0,0 +1,86 @@
+import asyncio
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+from constants.http import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_SOCK_READ_TIMEOUT,
+    HTTP_TOTAL_TIMEOUT,
+)
+
+
+def get_http_timeout() -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(
+        total=HTTP_TOTAL_TIMEOUT,
+        connect=HTTP_CONNECT_TIMEOUT,
+        sock_read=HTTP_SOCK_READ_TIMEOUT,
+    )
+
+
+class HttpClientService:
+    """
+    Process-wide aiohttp sessions for the outbound HTTP calls.
+    - Sessions are long-lived so connections to image providers, webhooks and the
+    Next.js service are kept alive and reused, with per-host limits and cached DNS.
+    - Calls to external services honour the proxy environment variables, calls
+    to the services of this deployment don't.
+    A session belongs to the event loop it was created on, it is created again
+    when used from another loop.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[
+            bool, Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]
+        ] = {}
+        self._stale_sessions: List[
+            Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]
+        ] = []
+
+    def _create_session(self, trust_env: bool) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        )
+        return aiohttp.ClientSession(
+            connector=connector, timeout=get_http_timeout(), trust_env=trust_env
+        )
+
+    def get_session(self, trust_env: bool = False) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if trust_env in self._sessions:
+            session, session_loop = self._sessions[trust_env]
+            if session_loop is loop and not session.closed:
+                return session
+            self._stale_sessions.append((session, session_loop))
+
+        session = self._create_session(trust_env)
+        self._sessions[trust_env] = (session, loop)
+        return session
+
+    def start(self):
+        """Creates the sessions on the loop of the application"""
+        self.get_session(trust_env=False)
+        self.get_session(trust_env=True)
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions = {}
+        loop = asyncio.get_running_loop()
+        for session, session_loop in sessions + self._stale_sessions:
+            # Sessions of another loop can't be closed from this one
+            if session_loop is loop and not session.closed:
+                try:
+                    await session.close()
+                except Exception as e:
+                    print(f"Error closing HTTP session: {e}")
+        self._stale_sessions = []
+
+
+HTTP_CLIENT_SERVICE = HttpClientService()
@@ -0,0 +1,158 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+
+from constants.presentation import (
+    DEFAULT_IMAGE_CACHE_MAX_ENTRIES,
+    DEFAULT_IMAGE_CACHE_TTL_SECONDS,
+    DEFAULT_IMAGE_URL_CACHE_TTL_SECONDS,
+    IMAGE_PROVIDER_URL_CACHE_TTL_SECONDS,
+)
+from crud.asset_crud import asset_crud
+from models.mongo.asset import AssetInDB
+from utils.get_env import (
+    get_disable_image_cache_env,
+    get_image_cache_max_entries_env,
+    get_image_cache_ttl_seconds_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+
+class ImageCacheService:
+    """
+    Cache of the images resolved by the image providers, stored in the assets
+    collection and shared by every process.
+    - Keyed by the provider, the normalized prompt and the image size, so
+    regenerated and duplicated decks make no provider calls.
+    - Entries expire after the TTL, URL only entries after the shorter TTL of
+    their provider, and the least recently used ones are evicted once there
+    are more than the max number of entries.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stored = 0
+        self.evicted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return not (parse_bool_or_none(get_disable_image_cache_env()) or False)
+
+    @property
+    def ttl_seconds(self) -> int:
+        return (
+            parse_int_or_none(get_image_cache_ttl_seconds_env())
+            or DEFAULT_IMAGE_CACHE_TTL_SECONDS
+        )
+
+    def get_ttl_seconds(self, provider: str, is_asset: bool) -> int:
+        if is_asset:
+            return self.ttl_seconds
+        return min(
+            IMAGE_PROVIDER_URL_CACHE_TTL_SECONDS.get(
+                provider, DEFAULT_IMAGE_URL_CACHE_TTL_SECONDS
+            ),
+            self.ttl_seconds,
+        )
+
+    @property
+    def max_entries(self) -> int:
+        return (
+            parse_int_or_none(get_image_cache_max_entries_env())
+            or DEFAULT_IMAGE_CACHE_MAX_ENTRIES
+        )
+
+    def get_key(self, provider: str, prompt: str, size: Optional[str]) -> str:
+        # Image prompts have no structure, any whitespace difference is ignored
+        normalized_prompt = " ".join((prompt or "").split()).lower()
+        key_data = json.dumps([provider, normalized_prompt, size])
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str | AssetInDB]:
+        """Returns the cached image like the provider returned it, a URL or an asset"""
+        try:
+            entry = await asset_crud.get_image_cache_entry(key)
+        except Exception as e:
+            print(f"Error reading image cache: {e}")
+            entry = None
+
+        if not entry:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if not entry.get("is_asset"):
+            return entry["file_path"]
+        return AssetInDB(
+            filename=entry["filename"],
+            file_path=entry["file_path"],
+            file_size=entry["file_size"],
+            mime_type=entry["mime_type"],
+            asset_type="image",
+            user_id="system",
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            metadata={**(entry.get("metadata") or {}), "cached": True},
+        )
+
+    async def set(
+        self,
+        key: str,
+        provider: str,
+        prompt: str,
+        size: Optional[str],
+        image: str | AssetInDB,
+    ):
+        if isinstance(image, AssetInDB):
+            entry = {
+                "filename": image.filename,
+                "file_path": image.file_path,
+                "file_size": image.file_size,
+                "mime_type": image.mime_type,
+                "metadata": image.metadata,
+                "is_asset": True,
+            }
+        else:
+            entry = {
+                "filename": image.rsplit("/", 1)[-1],
+                "file_path": image,
+                "file_size": 0,
+                "mime_type": "image/*",
+                "metadata": None,
+                "is_asset": False,
+            }
+        entry["metadata"] = {
+            **(entry["metadata"] or {}),
+            "provider": provider,
+            "cached_prompt": prompt,
+            "size": size,
+        }
+
+        try:
+            await asset_crud.set_image_cache_entry(
+                key, entry, self.get_ttl_seconds(provider, entry["is_asset"])
+            )
+            self.stored += 1
+            self.evicted += await asset_crud.evict_image_cache_entries(
+                self.max_entries
+            )
+        except Exception as e:
+            print(f"Error writing image cache: {e}")
+
+    def get_metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "stored": self.stored,
+            "evicted": self.evicted,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
+
+
+IMAGE_CACHE_SERVICE = ImageCacheService()
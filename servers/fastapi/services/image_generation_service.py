@@ -1,28 +1,33 @@
-import asyncio
 import os
-import aiohttp
-from google import genai
 from google.genai.types import GenerateContentConfig
-from openai import AsyncOpenAI
 from models.image_prompt import ImagePrompt
 from models.mongo.asset import AssetInDB
 from utils.download_helpers import download_file
+from utils.get_env import get_google_api_key_env
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
 from utils.image_provider import (
+    get_selected_image_provider,
     is_pixels_selected,
     is_pixabay_selected,
     is_gemini_flash_selected,
     is_dalle3_selected,
 )
+from constants.presentation import IMAGE_PROVIDER_IMAGE_SIZES
+from services.executor_service import EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.image_cache_service import IMAGE_CACHE_SERVICE
+from services.llm_sdk_client_registry import LLM_SDK_CLIENT_REGISTRY
 from services.s3_service import s3_service
+from utils.file_utils import write_file
 import uuid
 
 
 class ImageGenerationService:
 
-    def __init__(self, output_directory: str):
+    def __init__(self, output_directory: str, use_image_cache: bool = True):
         self.output_directory = output_directory
+        self.use_image_cache = use_image_cache
         self.image_gen_func = self.get_image_gen_func()
 
     def get_image_gen_func(self):
@@ -46,6 +51,8 @@ class ImageGenerationService:
         - If the stock provider is selected, it uses the prompt directly,
         otherwise it uses the full image prompt with theme.
         - Output Directory is used for saving the generated image not the stock provider.
+        - Images are looked up in the image cache before calling the provider,
+        unless the cache is disabled or bypassed for this service.
         """
         print(f"🖼️ IMAGE GENERATION: Starting image generation for prompt: {prompt.prompt}")
         print(f"🖼️ IMAGE GENERATION: Image generation function available: {self.image_gen_func is not None}")
@@ -61,6 +68,26 @@ class ImageGenerationService:
         print(f"🖼️ IMAGE GENERATION: Final image prompt: {image_prompt}")
         print(f"🖼️ IMAGE GENERATION: Is stock provider: {self.is_stock_provider_selected()}")
 
+        provider = get_selected_image_provider().value
+        size = IMAGE_PROVIDER_IMAGE_SIZES.get(provider)
+        use_image_cache = self.use_image_cache and IMAGE_CACHE_SERVICE.enabled
+        if use_image_cache:
+            cache_key = IMAGE_CACHE_SERVICE.get_key(provider, image_prompt, size)
+            cached_image = await IMAGE_CACHE_SERVICE.get(cache_key)
+            if cached_image:
+                print(f"🖼️ IMAGE GENERATION: Using cached image for prompt: {image_prompt}")
+                return cached_image
+        else:
+            IMAGE_CACHE_SERVICE.bypassed += 1
+
+        image = await self.get_image_from_provider(prompt, image_prompt)
+        if use_image_cache and image != "/static/images/placeholder.jpg":
+            await IMAGE_CACHE_SERVICE.set(cache_key, provider, image_prompt, size, image)
+        return image
+
+    async def get_image_from_provider(
+        self, prompt: ImagePrompt, image_prompt: str
+    ) -> str | AssetInDB:
         try:
             if self.is_stock_provider_selected():
                 print(f"🖼️ IMAGE GENERATION: Using stock provider")
@@ -83,7 +110,9 @@ class ImageGenerationService:
                     
                     try:
                         # Upload to S3
-                        s3_url = s3_service.upload_file(image_path)
+                        s3_url = await EXECUTOR_SERVICE.io.run(
+                            s3_service.upload_file, image_path
+                        )
                         print(f"🖼️ IMAGE GENERATION: Successfully uploaded to S3: {s3_url}")
                         
                         # Get file info
@@ -180,13 +209,13 @@ class ImageGenerationService:
         
         print(f"🖼️ DALL-E 3: Using OpenAI API key: {api_key[:10]}...")
         
-        client = AsyncOpenAI(api_key=api_key)
+        client = LLM_SDK_CLIENT_REGISTRY.get_openai_client(api_key)
         result = await client.images.generate(
             model="dall-e-3",
             prompt=prompt,
             n=1,
             quality="standard",
-            size="1024x1024",
+            size=IMAGE_PROVIDER_IMAGE_SIZES["dall-e-3"],
         )
         image_url = result.data[0].url
         print(f"🖼️ DALL-E 3: Generated image URL: {image_url}")
@@ -196,9 +225,8 @@ class ImageGenerationService:
         return downloaded_path
 
     async def generate_image_google(self, prompt: str, output_directory: str) -> str:
-        client = genai.Client()
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        client = LLM_SDK_CLIENT_REGISTRY.get_google_client(get_google_api_key_env())
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash-image-preview",
             contents=[prompt],
             config=GenerateContentConfig(response_modalities=["TEXT", "IMAGE"]),
@@ -219,26 +247,25 @@ class ImageGenerationService:
         temp_filename = f"{uuid.uuid4()}.jpg"
         image_path = os.path.join(output_directory, temp_filename)
         
-        with open(image_path, "wb") as f:
-            f.write(image_data)
+        await EXECUTOR_SERVICE.io.run(write_file, image_path, image_data)
         
         return image_path
 
     async def get_image_from_pexels(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-                headers={"Authorization": f"{get_pexels_api_key_env()}"},
-            )
+        session = HTTP_CLIENT_SERVICE.get_session(trust_env=True)
+        async with session.get(
+            f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
+            headers={"Authorization": f"{get_pexels_api_key_env()}"},
+        ) as response:
             data = await response.json()
-            image_url = data["photos"][0]["src"]["large"]
-            return image_url
+        image_url = data["photos"][0]["src"]["large"]
+        return image_url
 
     async def get_image_from_pixabay(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
-            )
+        session = HTTP_CLIENT_SERVICE.get_session(trust_env=True)
+        async with session.get(
+            f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
+        ) as response:
             data = await response.json()
-            image_url = data["hits"][0]["largeImageURL"]
-            return image_url
+        image_url = data["hits"][0]["largeImageURL"]
+        return image_url
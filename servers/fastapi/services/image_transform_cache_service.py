@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import time
+
+from constants.presentation import DEFAULT_IMAGE_TRANSFORM_CACHE_TTL_SECONDS
+from utils.asset_directory_utils import get_image_transform_cache_directory
+from utils.get_env import (
+    get_disable_image_transform_cache_env,
+    get_image_transform_cache_ttl_seconds_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+
+def get_file_hash(file_path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class ImageTransformCacheService:
+    """
+    On-disk cache of the transformed pictures of exported decks.
+    - Keyed by a hash of the source image, the transform and the target size,
+    so an image is only processed once however many slides and exports use it.
+    - Entries are touched when reused, and the ones unused for longer than the
+    TTL are pruned on startup.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return not (
+            parse_bool_or_none(get_disable_image_transform_cache_env()) or False
+        )
+
+    @property
+    def ttl_seconds(self) -> int:
+        return (
+            parse_int_or_none(get_image_transform_cache_ttl_seconds_env())
+            or DEFAULT_IMAGE_TRANSFORM_CACHE_TTL_SECONDS
+        )
+
+    @property
+    def directory(self) -> str:
+        return get_image_transform_cache_directory()
+
+    def get_key(self, source_path: str, transform: dict) -> str:
+        """Reads the source image, so it runs in the CPU pool with the transform"""
+        transform_json = json.dumps(transform, sort_keys=True)
+        key_data = f"{get_file_hash(source_path)}:{transform_json}"
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def record(self, cached: bool, pictures: int = 1):
+        """Counts one transform, shared by the given number of pictures"""
+        if cached:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.deduplicated += pictures - 1
+
+    def prune(self) -> int:
+        """Deletes the entries unused for longer than the TTL"""
+        if not self.enabled:
+            return 0
+        expired_before = time.time() - self.ttl_seconds
+        pruned = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < expired_before:
+                        os.remove(entry.path)
+                        pruned += 1
+                except OSError as e:
+                    print(f"Could not prune image transform cache entry: {e}")
+        return pruned
+
+    def get_metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
+
+
+IMAGE_TRANSFORM_CACHE_SERVICE = ImageTransformCacheService()
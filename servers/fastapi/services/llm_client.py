@@ -1,10 +1,15 @@
 import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 import dirtyjson
 import json
 from datetime import datetime
-from typing import AsyncGenerator, List, Optional
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, TypeVar
 from fastapi import HTTPException
-from openai import AsyncOpenAI
+from openai import NOT_GIVEN, AsyncOpenAI
 from google import genai
 from google.genai.types import Content as GoogleContent, Part as GoogleContentPart
 from google.genai.types import (
@@ -18,7 +23,17 @@ from google.genai.types import Tool as GoogleTool
 from anthropic import AsyncAnthropic
 from anthropic.types import Message as AnthropicMessage
 from anthropic import MessageStreamEvent as AnthropicMessageStreamEvent
+from constants.llm import (
+    DEFAULT_LLM_MAX_CONCURRENCY,
+    DEFAULT_LLM_REQUESTS_PER_MINUTE,
+    DEFAULT_LLM_TOKENS_PER_MINUTE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_ROUTE_COOLDOWN_SECONDS,
+    LLM_ROUTE_MAX_CONSECUTIVE_FAILURES,
+    LLM_ROUTE_WINDOW_SIZE,
+)
 from enums.llm_provider import LLMProvider
+from enums.llm_request_priority import LLMRequestPriority
 from models.llm_message import (
     AnthropicAssistantMessage,
     AnthropicUserMessage,
@@ -37,8 +52,8 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from services.llm_sdk_client_registry import LLM_SDK_CLIENT_REGISTRY
 from services.llm_tool_calls_handler import LLMToolCallsHandler
-from utils.async_iterator import iterator_to_async
 from utils.dummy_functions import do_nothing_async
 from utils.get_env import (
     get_anthropic_api_key_env,
@@ -46,12 +61,17 @@ from utils.get_env import (
     get_custom_llm_url_env,
     get_disable_thinking_env,
     get_google_api_key_env,
+    get_llm_hedging_env,
+    get_llm_max_concurrency_env,
+    get_llm_requests_per_minute_env,
+    get_llm_routes_env,
+    get_llm_tokens_per_minute_env,
     get_openai_api_key_env,
     get_tool_calls_env,
     get_web_grounding_env,
 )
-from utils.llm_provider import get_llm_provider, get_model
-from utils.parsers import parse_bool_or_none
+from utils.llm_provider import get_llm_provider, get_model, get_model_for_provider
+from utils.parsers import parse_bool_or_none, parse_int_or_none
 from utils.schema_utils import (
     ensure_strict_json_schema,
     flatten_json_schema,
@@ -59,9 +79,263 @@ from utils.schema_utils import (
 )
 
 
-class LLMClient:
+class TokenBucket:
+    """Refills `limit_per_minute` tokens every minute, up to `limit_per_minute`"""
+
+    def __init__(self, limit_per_minute: int):
+        self.capacity = limit_per_minute
+        self.tokens = float(limit_per_minute)
+        self.refill_per_second = limit_per_minute / 60
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.refill_per_second,
+        )
+        self.updated_at = now
+
+    def get_wait_time(self, amount: int) -> float:
+        # Requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        self._refill()
+        if self.tokens >= amount:
+            return 0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: int):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMRateLimiter:
+    """
+    Admission control for one LLM provider, shared by every request in the process.
+    - At most `max_concurrency` calls are in flight at the same time.
+    - Every call takes one request and its estimated tokens from per minute buckets.
+    - Waiting calls are admitted by priority, then in arrival order.
+    Calls wait in the queue instead of failing when a limit is reached.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.requests_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self._queue: List[tuple] = []
+        self._counter = itertools.count()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self._admitted = 0
+        self._total_wait_seconds = 0.0
+        self._max_queue_depth = 0
+
+    def _get_wait_time(self, tokens: int) -> float:
+        wait_time = 0
+        if self.requests_bucket:
+            wait_time = max(wait_time, self.requests_bucket.get_wait_time(1))
+        if self.tokens_bucket:
+            wait_time = max(wait_time, self.tokens_bucket.get_wait_time(tokens))
+        return wait_time
+
+    def _dispatch(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue:
+            _, _, tokens, future = self._queue[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                return
+            wait_time = self._get_wait_time(tokens)
+            if wait_time > 0:
+                self._timer = asyncio.get_running_loop().call_later(
+                    wait_time, self._dispatch
+                )
+                return
+
+            heapq.heappop(self._queue)
+            if self.requests_bucket:
+                self.requests_bucket.consume(1)
+            if self.tokens_bucket:
+                self.tokens_bucket.consume(tokens)
+            self._in_flight += 1
+            future.set_result(None)
+
+    async def acquire(
+        self, priority: LLMRequestPriority = LLMRequestPriority.BULK, tokens: int = 0
+    ):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._queue, (priority.value, next(self._counter), tokens, future)
+        )
+        self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+
+        started_at = time.perf_counter()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted and cancelled at the same time
+                self.release()
+            else:
+                self._dispatch()
+            raise
+
+        self._admitted += 1
+        self._total_wait_seconds += time.perf_counter() - started_at
+
+    def release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def limit(
+        self, priority: LLMRequestPriority = LLMRequestPriority.BULK, tokens: int = 0
+    ):
+        await self.acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def queue_depth(self) -> int:
+        return len([each for each in self._queue if not each[3].done()])
+
+    def get_metrics(self) -> dict:
+        queue_depth_by_priority = {each.name.lower(): 0 for each in LLMRequestPriority}
+        for priority, _, _, future in self._queue:
+            if not future.done():
+                queue_depth_by_priority[LLMRequestPriority(priority).name.lower()] += 1
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": (
+                self.requests_bucket.capacity if self.requests_bucket else None
+            ),
+            "tokens_per_minute": (
+                self.tokens_bucket.capacity if self.tokens_bucket else None
+            ),
+            "in_flight": self._in_flight,
+            "queue_depth": sum(queue_depth_by_priority.values()),
+            "queue_depth_by_priority": queue_depth_by_priority,
+            "max_queue_depth": self._max_queue_depth,
+            "admitted": self._admitted,
+            "average_wait_seconds": (
+                self._total_wait_seconds / self._admitted if self._admitted else 0
+            ),
+        }
+
+
+LLM_RATE_LIMITERS: Dict[LLMProvider, LLMRateLimiter] = {}
+
+
+def get_llm_rate_limiter(provider: LLMProvider) -> LLMRateLimiter:
+    """
+    Returns the process-wide rate limiter of the provider.
+    Limits are read from the environment when the limiter is first created.
+    """
+    if provider not in LLM_RATE_LIMITERS:
+        LLM_RATE_LIMITERS[provider] = LLMRateLimiter(
+            max_concurrency=parse_int_or_none(
+                get_llm_max_concurrency_env(provider.value)
+            )
+            or DEFAULT_LLM_MAX_CONCURRENCY,
+            requests_per_minute=parse_int_or_none(
+                get_llm_requests_per_minute_env(provider.value)
+            )
+            or DEFAULT_LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=parse_int_or_none(
+                get_llm_tokens_per_minute_env(provider.value)
+            )
+            or DEFAULT_LLM_TOKENS_PER_MINUTE,
+        )
+    return LLM_RATE_LIMITERS[provider]
+
+
+def estimate_llm_tokens(
+    messages: List[LLMMessage],
+    max_tokens: Optional[int] = None,
+    response_format: Optional[dict] = None,
+) -> int:
+    """Rough token count of a call, about 4 characters per token plus the output budget"""
+    characters = sum(len(str(getattr(each, "content", "") or "")) for each in messages)
+    if response_format:
+        characters += len(json.dumps(response_format))
+    return characters // 4 + (max_tokens or 0)
+
+
+class LLMUsageTracker:
+    """
+    Token usage reported by the providers, per provider.
+    Cached input tokens are the ones served from the provider prompt cache.
+    """
+
     def __init__(self):
-        self.llm_provider = get_llm_provider()
+        self._usage: Dict[str, Dict[str, int]] = {}
+
+    def record(
+        self,
+        provider: LLMProvider,
+        input_tokens: int,
+        cached_input_tokens: int,
+        output_tokens: int,
+    ):
+        usage = self._usage.setdefault(
+            provider.value,
+            {
+                "requests": 0,
+                "input_tokens": 0,
+                "cached_input_tokens": 0,
+                "output_tokens": 0,
+            },
+        )
+        usage["requests"] += 1
+        usage["input_tokens"] += input_tokens
+        usage["cached_input_tokens"] += cached_input_tokens
+        usage["output_tokens"] += output_tokens
+
+    def get_metrics(self) -> dict:
+        return {
+            provider: {
+                **usage,
+                "cached_input_ratio": (
+                    usage["cached_input_tokens"] / usage["input_tokens"]
+                    if usage["input_tokens"]
+                    else 0
+                ),
+            }
+            for provider, usage in self._usage.items()
+        }
+
+
+LLM_USAGE_TRACKER = LLMUsageTracker()
+
+
+class LLMClient:
+    def __init__(
+        self,
+        priority: LLMRequestPriority = LLMRequestPriority.BULK,
+        provider: Optional[LLMProvider] = None,
+    ):
+        self.llm_provider = provider or get_llm_provider()
+        self.priority = priority
+        self.rate_limiter = get_llm_rate_limiter(self.llm_provider)
         self._client = self._get_client()
         self.tool_calls_handler = LLMToolCallsHandler(self)
 
@@ -104,9 +378,7 @@ class LLMClient:
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI(
-            api_key=get_openai_api_key_env(),
-        )
+        return LLM_SDK_CLIENT_REGISTRY.get_openai_client(get_openai_api_key_env())
 
     def _get_google_client(self):
         if not get_google_api_key_env():
@@ -114,7 +386,7 @@ class LLMClient:
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return LLM_SDK_CLIENT_REGISTRY.get_google_client(get_google_api_key_env())
 
     def _get_anthropic_client(self):
         if not get_anthropic_api_key_env():
@@ -122,7 +394,9 @@ class LLMClient:
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return LLM_SDK_CLIENT_REGISTRY.get_anthropic_client(
+            get_anthropic_api_key_env()
+        )
 
 
     def _get_custom_client(self):
@@ -131,17 +405,81 @@ class LLMClient:
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
+        return LLM_SDK_CLIENT_REGISTRY.get_openai_client(
+            get_custom_llm_api_key_env() or "null",
             base_url=get_custom_llm_url_env(),
-            api_key=get_custom_llm_api_key_env() or "null",
         )
 
+    # ? Usage
+    def _record_usage(self, response):
+        try:
+            match self.llm_provider:
+                case LLMProvider.ANTHROPIC:
+                    usage = response.usage
+                    cached_tokens = usage.cache_read_input_tokens or 0
+                    input_tokens = (
+                        usage.input_tokens
+                        + cached_tokens
+                        + (usage.cache_creation_input_tokens or 0)
+                    )
+                    output_tokens = usage.output_tokens
+                case LLMProvider.GOOGLE:
+                    usage = response.usage_metadata
+                    input_tokens = usage.prompt_token_count or 0
+                    cached_tokens = usage.cached_content_token_count or 0
+                    output_tokens = usage.candidates_token_count or 0
+                case _:
+                    usage = response.usage
+                    input_tokens = usage.prompt_tokens
+                    details = usage.prompt_tokens_details
+                    cached_tokens = (details.cached_tokens or 0) if details else 0
+                    output_tokens = usage.completion_tokens
+        except AttributeError:
+            # Response without usage, e.g. a stream chunk or an older server
+            return
+
+        LLM_USAGE_TRACKER.record(
+            self.llm_provider, input_tokens, cached_tokens, output_tokens
+        )
+        if cached_tokens:
+            print(
+                f"LLM usage: {input_tokens} input tokens, "
+                f"{cached_tokens} cached, {output_tokens} output"
+            )
+
     # ? Prompts
     def _get_system_prompt(self, messages: List[LLMMessage]) -> str:
-        for message in messages:
-            if isinstance(message, LLMSystemMessage):
-                return message.content
-        return ""
+        # The first system message is the static prefix, so it must stay first
+        return "\n".join(
+            message.content
+            for message in messages
+            if isinstance(message, LLMSystemMessage)
+        )
+
+    def _get_openai_messages(self, messages: List[LLMMessage]) -> List[dict]:
+        # Some OpenAI compatible servers only accept a single system message
+        system_prompt = self._get_system_prompt(messages)
+        openai_messages = [
+            message.model_dump()
+            for message in messages
+            if not isinstance(message, LLMSystemMessage)
+        ]
+        if system_prompt:
+            openai_messages.insert(0, {"role": "system", "content": system_prompt})
+        return openai_messages
+
+    def _get_anthropic_system(self, messages: List[LLMMessage]) -> List[dict] | str:
+        system_messages = [
+            message for message in messages if isinstance(message, LLMSystemMessage)
+        ]
+        if not system_messages:
+            return ""
+        blocks = [{"type": "text", "text": message.content} for message in system_messages]
+        # The static prefix alone is below the minimum cacheable length of
+        # Anthropic (1024 tokens), so the breakpoint is on the last system block,
+        # which stays the same for every slide of a layout in a deck
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        return blocks
 
     def _get_google_messages(self, messages: List[LLMMessage]) -> List[GoogleContent]:
         contents = []
@@ -188,11 +526,12 @@ class LLMClient:
         client: AsyncOpenAI = self._client
         response = await client.chat.completions.create(
             model=model,
-            messages=[message.model_dump() for message in messages],
+            messages=self._get_openai_messages(messages),
             max_completion_tokens=max_tokens,
             tools=tools,
             extra_body=extra_body,
         )
+        self._record_usage(response)
         tool_calls = response.choices[0].message.tool_calls
         if tool_calls:
             parsed_tool_calls = [
@@ -244,8 +583,7 @@ class LLMClient:
         if tools:
             google_tools = [GoogleTool(function_declarations=[tool]) for tool in tools]
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -255,6 +593,7 @@ class LLMClient:
                 max_output_tokens=max_tokens,
             ),
         )
+        self._record_usage(response)
 
         content = response.candidates[0].content
         response_parts = content.parts
@@ -310,7 +649,7 @@ class LLMClient:
 
         response: AnthropicMessage = await client.messages.create(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -318,6 +657,7 @@ class LLMClient:
             tools=tools,
             max_tokens=max_tokens or 4000,
         )
+        self._record_usage(response)
         text_content = None
         tool_calls: List[AnthropicToolCall] = []
         for content in response.content:
@@ -385,32 +725,35 @@ class LLMClient:
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
         content = None
-        match self.llm_provider:
-            case LLMProvider.OPENAI:
-                content = await self._generate_openai(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.GOOGLE:
-                content = await self._generate_google(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.ANTHROPIC:
-                content = await self._generate_anthropic(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.CUSTOM:
-                content = await self._generate_custom(
-                    model=model, messages=messages, max_tokens=max_tokens
-                )
+        async with self.rate_limiter.limit(
+            self.priority, estimate_llm_tokens(messages, max_tokens)
+        ):
+            match self.llm_provider:
+                case LLMProvider.OPENAI:
+                    content = await self._generate_openai(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.GOOGLE:
+                    content = await self._generate_google(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.ANTHROPIC:
+                    content = await self._generate_anthropic(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.CUSTOM:
+                    content = await self._generate_custom(
+                        model=model, messages=messages, max_tokens=max_tokens
+                    )
         if content is None:
             raise HTTPException(
                 status_code=400,
@@ -460,7 +803,7 @@ class LLMClient:
 
         response = await client.chat.completions.create(
             model=model,
-            messages=[message.model_dump() for message in messages],
+            messages=self._get_openai_messages(messages),
             response_format=(
                 {
                     "type": "json_schema",
@@ -479,6 +822,7 @@ class LLMClient:
             tools=all_tools,
             extra_body=extra_body,
         )
+        self._record_usage(response)
 
         content = response.choices[0].message.content
 
@@ -561,8 +905,7 @@ class LLMClient:
                 )
             )
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -582,6 +925,7 @@ class LLMClient:
                 max_output_tokens=max_tokens,
             ),
         )
+        self._record_usage(response)
 
         content = response.candidates[0].content
         response_parts = content.parts
@@ -645,7 +989,7 @@ class LLMClient:
         client: AsyncAnthropic = self._client
         response: AnthropicMessage = await client.messages.create(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -660,6 +1004,7 @@ class LLMClient:
                 *(tools or []),
             ],
         )
+        self._record_usage(response)
         tool_calls: List[AnthropicToolCall] = []
         for content in response.content:
             if content.type == "tool_use":
@@ -734,40 +1079,44 @@ class LLMClient:
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
         content = None
-        match self.llm_provider:
-            case LLMProvider.OPENAI:
-                content = await self._generate_openai_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    strict=strict,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.GOOGLE:
-                content = await self._generate_google_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.ANTHROPIC:
-                content = await self._generate_anthropic_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.CUSTOM:
-                content = await self._generate_custom_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    strict=strict,
-                    max_tokens=max_tokens,
-                )
+        async with self.rate_limiter.limit(
+            self.priority,
+            estimate_llm_tokens(messages, max_tokens, response_format),
+        ):
+            match self.llm_provider:
+                case LLMProvider.OPENAI:
+                    content = await self._generate_openai_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.GOOGLE:
+                    content = await self._generate_google_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.ANTHROPIC:
+                    content = await self._generate_anthropic_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.CUSTOM:
+                    content = await self._generate_custom_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        max_tokens=max_tokens,
+                    )
         if content is None:
             raise HTTPException(
                 status_code=400,
@@ -775,6 +1124,27 @@ class LLMClient:
             )
         return content
 
+    async def _limit_stream(self, stream: AsyncGenerator, tokens: int):
+        # Holds the admission slot until the stream is consumed or closed,
+        # callers should consume it with `aclosing` so an early exit closes it
+        await self.rate_limiter.acquire(self.priority, tokens)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # Also runs on GeneratorExit when the stream is closed early
+            try:
+                await stream.aclose()
+            finally:
+                self.rate_limiter.release()
+
+    def _get_openai_stream_options(self):
+        # Streamed responses only report usage with this option, which some
+        # OpenAI compatible servers reject
+        if self.llm_provider == LLMProvider.OPENAI:
+            return {"include_usage": True}
+        return NOT_GIVEN
+
     # ? Stream Unstructured Content
     async def _stream_openai(
         self,
@@ -794,13 +1164,16 @@ class LLMClient:
         current_arguments = None
         async for event in await client.chat.completions.create(
             model=model,
-            messages=[message.model_dump() for message in messages],
+            messages=self._get_openai_messages(messages),
             max_completion_tokens=max_tokens,
             tools=tools,
             extra_body=extra_body,
             stream=True,
+            stream_options=self._get_openai_stream_options(),
         ):
             event: OpenAIChatCompletionChunk = event
+            if event.usage:
+                self._record_usage(event)
             if not event.choices:
                 continue
 
@@ -889,7 +1262,7 @@ class LLMClient:
 
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
-        async for event in iterator_to_async(client.models.generate_content_stream)(
+        async for event in await client.aio.models.generate_content_stream(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -958,7 +1331,7 @@ class LLMClient:
         tool_calls: List[AnthropicToolCall] = []
         async with client.messages.stream(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -984,6 +1357,7 @@ class LLMClient:
                             input=event.content_block.input,
                         )
                     )
+            self._record_usage(await stream.get_final_message())
 
         if tool_calls:
             tool_call_messages = (
@@ -1037,31 +1411,33 @@ class LLMClient:
 
         match self.llm_provider:
             case LLMProvider.OPENAI:
-                return self._stream_openai(
+                stream = self._stream_openai(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.GOOGLE:
-                return self._stream_google(
+                stream = self._stream_google(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.ANTHROPIC:
-                return self._stream_anthropic(
+                stream = self._stream_anthropic(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.CUSTOM:
-                return self._stream_custom(
+                stream = self._stream_custom(
                     model=model, messages=messages, max_tokens=max_tokens
                 )
 
+        return self._limit_stream(stream, estimate_llm_tokens(messages, max_tokens))
+
     # ? Stream Structured Content
     async def _stream_openai_structured(
         self,
@@ -1113,7 +1489,7 @@ class LLMClient:
         has_response_schema_tool_call = False
         async for event in await client.chat.completions.create(
             model=model,
-            messages=[message.model_dump() for message in messages],
+            messages=self._get_openai_messages(messages),
             max_completion_tokens=max_tokens,
             tools=all_tools,
             response_format=(
@@ -1132,8 +1508,11 @@ class LLMClient:
             ),
             extra_body=extra_body,
             stream=True,
+            stream_options=self._get_openai_stream_options(),
         ):
             event: OpenAIChatCompletionChunk = event
+            if event.usage:
+                self._record_usage(event)
             if not event.choices:
                 continue
 
@@ -1247,7 +1626,7 @@ class LLMClient:
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
         has_response_schema_tool_call = False
-        async for event in iterator_to_async(client.models.generate_content_stream)(
+        async for event in await client.aio.models.generate_content_stream(
             model=model,
             contents=parsed_messages,
             config=GenerateContentConfig(
@@ -1334,7 +1713,7 @@ class LLMClient:
         has_response_schema_tool_call = False
         async with client.messages.stream(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -1380,6 +1759,7 @@ class LLMClient:
                             input=event.content_block.input,
                         )
                     )
+            self._record_usage(await stream.get_final_message())
 
         if tool_calls and not has_response_schema_tool_call:
             tool_call_messages = (
@@ -1440,7 +1820,7 @@ class LLMClient:
 
         match self.llm_provider:
             case LLMProvider.OPENAI:
-                return self._stream_openai_structured(
+                stream = self._stream_openai_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1449,7 +1829,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.GOOGLE:
-                return self._stream_google_structured(
+                stream = self._stream_google_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1457,7 +1837,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.ANTHROPIC:
-                return self._stream_anthropic_structured(
+                stream = self._stream_anthropic_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1465,7 +1845,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.CUSTOM:
-                return self._stream_custom_structured(
+                stream = self._stream_custom_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1473,6 +1853,10 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
 
+        return self._limit_stream(
+            stream, estimate_llm_tokens(messages, max_tokens, response_format)
+        )
+
     # ? Web search
     async def _search_openai(self, query: str) -> str:
         client: AsyncOpenAI = self._client
@@ -1492,8 +1876,7 @@ class LLMClient:
         grounding_tool = GoogleTool(google_search=GoogleSearch())
         config = GenerateContentConfig(tools=[grounding_tool])
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=get_model(),
             contents=query,
             config=config,
@@ -1628,3 +2011,268 @@ class LLMClient:
             print(f"🔍 Error in generate_slide_content: {str(e)}")
             # Return a basic error response
             return json.dumps({"error": str(e), "slides": []})
+
+
+T = TypeVar("T")
+
+
+def is_llm_hedging_enabled() -> bool:
+    return parse_bool_or_none(get_llm_hedging_env()) or False
+
+
+def get_percentile(sorted_values: List[float], percentile: float) -> float:
+    index = min(int(len(sorted_values) * percentile), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class LLMRouteStats:
+    """Rolling latencies and outcomes of the last calls of a route"""
+
+    def __init__(self, window_size: int = LLM_ROUTE_WINDOW_SIZE):
+        self.latencies = deque(maxlen=window_size)
+        self.outcomes = deque(maxlen=window_size)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= LLM_ROUTE_MAX_CONSECUTIVE_FAILURES:
+            self.cooldown_until = time.monotonic() + LLM_ROUTE_COOLDOWN_SECONDS
+
+    @property
+    def samples(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def is_cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def get_latency(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return get_percentile(sorted(self.latencies), percentile)
+
+    def get_score(self) -> float:
+        """Lower is healthier, the p95 latency inflated by the error rate"""
+        return (self.get_latency(0.95) or 0) / max(1 - self.error_rate, 0.05)
+
+    def get_metrics(self) -> dict:
+        return {
+            "samples": self.samples,
+            "p50_seconds": self.get_latency(0.5),
+            "p95_seconds": self.get_latency(0.95),
+            "error_rate": self.error_rate,
+            "cooling_down": self.is_cooling_down,
+        }
+
+
+class LLMRoute:
+    """A provider and model that calls can be sent to"""
+
+    def __init__(self, provider: LLMProvider, model: str):
+        self.provider = provider
+        self.model = model
+        self.stats = LLMRouteStats()
+        self._clients: Dict[LLMRequestPriority, LLMClient] = {}
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider.value}:{self.model}"
+
+    def get_client(self, priority: LLMRequestPriority) -> LLMClient:
+        if priority not in self._clients:
+            self._clients[priority] = LLMClient(priority, self.provider)
+        return self._clients[priority]
+
+
+def get_llm_routes() -> List[LLMRoute]:
+    """
+    Routes from LLM_ROUTES, a comma separated list of provider or provider:model.
+    Defaults to the selected provider and model.
+    """
+    routes = []
+    for entry in (get_llm_routes_env() or "").split(","):
+        if not entry.strip():
+            continue
+        provider, _, model = entry.strip().partition(":")
+        try:
+            provider = LLMProvider(provider.strip().lower())
+        except ValueError:
+            print(f"Ignoring LLM route with an unknown provider: {entry}")
+            continue
+        routes.append(LLMRoute(provider, model.strip() or get_model_for_provider(provider)))
+    return routes or [LLMRoute(get_llm_provider(), get_model())]
+
+
+class LLMRouter:
+    """
+    Sends each call to the healthiest of several providers and models.
+    - Routes are ranked by their rolling p95 latency and error rate. Routes that
+    have not been used yet keep their configured order after the measured ones.
+    - A route that keeps failing is skipped for a while.
+    - A failed call fails over to the next route.
+    - Hedged calls send a duplicate request to the next route once the first one
+    is slower than the p95 latency of its route, the first answer wins.
+    """
+
+    def __init__(self, routes: Optional[List[LLMRoute]] = None):
+        self._routes = routes
+        self.failovers = 0
+        self.hedged = 0
+        self.hedges_won = 0
+
+    @property
+    def routes(self) -> List[LLMRoute]:
+        # Read lazily so the environment is set by then
+        if self._routes is None:
+            self._routes = get_llm_routes()
+        return self._routes
+
+    def get_ranked_routes(self) -> List[LLMRoute]:
+        ranked = sorted(
+            enumerate(self.routes),
+            key=lambda each: (
+                each[1].stats.is_cooling_down,
+                each[1].stats.samples == 0,
+                each[1].stats.get_score(),
+                each[0],
+            ),
+        )
+        return [route for _, route in ranked]
+
+    def get_hedge_delay(self, route: LLMRoute) -> Optional[float]:
+        if route.stats.samples < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return route.stats.get_latency(0.95)
+
+    async def _call_route(
+        self, route: LLMRoute, call: Callable[[LLMRoute], Awaitable[T]]
+    ) -> T:
+        started_at = time.perf_counter()
+        try:
+            result = await call(route)
+        except asyncio.CancelledError:
+            # The other request of a hedged call won, this says nothing about the route
+            raise
+        except Exception:
+            route.stats.record_failure()
+            raise
+        route.stats.record_success(time.perf_counter() - started_at)
+        return result
+
+    async def call(
+        self, call: Callable[[LLMRoute], Awaitable[T]], hedge: Optional[bool] = None
+    ) -> T:
+        if hedge is None:
+            hedge = is_llm_hedging_enabled()
+        ranked_routes = self.get_ranked_routes()
+        pending: Dict[asyncio.Task, LLMRoute] = {}
+        hedge_task: Optional[asyncio.Task] = None
+        last_error: Optional[Exception] = None
+
+        def start(route: LLMRoute) -> asyncio.Task:
+            task = asyncio.create_task(self._call_route(route, call))
+            pending[task] = route
+            return task
+
+        start(ranked_routes[0])
+        next_index = 1
+        try:
+            while pending:
+                hedge_delay = None
+                if hedge and not hedge_task and len(pending) == 1:
+                    hedge_delay = self.get_hedge_delay(next(iter(pending.values())))
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # With a single route the duplicate goes to the same route
+                    self.hedged += 1
+                    if next_index < len(ranked_routes):
+                        hedge_task = start(ranked_routes[next_index])
+                        next_index += 1
+                    else:
+                        hedge_task = start(ranked_routes[0])
+                    continue
+
+                for task in done:
+                    route = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"LLM route {route.name} failed: {e}")
+                        last_error = e
+                        continue
+                    if task is hedge_task:
+                        self.hedges_won += 1
+                    return result
+
+                if not pending and next_index < len(ranked_routes):
+                    self.failovers += 1
+                    start(ranked_routes[next_index])
+                    next_index += 1
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate(
+        self,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        priority: LLMRequestPriority = LLMRequestPriority.BULK,
+        hedge: Optional[bool] = None,
+    ):
+        return await self.call(
+            lambda route: route.get_client(priority).generate(
+                model=route.model, messages=messages, max_tokens=max_tokens, tools=tools
+            ),
+            hedge,
+        )
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
+        priority: LLMRequestPriority = LLMRequestPriority.BULK,
+        hedge: Optional[bool] = None,
+    ) -> dict:
+        return await self.call(
+            lambda route: route.get_client(priority).generate_structured(
+                model=route.model,
+                messages=messages,
+                response_format=response_format,
+                strict=strict,
+                tools=tools,
+                max_tokens=max_tokens,
+            ),
+            hedge,
+        )
+
+    def get_metrics(self) -> dict:
+        return {
+            "routes": {route.name: route.stats.get_metrics() for route in self.routes},
+            "failovers": self.failovers,
+            "hedged": self.hedged,
+            "hedges_won": self.hedges_won,
+        }
+
+
+LLM_ROUTER = LLMRouter()
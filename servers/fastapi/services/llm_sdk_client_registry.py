@@ -0,0 +1,133 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient as AnthropicHttpxClient
+from google import genai
+from google.genai.types import HttpOptions
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient as OpenAIHttpxClient
+
+from constants.llm import (
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_SDK_MAX_CLIENTS_PER_PROVIDER,
+    LLM_SDK_STALE_CLIENT_GRACE_SECONDS,
+)
+from enums.llm_provider import LLMProvider
+
+
+ClientKey = Tuple[LLMProvider, Optional[str], Optional[str]]
+
+
+def get_http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+class LLMSDKClientRegistry:
+    """
+    Process-wide provider SDK clients keyed by provider, base URL and API key.
+    - Clients are long-lived so their connection pools stay warm across requests.
+    - A provider can be used with several keys at once, each key keeps its client.
+    - Past the max clients of a provider, like after key rotations, the least
+    recently used client is dropped. It may still be serving requests, so it
+    is closed after a grace period, or on shutdown.
+    """
+
+    def __init__(self):
+        self._clients: "OrderedDict[ClientKey, Any]" = OrderedDict()
+        self._stale_clients: List[Any] = []
+        self._close_tasks: Set[asyncio.Task] = set()
+
+    def _get_or_create(self, key: ClientKey, create: Callable[[], Any]):
+        if key in self._clients:
+            self._clients.move_to_end(key)
+            return self._clients[key]
+
+        self._clients[key] = create()
+        provider_keys = [each for each in self._clients if each[0] == key[0]]
+        if len(provider_keys) > LLM_SDK_MAX_CLIENTS_PER_PROVIDER:
+            print(f"Dropping the least recently used {key[0].value} client")
+            self._drop_client(self._clients.pop(provider_keys[0]))
+        return self._clients[key]
+
+    def _drop_client(self, client: Any):
+        self._stale_clients.append(client)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Without a running loop it is closed on shutdown
+            return
+        close_task = asyncio.create_task(self._close_stale_client(client))
+        self._close_tasks.add(close_task)
+        close_task.add_done_callback(self._close_tasks.discard)
+
+    async def _close_stale_client(self, client: Any):
+        await asyncio.sleep(LLM_SDK_STALE_CLIENT_GRACE_SECONDS)
+        if client in self._stale_clients:
+            self._stale_clients.remove(client)
+            await self._close_client(client)
+
+    def get_client_count(self) -> int:
+        return len(self._clients) + len(self._stale_clients)
+
+    def get_openai_client(
+        self, api_key: Optional[str], base_url: Optional[str] = None
+    ) -> AsyncOpenAI:
+        provider = LLMProvider.CUSTOM if base_url else LLMProvider.OPENAI
+        return self._get_or_create(
+            (provider, base_url, api_key),
+            lambda: AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=OpenAIHttpxClient(limits=get_http_limits()),
+            ),
+        )
+
+    def get_anthropic_client(self, api_key: Optional[str]) -> AsyncAnthropic:
+        return self._get_or_create(
+            (LLMProvider.ANTHROPIC, None, api_key),
+            lambda: AsyncAnthropic(
+                api_key=api_key,
+                http_client=AnthropicHttpxClient(limits=get_http_limits()),
+            ),
+        )
+
+    def get_google_client(self, api_key: Optional[str]) -> genai.Client:
+        return self._get_or_create(
+            (LLMProvider.GOOGLE, None, api_key),
+            lambda: genai.Client(
+                api_key=api_key,
+                http_options=HttpOptions(
+                    client_args={"limits": get_http_limits()},
+                    async_client_args={"limits": get_http_limits()},
+                ),
+            ),
+        )
+
+    async def _close_client(self, client: Any):
+        try:
+            if isinstance(client, genai.Client):
+                client.close()
+                await client.aio.aclose()
+            else:
+                await client.close()
+        except Exception as e:
+            print(f"Error closing LLM client: {e}")
+
+    async def close(self):
+        clients = list(self._clients.values()) + self._stale_clients
+        self._clients = OrderedDict()
+        self._stale_clients = []
+        for close_task in list(self._close_tasks):
+            close_task.cancel()
+        for client in clients:
+            await self._close_client(client)
+
+
+LLM_SDK_CLIENT_REGISTRY = LLMSDKClientRegistry()
@@ -1,5 +1,8 @@
+import asyncio
+import io
+import json
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -34,7 +37,11 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
+from services.executor_service import EXECUTOR_SERVICE
+from services.image_transform_cache_service import IMAGE_TRANSFORM_CACHE_SERVICE
 from utils.download_helpers import download_files
+from utils.file_utils import write_file
+from utils.get_env import get_disable_pptx_worker_rendering_env
 from utils.image_utils import (
     clip_image,
     create_circle_image,
@@ -43,11 +50,116 @@ from utils.image_utils import (
     round_image_corners,
     set_image_opacity,
 )
+from utils.parsers import parse_bool_or_none
 import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 
 
+def is_pptx_worker_rendering_enabled() -> bool:
+    return not (parse_bool_or_none(get_disable_pptx_worker_rendering_env()) or False)
+
+
+def needs_picture_transform(picture_model: PptxPictureBoxModel) -> bool:
+    return bool(
+        picture_model.clip
+        or picture_model.border_radius
+        or picture_model.invert
+        or picture_model.opacity
+        or picture_model.object_fit
+        or picture_model.shape
+    )
+
+
+def get_picture_transform(picture_model: PptxPictureBoxModel) -> dict:
+    """Everything the transformed image depends on besides the source image"""
+    transform = picture_model.model_dump(
+        mode="json",
+        include={"clip", "border_radius", "invert", "opacity", "object_fit", "shape"},
+    )
+    transform["size"] = [picture_model.position.width, picture_model.position.height]
+    return transform
+
+
+def get_transformed_picture_path(
+    picture_model: PptxPictureBoxModel, temp_dir: str
+) -> Optional[str]:
+    """
+    Applies the PIL transforms of the picture and returns the path of the result.
+    Runs in the CPU pool, so it only depends on its arguments.
+    Returns None if the image can not be opened.
+    """
+    image_path = picture_model.picture.path
+    if not needs_picture_transform(picture_model):
+        return image_path
+
+    try:
+        image = Image.open(image_path)
+    except:
+        print(f"Could not open image: {image_path}")
+        return None
+
+    image = image.convert("RGBA")
+    # ? Applying border radius twice to support both clip and object fit
+    if picture_model.border_radius:
+        image = round_image_corners(image, picture_model.border_radius)
+    if picture_model.object_fit:
+        image = fit_image(
+            image,
+            picture_model.position.width,
+            picture_model.position.height,
+            picture_model.object_fit,
+        )
+    elif picture_model.clip:
+        image = clip_image(
+            image,
+            picture_model.position.width,
+            picture_model.position.height,
+        )
+    if picture_model.border_radius:
+        image = round_image_corners(image, picture_model.border_radius)
+    if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
+        image = create_circle_image(image)
+    if picture_model.invert:
+        image = invert_image(image)
+    if picture_model.opacity:
+        image = set_image_opacity(image, picture_model.opacity)
+    image_path = os.path.join(temp_dir, f"{uuid.uuid4()}.png")
+    image.save(image_path)
+    return image_path
+
+
+def transform_picture(
+    picture_model: PptxPictureBoxModel, temp_dir: str, cache_directory: Optional[str]
+) -> Tuple[Optional[str], bool]:
+    """
+    Runs in the workers of the CPU pool.
+    Returns the path of the transformed image, and whether it was cached.
+    """
+    if not cache_directory:
+        return get_transformed_picture_path(picture_model, temp_dir), False
+
+    try:
+        key = IMAGE_TRANSFORM_CACHE_SERVICE.get_key(
+            picture_model.picture.path, get_picture_transform(picture_model)
+        )
+    except OSError:
+        return get_transformed_picture_path(picture_model, temp_dir), False
+
+    cached_path = os.path.join(cache_directory, f"{key}.png")
+    if os.path.exists(cached_path):
+        # Keeps the entry from being pruned while it is in use
+        os.utime(cached_path)
+        return cached_path, True
+
+    # Written next to the entry first, so readers never see a partial image
+    image_path = get_transformed_picture_path(picture_model, cache_directory)
+    if not image_path:
+        return None, False
+    os.replace(image_path, cached_path)
+    return cached_path, False
+
+
 class PptxPresentationCreator:
 
     def __init__(self, ppt_model: PptxPresentationModel, temp_dir: str):
@@ -60,6 +172,9 @@ class PptxPresentationCreator:
         self._ppt.slide_width = Pt(1280)
         self._ppt.slide_height = Pt(720)
 
+        # Transformed image of each picture model, by the id of the model
+        self._picture_paths: Dict[int, Optional[str]] = {}
+
     def get_sub_element(self, parent, tagname, **kwargs):
         """Helper method to create XML elements"""
         element = OxmlElement(tagname)
@@ -68,6 +183,7 @@ class PptxPresentationCreator:
         return element
 
     async def fetch_network_assets(self):
+        """Downloads the network pictures with the bulk downloader, capped per host and retried"""
         image_urls = []
         models_with_network_asset: List[PptxPictureBoxModel] = []
 
@@ -102,7 +218,9 @@ class PptxPresentationCreator:
                         models_with_network_asset.append(each_shape)
 
         if image_urls:
-            image_paths = await download_files(image_urls, self._temp_dir)
+            image_paths = await download_files(
+                image_urls, self._temp_dir, on_progress=self.on_download_progress
+            )
 
             for each_shape, each_image_path in zip(
                 models_with_network_asset, image_paths
@@ -111,9 +229,68 @@ class PptxPresentationCreator:
                     each_shape.picture.path = each_image_path
                     each_shape.picture.is_network = False
 
-    async def create_ppt(self):
-        await self.fetch_network_assets()
+    def on_download_progress(self, completed: int, total: int):
+        print(f"Downloaded {completed}/{total} network images")
+
+    def get_picture_models(self) -> List[PptxPictureBoxModel]:
+        return [
+            each_shape
+            for each_slide in self._slide_models
+            for each_shape in each_slide.shapes
+            if isinstance(each_shape, PptxPictureBoxModel)
+        ]
+
+    async def transform_pictures(self):
+        """
+        Applies the image transforms of every picture in parallel in the CPU pool.
+        Pictures sharing the source image and the transform are processed once,
+        and transforms done by earlier exports are read from the cache.
+        """
+        picture_groups: Dict[str, List[PptxPictureBoxModel]] = {}
+        for each in self.get_picture_models():
+            if needs_picture_transform(each):
+                group_key = json.dumps(
+                    [each.picture.path, get_picture_transform(each)], sort_keys=True
+                )
+                picture_groups.setdefault(group_key, []).append(each)
+        if not picture_groups:
+            return
 
+        cache_directory = (
+            IMAGE_TRANSFORM_CACHE_SERVICE.directory
+            if IMAGE_TRANSFORM_CACHE_SERVICE.enabled
+            else None
+        )
+        results = await asyncio.gather(
+            *[
+                EXECUTOR_SERVICE.cpu.run(
+                    transform_picture, group[0], self._temp_dir, cache_directory
+                )
+                for group in picture_groups.values()
+            ]
+        )
+        for group, (image_path, cached) in zip(picture_groups.values(), results):
+            if cache_directory:
+                IMAGE_TRANSFORM_CACHE_SERVICE.record(cached, len(group))
+            for each in group:
+                self._picture_paths[id(each)] = image_path
+
+    def get_transformed_picture_paths(self) -> Dict[int, Optional[str]]:
+        """Transformed images by the index of the picture in get_picture_models"""
+        return {
+            index: self._picture_paths[id(each)]
+            for index, each in enumerate(self.get_picture_models())
+            if id(each) in self._picture_paths
+        }
+
+    def set_transformed_picture_paths(self, picture_paths: Dict[int, Optional[str]]):
+        picture_models = self.get_picture_models()
+        self._picture_paths = {
+            id(picture_models[index]): image_path
+            for index, image_path in picture_paths.items()
+        }
+
+    def build_ppt(self):
         for slide_model in self._slide_models:
             # Adding global shapes to slide
             if self._ppt_model.shapes:
@@ -121,6 +298,35 @@ class PptxPresentationCreator:
 
             self.add_and_populate_slide(slide_model)
 
+    async def create_ppt(self):
+        await self.fetch_network_assets()
+        await self.transform_pictures()
+        self.build_ppt()
+
+    async def create_ppt_in_worker(self) -> bytes:
+        """
+        Downloads and transforms the pictures, then builds the deck in a worker
+        of the CPU pool, so python-pptx never runs on the event loop.
+        Returns the bytes of the pptx file.
+        """
+        await self.fetch_network_assets()
+        await self.transform_pictures()
+        return await EXECUTOR_SERVICE.cpu.run(
+            render_pptx,
+            self._ppt_model.model_dump_json(),
+            self._temp_dir,
+            self.get_transformed_picture_paths(),
+        )
+
+    async def create_and_save(self, path: str):
+        """Creates the deck, in a worker process unless disabled, and saves it"""
+        if is_pptx_worker_rendering_enabled():
+            pptx_bytes = await self.create_ppt_in_worker()
+            await EXECUTOR_SERVICE.io.run(write_file, path, pptx_bytes)
+        else:
+            await self.create_ppt()
+            await EXECUTOR_SERVICE.io.run(self.save, path)
+
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
         slide_master_part = slide_master.part
@@ -176,48 +382,12 @@ class PptxPresentationCreator:
         self.set_fill_opacity(connector_shape, connector_model.opacity)
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
-        image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.invert
-            or picture_model.opacity
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
-                return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+        if id(picture_model) in self._picture_paths:
+            image_path = self._picture_paths[id(picture_model)]
+        else:
+            image_path = get_transformed_picture_path(picture_model, self._temp_dir)
+        if not image_path:
+            return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
@@ -480,3 +650,22 @@ class PptxPresentationCreator:
 
     def save(self, path: str):
         self._ppt.save(path)
+
+    def get_bytes(self) -> bytes:
+        pptx_file = io.BytesIO()
+        self._ppt.save(pptx_file)
+        return pptx_file.getvalue()
+
+
+def render_pptx(
+    ppt_model_json: str, temp_dir: str, picture_paths: Dict[int, Optional[str]]
+) -> bytes:
+    """
+    Runs in the workers of the CPU pool. The pictures of the serialized model
+    are already downloaded, and transformed ones are given by their index.
+    """
+    ppt_model = PptxPresentationModel.model_validate_json(ppt_model_json)
+    pptx_creator = PptxPresentationCreator(ppt_model, temp_dir)
+    pptx_creator.set_transformed_picture_paths(picture_paths)
+    pptx_creator.build_ppt()
+    return pptx_creator.get_bytes()
@@ -1,7 +1,7 @@
-import asyncio
 from typing import List
 
 from models.document_chunk import DocumentChunk
+from services.executor_service import EXECUTOR_SERVICE
 
 
 class ScoreBasedChunker:
@@ -152,12 +152,13 @@ class ScoreBasedChunker:
             
         return chunks
 
+    def get_chunks(self, text: str, n: int) -> List[DocumentChunk]:
+        headings = self.extract_headings(text)
+        heading_scores = self.score_headings(headings)
+        return self.get_chunks_from_headings(text, headings, heading_scores, n)
+
     async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
-        headings = await asyncio.to_thread(self.extract_headings, text)
-        heading_scores = await asyncio.to_thread(self.score_headings, headings)
-        chunks = await asyncio.to_thread(
-            self.get_chunks_from_headings, text, headings, heading_scores, n
-        )
+        chunks = await EXECUTOR_SERVICE.cpu.run(self.get_chunks, text, n)
         if len(chunks) < n:
             raise ValueError(f"Only {len(chunks)} chunks found, requested {n}")
         return chunks
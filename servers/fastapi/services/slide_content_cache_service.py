@@ -0,0 +1,142 @@
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from constants.llm import (
+    DEFAULT_SLIDE_CONTENT_CACHE_SIZE,
+    DEFAULT_SLIDE_CONTENT_CACHE_TTL_SECONDS,
+    SLIDE_CONTENT_PROMPT_VERSION,
+)
+from crud.llm_cache_crud import llm_cache_crud
+from utils.get_env import (
+    get_disable_slide_content_cache_env,
+    get_slide_content_cache_size_env,
+    get_slide_content_cache_ttl_seconds_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+
+def normalize_prompt_text(text: Optional[str]) -> str:
+    """
+    Strips the whitespace around every line, line breaks are kept as they carry
+    the markdown structure (lists, headings, paragraphs).
+    """
+    if not text:
+        return ""
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+class SlideContentCacheService:
+    """
+    Content-addressed cache of generated slide content.
+    - Memory tier: LRU of the most recently used entries of this process, each
+    expiring after the same TTL as the MongoDB tier.
+    - MongoDB tier: shared by every process and expired with a TTL index.
+    Cached values are copied in and out, so callers can mutate what they get.
+    """
+
+    def __init__(self):
+        # Key to (monotonic expiry time, value)
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self.memory_hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return not (parse_bool_or_none(get_disable_slide_content_cache_env()) or False)
+
+    @property
+    def max_size(self) -> int:
+        return (
+            parse_int_or_none(get_slide_content_cache_size_env())
+            or DEFAULT_SLIDE_CONTENT_CACHE_SIZE
+        )
+
+    @property
+    def ttl_seconds(self) -> int:
+        return (
+            parse_int_or_none(get_slide_content_cache_ttl_seconds_env())
+            or DEFAULT_SLIDE_CONTENT_CACHE_TTL_SECONDS
+        )
+
+    def get_key(
+        self,
+        model: str,
+        schema: dict,
+        outline: str,
+        language: str,
+        tone: Optional[str] = None,
+        verbosity: Optional[str] = None,
+        instructions: Optional[str] = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "prompt_version": SLIDE_CONTENT_PROMPT_VERSION,
+                "model": model,
+                "schema": schema,
+                "outline": normalize_prompt_text(outline),
+                "language": normalize_prompt_text(language).lower(),
+                "tone": normalize_prompt_text(tone).lower(),
+                "verbosity": normalize_prompt_text(verbosity).lower(),
+                "instructions": normalize_prompt_text(instructions),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _set_in_memory(self, key: str, value: dict):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[dict]:
+        if key in self._entries:
+            expires_at, value = self._entries[key]
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(value)
+            del self._entries[key]
+
+        try:
+            value = await llm_cache_crud.get_entry(key)
+        except Exception as e:
+            print(f"Error reading slide content cache: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.mongo_hits += 1
+        self._set_in_memory(key, value)
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: dict):
+        value = copy.deepcopy(value)
+        self._set_in_memory(key, value)
+        try:
+            await llm_cache_crud.set_entry(key, value, self.ttl_seconds)
+        except Exception as e:
+            print(f"Error writing slide content cache: {e}")
+
+    def get_metrics(self) -> dict:
+        hits = self.memory_hits + self.mongo_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "memory_hits": self.memory_hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0,
+        }
+
+
+SLIDE_CONTENT_CACHE_SERVICE = SlideContentCacheService()
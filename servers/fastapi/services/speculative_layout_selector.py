@@ -0,0 +1,191 @@
+import asyncio
+import random
+from typing import Dict, List, Optional, Tuple
+
+from constants.presentation import DEFAULT_SPECULATIVE_LAYOUT_CHUNK_SIZE
+from models.presentation_layout import PresentationLayoutModel
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from models.presentation_structure_model import PresentationStructureModel
+from utils.get_env import (
+    get_speculative_layout_chunk_size_env,
+    get_speculative_layout_selection_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+
+def is_speculative_layout_selection_enabled() -> bool:
+    return parse_bool_or_none(get_speculative_layout_selection_env()) or False
+
+
+def get_speculative_layout_chunk_size() -> int:
+    return max(
+        parse_int_or_none(get_speculative_layout_chunk_size_env())
+        or DEFAULT_SPECULATIVE_LAYOUT_CHUNK_SIZE,
+        1,
+    )
+
+
+class SpeculativeLayoutMetrics:
+    """How many speculative layout picks survived reconciliation"""
+
+    def __init__(self):
+        self.presentations = 0
+        self.slides = 0
+        self.kept = 0
+        self.redo_calls = 0
+
+    def record(self, slides: int, kept: int, redone: bool):
+        self.presentations += 1
+        self.slides += slides
+        self.kept += kept
+        self.redo_calls += 1 if redone else 0
+
+    def get_metrics(self) -> dict:
+        return {
+            "enabled": is_speculative_layout_selection_enabled(),
+            "presentations": self.presentations,
+            "slides": self.slides,
+            "kept": self.kept,
+            "kept_rate": self.kept / self.slides if self.slides else 0,
+            "redo_calls": self.redo_calls,
+        }
+
+
+SPECULATIVE_LAYOUT_METRICS = SpeculativeLayoutMetrics()
+
+
+class SpeculativeLayoutSelector:
+    """
+    Picks slide layouts while the outlines are still streaming.
+    - Every `chunk_size` parsed outlines start a structure call in the background
+    for just that chunk, so only the last, small chunk is left once the
+    outlines are complete.
+    - `reconcile` keeps a pick only if its outline is unchanged in the final
+    outlines. The rest are redone with a single call over the whole deck.
+    """
+
+    def __init__(
+        self,
+        presentation_layout: PresentationLayoutModel,
+        instructions: Optional[str] = None,
+        using_slides_markdown: bool = False,
+        chunk_size: Optional[int] = None,
+    ):
+        self.presentation_layout = presentation_layout
+        self.instructions = instructions
+        self.using_slides_markdown = using_slides_markdown
+        self.chunk_size = chunk_size or get_speculative_layout_chunk_size()
+
+        self._outlines: List[SlideOutlineModel] = []
+        self._chunk_start = 0
+        self._tasks: List[asyncio.Task] = []
+        # Slide index -> (outline content the pick was made for, layout index)
+        self._picks: Dict[int, Tuple[str, int]] = {}
+
+    async def _generate_structure(
+        self,
+        presentation_outline: PresentationOutlineModel,
+        instructions: Optional[str] = None,
+        slide_offset: int = 0,
+    ) -> PresentationStructureModel:
+        from utils.llm_calls.generate_presentation_structure import (
+            generate_presentation_structure,
+        )
+
+        return await generate_presentation_structure(
+            presentation_outline,
+            self.presentation_layout,
+            instructions,
+            self.using_slides_markdown,
+            slide_offset,
+        )
+
+    def _is_valid_layout_index(self, layout_index) -> bool:
+        return (
+            isinstance(layout_index, int)
+            and 0 <= layout_index < len(self.presentation_layout.slides)
+        )
+
+    def _get_chunk_instructions(self, start: int) -> Optional[str]:
+        if start == 0:
+            return self.instructions
+        chunk_instructions = (
+            f"These slides continue the presentation from slide {start + 1}, "
+            "so none of them is the title slide."
+        )
+        if self.instructions:
+            return f"{self.instructions}\n{chunk_instructions}"
+        return chunk_instructions
+
+    async def _pick_chunk(self, start: int, outlines: List[SlideOutlineModel]):
+        try:
+            structure = await self._generate_structure(
+                PresentationOutlineModel(slides=outlines),
+                self._get_chunk_instructions(start),
+                start,
+            )
+        except Exception as e:
+            print(f"Speculative layout selection failed for slides {start}+: {e}")
+            return
+
+        for offset, outline in enumerate(outlines):
+            if offset < len(structure.slides) and self._is_valid_layout_index(
+                structure.slides[offset]
+            ):
+                self._picks[start + offset] = (outline.content, structure.slides[offset])
+
+    def _start_chunk(self):
+        start = self._chunk_start
+        self._chunk_start = len(self._outlines)
+        self._tasks.append(
+            asyncio.create_task(self._pick_chunk(start, self._outlines[start:]))
+        )
+
+    def add_outline(self, outline: SlideOutlineModel):
+        self._outlines.append(outline)
+        if len(self._outlines) - self._chunk_start >= self.chunk_size:
+            self._start_chunk()
+
+    def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+
+    async def reconcile(
+        self, presentation_outline: PresentationOutlineModel
+    ) -> PresentationStructureModel:
+        """Returns a layout index for every slide of the final outlines"""
+        if self._chunk_start < len(self._outlines):
+            self._start_chunk()
+        await asyncio.gather(*self._tasks)
+
+        slides: List[Optional[int]] = []
+        for index, outline in enumerate(presentation_outline.slides):
+            pick = self._picks.get(index)
+            slides.append(pick[1] if pick and pick[0] == outline.content else None)
+
+        redo_indices = [index for index, each in enumerate(slides) if each is None]
+        if redo_indices:
+            print(
+                f"Redoing layout selection for {len(redo_indices)} of "
+                f"{len(slides)} slides"
+            )
+            structure = await self._generate_structure(
+                presentation_outline, self.instructions
+            )
+            for index in redo_indices:
+                layout_index = (
+                    structure.slides[index] if index < len(structure.slides) else None
+                )
+                if not self._is_valid_layout_index(layout_index):
+                    layout_index = random.randint(
+                        0, len(self.presentation_layout.slides) - 1
+                    )
+                slides[index] = layout_index
+
+        SPECULATIVE_LAYOUT_METRICS.record(
+            len(slides), len(slides) - len(redo_indices), bool(redo_indices)
+        )
+        return PresentationStructureModel(slides=slides)
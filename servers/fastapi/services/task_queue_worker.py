@@ -0,0 +1,240 @@
+import asyncio
+import os
+import random
+import socket
+import traceback
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from constants.task_queue import (
+    DEFAULT_TASK_QUEUE_HEARTBEAT_SECONDS,
+    DEFAULT_TASK_QUEUE_LEASE_SECONDS,
+    DEFAULT_TASK_QUEUE_MAX_ATTEMPTS,
+    DEFAULT_TASK_QUEUE_PER_USER_CONCURRENCY,
+    DEFAULT_TASK_QUEUE_POLL_SECONDS,
+    DEFAULT_TASK_QUEUE_RETRY_BASE_SECONDS,
+    DEFAULT_TASK_QUEUE_RETRY_MAX_SECONDS,
+    DEFAULT_TASK_QUEUE_WORKER_CONCURRENCY,
+)
+from crud.task_crud import task_crud
+from models.mongo.task import TaskInDB, TaskType
+from utils.get_env import (
+    get_task_queue_in_process_worker_env,
+    get_task_queue_lease_seconds_env,
+    get_task_queue_max_attempts_env,
+    get_task_queue_per_user_concurrency_env,
+    get_task_queue_worker_concurrency_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+
+TaskHandler = Callable[[TaskInDB], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def is_in_process_worker_enabled() -> bool:
+    """The API process runs a worker too, unless workers are deployed separately"""
+    in_process_worker = parse_bool_or_none(get_task_queue_in_process_worker_env())
+    return True if in_process_worker is None else in_process_worker
+
+
+def get_task_queue_max_attempts() -> int:
+    return max(
+        parse_int_or_none(get_task_queue_max_attempts_env())
+        or DEFAULT_TASK_QUEUE_MAX_ATTEMPTS,
+        1,
+    )
+
+
+def get_retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff with full jitter"""
+    delay = min(
+        DEFAULT_TASK_QUEUE_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+        DEFAULT_TASK_QUEUE_RETRY_MAX_SECONDS,
+    )
+    return random.uniform(delay / 2, delay)
+
+
+class TaskQueueWorker:
+    """
+    Runs tasks of one type from the MongoDB job queue.
+    - Up to `concurrency` tasks run at once, each under a lease that is
+    extended by a heartbeat. A task whose lease is lost is cancelled, since
+    another worker has taken it over.
+    - Failed tasks are retried with backoff until max_attempts is reached.
+    - Tasks whose lease expired, because their worker crashed or hung, count as
+    failed attempts too, so a task that keeps killing workers ends up failed.
+    - On stop, tasks that are still running are handed back to the queue.
+    """
+
+    def __init__(
+        self,
+        task_type: TaskType,
+        handler: TaskHandler,
+        on_failed: Optional[Callable[[TaskInDB, Exception], Awaitable[None]]] = None,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        per_user_limit: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        heartbeat_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        self.task_type = task_type
+        self.handler = handler
+        self.on_failed = on_failed
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.concurrency = concurrency or (
+            parse_int_or_none(get_task_queue_worker_concurrency_env())
+            or DEFAULT_TASK_QUEUE_WORKER_CONCURRENCY
+        )
+        self.per_user_limit = per_user_limit or (
+            parse_int_or_none(get_task_queue_per_user_concurrency_env())
+            or DEFAULT_TASK_QUEUE_PER_USER_CONCURRENCY
+        )
+        self.lease_seconds = lease_seconds or (
+            parse_int_or_none(get_task_queue_lease_seconds_env())
+            or DEFAULT_TASK_QUEUE_LEASE_SECONDS
+        )
+        self.heartbeat_seconds = heartbeat_seconds or min(
+            DEFAULT_TASK_QUEUE_HEARTBEAT_SECONDS, self.lease_seconds / 3
+        )
+        self.poll_seconds = poll_seconds or DEFAULT_TASK_QUEUE_POLL_SECONDS
+
+        self._running: Dict[str, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._slot_released = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def _heartbeat(self, task: TaskInDB, job: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                still_held = await task_crud.heartbeat_task(
+                    task.id, self.worker_id, self.lease_seconds
+                )
+            except Exception as e:
+                # The lease is still valid for a while, try again on the next beat
+                print(f"Heartbeat of task {task.id} failed: {e}")
+                continue
+            if not still_held:
+                print(f"Lost the lease of task {task.id}, cancelling it")
+                job.cancel()
+                return
+
+    async def _run_task(self, task: TaskInDB):
+        job = asyncio.current_task()
+        heartbeat = asyncio.create_task(self._heartbeat(task, job))
+        try:
+            result = await self.handler(task)
+            await task_crud.complete_task(task.id, self.worker_id, result)
+            self.completed += 1
+        except asyncio.CancelledError:
+            if self._stopping.is_set():
+                await task_crud.release_task(task.id, self.worker_id)
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            if task.attempts < task.max_attempts:
+                delay = get_retry_delay_seconds(task.attempts)
+                print(
+                    f"Task {task.id} failed on attempt {task.attempts}/"
+                    f"{task.max_attempts}, retrying in {delay:.1f}s"
+                )
+                await task_crud.fail_task(task.id, self.worker_id, str(e), delay)
+                self.retried += 1
+            else:
+                await task_crud.fail_task(task.id, self.worker_id, str(e))
+                self.failed += 1
+                if self.on_failed:
+                    await self.on_failed(task, e)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(task.id, None)
+            self._slot_released.set()
+
+    async def _expire_leases(self):
+        """Retries or fails the tasks of workers that stopped heartbeating"""
+        for task in await task_crud.get_tasks_with_expired_lease(self.task_type):
+            error = f"Lease of worker {task.worker_id} expired"
+            if task.attempts < task.max_attempts:
+                delay = get_retry_delay_seconds(task.attempts)
+                if await task_crud.expire_lease(task.id, error, delay):
+                    print(
+                        f"Task {task.id} lost its worker on attempt {task.attempts}/"
+                        f"{task.max_attempts}, retrying in {delay:.1f}s"
+                    )
+                    self.retried += 1
+            elif await task_crud.expire_lease(task.id, error):
+                print(f"Task {task.id} lost its worker on its last attempt, failing it")
+                self.failed += 1
+                if self.on_failed:
+                    await self.on_failed(task, Exception(error))
+
+    async def _wait(self, event: asyncio.Event, timeout: float):
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self):
+        print(
+            f"Task queue worker {self.worker_id} started for {self.task_type.value} "
+            f"(concurrency={self.concurrency}, per_user_limit={self.per_user_limit})"
+        )
+        while not self._stopping.is_set():
+            if len(self._running) >= self.concurrency:
+                self._slot_released.clear()
+                await self._wait(self._slot_released, self.poll_seconds)
+                continue
+
+            try:
+                await self._expire_leases()
+                task = await task_crud.claim_task(
+                    self.task_type,
+                    self.worker_id,
+                    self.lease_seconds,
+                    self.per_user_limit,
+                )
+            except Exception as e:
+                print(f"Failed to claim a task: {e}")
+                task = None
+
+            if task is None:
+                # Jitter keeps idle workers from polling in lockstep
+                await self._wait(
+                    self._stopping, self.poll_seconds * random.uniform(0.5, 1.5)
+                )
+                continue
+
+            print(f"Worker {self.worker_id} claimed task {task.id}")
+            self._running[task.id] = asyncio.create_task(self._run_task(task))
+
+    def start(self):
+        self._loop_task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 10):
+        """Stops claiming, waits for running tasks and hands back the rest"""
+        self._stopping.set()
+        if self._loop_task:
+            await self._loop_task
+        running = list(self._running.values())
+        if running:
+            _, pending = await asyncio.wait(running, timeout=timeout)
+            for job in pending:
+                job.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_metrics(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "concurrency": self.concurrency,
+            "per_user_limit": self.per_user_limit,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
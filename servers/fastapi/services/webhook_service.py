@@ -1,7 +1,7 @@
 import asyncio
-import aiohttp
 from enums.webhook_event import WebhookEvent
 from crud.webhook_crud import webhook_crud
+from services.http_client_service import HTTP_CLIENT_SERVICE
 
 
 class WebhookService:
@@ -32,13 +32,13 @@ class WebhookService:
             headers["Authorization"] = f"Bearer {subscription.secret}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    subscription.url,
-                    json=data,
-                    headers=headers,
-                ) as _:
-                    pass
+            session = HTTP_CLIENT_SERVICE.get_session(trust_env=True)
+            async with session.post(
+                subscription.url,
+                json=data,
+                headers=headers,
+            ) as _:
+                pass
 
         except Exception as e:
             print(f"Error sending request to webhook {subscription.id}: {e}")
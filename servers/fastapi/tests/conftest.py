@@ -0,0 +1,26 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the timing comparisons marked as benchmarks",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timing comparison, only run with --run-benchmarks"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Timings depend on the machine, so benchmarks are opt-in"""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="needs --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
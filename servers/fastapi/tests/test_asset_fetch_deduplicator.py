@@ -0,0 +1,114 @@
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+from models.image_prompt import ImagePrompt
+from models.mongo.slide import SlideInDB
+from services.asset_fetch_deduplicator import AssetFetchDeduplicator
+from utils.process_slides import process_slide_and_fetch_assets
+
+
+class SlowImageGenerationService:
+    """Counts the provider requests, which stay in flight for a while"""
+
+    def __init__(self, fail_first: bool = False):
+        self.prompts = []
+        self.fail_first = fail_first
+
+    async def generate_image(self, prompt):
+        self.prompts.append(prompt.prompt)
+        await asyncio.sleep(0.05)
+        if self.fail_first and len(self.prompts) == 1:
+            raise Exception("Provider unavailable")
+        return f"https://images.example.com/{prompt.prompt.replace(' ', '-')}.jpg"
+
+
+class SlowIconFinderService:
+    def __init__(self):
+        self.queries = []
+
+    async def search_icons(self, query: str, limit: int = 20):
+        self.queries.append(query)
+        await asyncio.sleep(0.05)
+        return [f"/static/icons/{query}.svg"]
+
+
+def get_slide(slide_number: int, image_prompt: str, icon_query: str) -> SlideInDB:
+    return SlideInDB(
+        presentation_id="presentation",
+        slide_number=slide_number,
+        layout="layout",
+        layout_group="group",
+        content=json.dumps(
+            {
+                "image": {"__image_prompt__": image_prompt},
+                "icon": {"__icon_query__": icon_query},
+            }
+        ),
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+
+def test_identical_requests_of_a_deck_share_one_provider_request():
+    image_generation_service = SlowImageGenerationService()
+    icon_finder_service = SlowIconFinderService()
+    slides = [
+        get_slide(0, "Mountain lake", "chart"),
+        get_slide(1, "Mountain lake", "chart"),
+        get_slide(2, "Mountain lake", "chart"),
+        get_slide(3, "Desert", "chart"),
+        get_slide(4, "Mountain lake", "globe"),
+    ]
+
+    async def run():
+        asset_deduplicator = AssetFetchDeduplicator(image_generation_service)
+        await asyncio.gather(
+            *[
+                process_slide_and_fetch_assets(
+                    image_generation_service, slide, asset_deduplicator
+                )
+                for slide in slides
+            ]
+        )
+        return asset_deduplicator.get_metrics()
+
+    with patch(
+        "services.asset_fetch_deduplicator.ICON_FINDER_SERVICE", icon_finder_service
+    ):
+        metrics = asyncio.run(run())
+
+    assert sorted(image_generation_service.prompts) == ["Desert", "Mountain lake"]
+    assert sorted(icon_finder_service.queries) == ["chart", "globe"]
+    assert metrics == {
+        "image_requests": 5,
+        "images_deduplicated": 3,
+        "icon_requests": 5,
+        "icons_deduplicated": 3,
+    }
+    # Every slide got the shared result
+    for slide in slides:
+        content = json.loads(slide.content)
+        assert content["image"]["__image_url__"].startswith("https://images.example.com/")
+        assert content["icon"]["__icon_url__"].startswith("/static/icons/")
+
+
+def test_failed_requests_are_tried_again():
+    image_generation_service = SlowImageGenerationService(fail_first=True)
+    asset_deduplicator = AssetFetchDeduplicator(image_generation_service)
+
+    async def run():
+        first = await asyncio.gather(
+            asset_deduplicator.generate_image(ImagePrompt(prompt="Mountain lake")),
+            asset_deduplicator.generate_image(ImagePrompt(prompt="Mountain lake")),
+            return_exceptions=True,
+        )
+        second = await asset_deduplicator.generate_image(ImagePrompt(prompt="Mountain lake"))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert all(isinstance(each, Exception) for each in first)
+    assert second == "https://images.example.com/Mountain-lake.jpg"
+    assert len(image_generation_service.prompts) == 2
@@ -0,0 +1,162 @@
+import asyncio
+import io
+import os
+from unittest.mock import patch
+
+from aiohttp import web
+from PIL import Image
+
+from services.bulk_downloader import BulkDownloader
+from services.executor_service import EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+
+
+def get_png_bytes(color: str) -> bytes:
+    image = io.BytesIO()
+    Image.new("RGB", (10, 10), color).save(image, format="PNG")
+    return image.getvalue()
+
+
+class ImageHost:
+    """Image host counting requests by path and requests served at the same time"""
+
+    def __init__(self):
+        self.requests = {}
+        self.running = 0
+        self.max_running = 0
+
+    async def handler(self, request):
+        path = request.path
+        self.requests[path] = self.requests.get(path, 0) + 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.05)
+            if path == "/flaky.png" and self.requests[path] == 1:
+                return web.Response(status=503)
+            if path == "/missing.png":
+                return web.Response(status=404)
+            if path == "/slow.png":
+                await asyncio.sleep(5)
+            color = "blue" if "blue" in path else "red"
+            if path.startswith("/attachment"):
+                # Different images served under the same name
+                return web.Response(
+                    body=get_png_bytes(color),
+                    headers={"Content-Disposition": 'attachment; filename="image.png"'},
+                )
+            return web.Response(body=get_png_bytes(color), content_type="image/png")
+        finally:
+            self.running -= 1
+
+    def download(self, save_directory: str, paths, environ=None):
+        progress = []
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/{name}", self.handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            bulk_downloader = BulkDownloader(
+                save_directory,
+                on_progress=lambda completed, total: progress.append(
+                    (completed, total)
+                ),
+            )
+            try:
+                results = await bulk_downloader.download(
+                    [f"http://127.0.0.1:{port}{path}" for path in paths]
+                )
+                return results, bulk_downloader.get_metrics()
+            finally:
+                await HTTP_CLIENT_SERVICE.close()
+                await runner.cleanup()
+
+        try:
+            with patch.dict(os.environ, environ or {}), patch(
+                "services.bulk_downloader.get_bulk_download_retry_delay_seconds",
+                return_value=0,
+            ):
+                results, metrics = asyncio.run(run())
+        finally:
+            EXECUTOR_SERVICE.shutdown()
+        return results, metrics, progress
+
+
+def test_downloads_are_capped_per_host_and_reported(tmp_path):
+    image_host = ImageHost()
+    paths = [f"/red_{i}.png" for i in range(8)]
+
+    results, metrics, progress = image_host.download(
+        str(tmp_path), paths, {"BULK_DOWNLOAD_PER_HOST_CONCURRENCY": "2"}
+    )
+
+    assert image_host.max_running == 2
+    assert all(results)
+    assert progress[-1] == (8, 8)
+    assert len(progress) == 8
+    # Identical content is kept once
+    assert len(set(results)) == 1
+    assert metrics["downloaded"] == 1
+    assert metrics["deduplicated"] == 7
+    assert os.listdir(tmp_path) == [os.path.basename(results[0])]
+
+
+def test_duplicate_urls_are_downloaded_once(tmp_path):
+    image_host = ImageHost()
+
+    results, _, _ = image_host.download(
+        str(tmp_path), ["/blue.png", "/red.png", "/blue.png"]
+    )
+
+    assert image_host.requests == {"/blue.png": 1, "/red.png": 1}
+    assert results[0] == results[2]
+    assert results[0] != results[1]
+
+
+def test_server_errors_are_retried_and_client_errors_are_not(tmp_path):
+    image_host = ImageHost()
+
+    results, metrics, _ = image_host.download(
+        str(tmp_path), ["/flaky.png", "/missing.png"]
+    )
+
+    assert results[0] is not None
+    assert results[1] is None
+    assert image_host.requests == {"/flaky.png": 2, "/missing.png": 1}
+    assert metrics["retries"] == 1
+    assert metrics["failed"] == 1
+
+
+def test_hung_downloads_time_out(tmp_path):
+    image_host = ImageHost()
+
+    results, metrics, _ = image_host.download(
+        str(tmp_path),
+        ["/slow.png", "/red.png"],
+        {"BULK_DOWNLOAD_TIMEOUT_SECONDS": "1", "BULK_DOWNLOAD_MAX_RETRIES": "0"},
+    )
+
+    assert results[0] is None
+    assert results[1] is not None
+    assert metrics["failed"] == 1
+    # The partial file of the hung download is removed
+    assert os.listdir(tmp_path) == [os.path.basename(results[1])]
+
+
+def test_images_served_under_the_same_name_are_kept_apart(tmp_path):
+    image_host = ImageHost()
+
+    results, metrics, _ = image_host.download(
+        str(tmp_path), ["/attachment_red", "/attachment_blue"]
+    )
+
+    assert results[0] != results[1]
+    assert metrics["downloaded"] == 2
+    with open(results[0], "rb") as f:
+        assert f.read() == get_png_bytes("red")
+    with open(results[1], "rb") as f:
+        assert f.read() == get_png_bytes("blue")
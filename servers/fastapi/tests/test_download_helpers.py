@@ -0,0 +1,77 @@
+import asyncio
+import io
+import os
+
+from aiohttp import web
+from PIL import Image
+
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from utils.download_helpers import download_file
+
+
+def get_png_bytes() -> bytes:
+    image = io.BytesIO()
+    Image.new("RGB", (10, 10), "red").save(image, format="PNG")
+    return image.getvalue()
+
+
+def download_from_test_server(save_directory: str, path: str):
+    """Serves a PNG without extension in its URL, and counts requests by method"""
+    requests = []
+
+    async def image_handler(request):
+        requests.append(request.method)
+        if path == "/typed":
+            return web.Response(body=get_png_bytes(), content_type="image/png")
+        return web.Response(
+            body=get_png_bytes(), content_type="application/octet-stream"
+        )
+
+    async def missing_handler(request):
+        requests.append(request.method)
+        return web.Response(status=404)
+
+    async def run():
+        app = web.Application()
+        app.router.add_route("*", "/typed", image_handler)
+        app.router.add_route("*", "/untyped", image_handler)
+        app.router.add_route("*", "/missing", missing_handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await download_file(
+                f"http://127.0.0.1:{port}{path}", save_directory
+            )
+        finally:
+            await HTTP_CLIENT_SERVICE.close()
+            await runner.cleanup()
+
+    return asyncio.run(run()), requests
+
+
+def test_extension_comes_from_the_get_response_headers(tmp_path):
+    path, requests = download_from_test_server(str(tmp_path), "/typed")
+
+    assert requests == ["GET"]
+    assert path.endswith(".png")
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_extension_comes_from_the_file_signature(tmp_path):
+    path, requests = download_from_test_server(str(tmp_path), "/untyped")
+
+    assert requests == ["GET"]
+    assert path.endswith(".png")
+    with open(path, "rb") as f:
+        assert f.read() == get_png_bytes()
+
+
+def test_failed_downloads_leave_no_file(tmp_path):
+    path, requests = download_from_test_server(str(tmp_path), "/missing")
+
+    assert path is None
+    assert requests == ["GET"]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from services.event_loop_monitor import EventLoopLagMonitor
+
+
+def block_the_loop(seconds: float):
+    # Stands in for a sync SDK call made from async code
+    time.sleep(seconds)
+
+
+async def run_with_monitor(monitor: EventLoopLagMonitor, work):
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await work()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+
+def test_lag_is_recorded_in_the_histogram():
+    monitor = EventLoopLagMonitor(interval=0.01, debug=False)
+
+    async def work():
+        block_the_loop(0.2)
+
+    asyncio.run(run_with_monitor(monitor, work))
+    metrics = monitor.get_metrics()
+
+    assert metrics["count"] > 3
+    assert metrics["max_seconds"] >= 0.15
+    histogram = {each["le"]: each["count"] for each in metrics["histogram"]}
+    # Buckets are cumulative, the stall only falls in the buckets from 0.25s
+    assert histogram["+Inf"] == metrics["count"]
+    assert histogram[0.1] == metrics["count"] - 1
+    assert histogram[0.25] == metrics["count"]
+    assert metrics["blocking_calls"] == []
+
+
+def test_debug_mode_captures_the_stack_of_the_blocking_call():
+    monitor = EventLoopLagMonitor(interval=0.01, debug=True, blocking_threshold=0.05)
+
+    async def work():
+        block_the_loop(0.3)
+        # Non-blocking waits are never reported
+        await asyncio.sleep(0.3)
+
+    asyncio.run(run_with_monitor(monitor, work))
+    blocking_calls = monitor.get_metrics()["blocking_calls"]
+
+    assert len(blocking_calls) == 1
+    assert "block_the_loop" in blocking_calls[0]["location"]
+    # Stacks are logged, never returned by the metrics endpoint
+    assert "stack" not in blocking_calls[0]
+    assert blocking_calls[0]["blocked_seconds"] >= 0.05
@@ -0,0 +1,112 @@
+import asyncio
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+from services.executor_service import (
+    ExecutorPool,
+    get_process_pool,
+    get_thread_pool,
+)
+
+
+class BlockingCall:
+    """Blocks its thread like a boto3 upload, and counts calls running together"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+
+
+def test_calls_beyond_the_pool_size_wait_in_its_queue():
+    pool = ExecutorPool("io", 2, get_thread_pool)
+    blocking_call = BlockingCall(0.1)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.gather(*[pool.run(blocking_call) for _ in range(5)])
+        ticker_task.cancel()
+        return ticks
+
+    ticks = asyncio.run(run())
+    pool.shutdown()
+    metrics = pool.get_metrics()
+
+    assert blocking_call.max_running == 2
+    assert metrics["completed"] == 5
+    assert metrics["max_queue_depth"] == 3
+    assert metrics["queue_depth"] == 0
+    assert metrics["running"] == 0
+    assert metrics["max_wait_seconds"] >= 0.15
+    # The loop kept running while the calls were blocking
+    assert ticks >= 15
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_call_returns():
+    pool = ExecutorPool("io", 1, get_thread_pool)
+    blocking_call = BlockingCall(0.2)
+
+    async def run():
+        task = asyncio.create_task(pool.run(blocking_call))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0)
+        running_after_cancel = pool.get_metrics()["running"]
+        await pool.run(blocking_call)
+        return running_after_cancel
+
+    running_after_cancel = asyncio.run(run())
+    pool.shutdown()
+
+    assert running_after_cancel == 1
+    assert blocking_call.max_running == 1
+
+
+def test_cpu_work_runs_in_another_process():
+    pool = ExecutorPool("cpu", 1, get_process_pool)
+
+    pid = asyncio.run(pool.run(os.getpid))
+    pool.shutdown()
+
+    assert pid != os.getpid()
+    assert pool.get_metrics()["completed"] == 1
+
+
+def test_subprocess_output_and_errors():
+    pool = ExecutorPool("libreoffice", 1)
+
+    result = asyncio.run(pool.run_subprocess(["echo", "converted"]))
+    assert result.stdout == "converted\n"
+
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(pool.run_subprocess(["false"]))
+
+    started_at = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(pool.run_subprocess(["sleep", "5"], timeout=0.1))
+    assert time.perf_counter() - started_at < 2
+
+    metrics = pool.get_metrics()
+    assert metrics["completed"] == 2
+    assert metrics["failed"] == 1
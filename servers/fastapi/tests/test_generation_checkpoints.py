@@ -0,0 +1,177 @@
+import asyncio
+from unittest.mock import patch
+
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from models.presentation_structure_model import PresentationStructureModel
+from services.generation_checkpoint_service import (
+    GenerationCheckpointMetrics,
+    GenerationCheckpoints,
+    get_slide_fingerprint,
+)
+from utils.llm_calls.generate_slide_content import get_failed_slide_content
+
+
+class FakeGenerationCheckpointCRUD:
+    """In-memory version of GenerationCheckpointCRUD"""
+
+    def __init__(self):
+        self.plans = {}
+        self.slides = {}
+
+    async def get_plan(self, presentation_id):
+        return self.plans.get(presentation_id)
+
+    async def save_plan(self, presentation_id, plan, ttl_seconds):
+        self.plans[presentation_id] = plan
+
+    async def get_slides(self, presentation_id):
+        return dict(self.slides.get(presentation_id, {}))
+
+    async def save_slide(
+        self, presentation_id, slide_number, fingerprint, status, content, ttl_seconds
+    ):
+        self.slides.setdefault(presentation_id, {})[slide_number] = {
+            "slide_number": slide_number,
+            "fingerprint": fingerprint,
+            "status": status,
+            "content": content,
+        }
+
+    async def delete_checkpoints(self, presentation_id):
+        self.plans.pop(presentation_id, None)
+        return len(self.slides.pop(presentation_id, {}))
+
+
+LAYOUT = SlideLayoutModel(id="basic-info-slide", json_schema={"type": "object"})
+
+
+def get_fingerprints(outlines):
+    return [
+        get_slide_fingerprint(
+            LAYOUT, SlideOutlineModel(content=each), "English", None, None, None
+        )
+        for each in outlines
+    ]
+
+
+async def generate_deck(fingerprints, generated, resume, fail_at=None):
+    """Mirrors the slide loop of the generation endpoints"""
+    checkpoints = GenerationCheckpoints("presentation-1")
+    await checkpoints.load_slides(fingerprints, resume)
+    slides = []
+    for i in range(len(fingerprints)):
+        content = checkpoints.get_content(i)
+        if not content:
+            if i == fail_at:
+                raise RuntimeError("LLM unavailable")
+            generated.append(i)
+            content = {"title": f"Slide {i}", "__image_url__": None}
+            await checkpoints.save_content(i, content)
+        if not checkpoints.is_completed(i):
+            content["__image_url__"] = f"/images/{i}.png"
+            await checkpoints.save_completed(i, content)
+        slides.append(content)
+    await checkpoints.clear()
+    return slides
+
+
+def run(coroutine, fake_crud, metrics):
+    with (
+        patch(
+            "services.generation_checkpoint_service.generation_checkpoint_crud",
+            fake_crud,
+        ),
+        patch(
+            "services.generation_checkpoint_service.GENERATION_CHECKPOINT_METRICS",
+            metrics,
+        ),
+    ):
+        return asyncio.run(coroutine)
+
+
+def test_resume_only_generates_the_missing_slides():
+    fake_crud = FakeGenerationCheckpointCRUD()
+    metrics = GenerationCheckpointMetrics()
+    fingerprints = get_fingerprints([f"# Slide {i}" for i in range(30)])
+
+    generated = []
+    try:
+        run(generate_deck(fingerprints, generated, False, fail_at=26), fake_crud, metrics)
+    except RuntimeError:
+        pass
+    assert generated == list(range(26))
+
+    generated = []
+    slides = run(generate_deck(fingerprints, generated, True), fake_crud, metrics)
+
+    assert generated == [26, 27, 28, 29]
+    assert [each["__image_url__"] for each in slides] == [
+        f"/images/{i}.png" for i in range(30)
+    ]
+    assert metrics.slides_reused == 26
+    assert metrics.resumed_generations == 1
+    # Checkpoints are removed once the deck is saved
+    assert fake_crud.slides == {}
+
+
+def test_slides_with_changed_inputs_are_generated_again():
+    fake_crud = FakeGenerationCheckpointCRUD()
+    metrics = GenerationCheckpointMetrics()
+    outlines = [f"# Slide {i}" for i in range(4)]
+
+    async def fail_last():
+        checkpoints = GenerationCheckpoints("presentation-1")
+        await checkpoints.load_slides(get_fingerprints(outlines), False)
+        for i in range(3):
+            await checkpoints.save_completed(i, {"title": f"Slide {i}"})
+        # The placeholder of a failed slide is never checkpointed
+        placeholder = get_failed_slide_content(
+            LAYOUT, SlideOutlineModel(content=outlines[3]), "LLM unavailable"
+        )
+        await checkpoints.save_content(3, placeholder)
+        await checkpoints.save_completed(3, placeholder)
+
+    run(fail_last(), fake_crud, metrics)
+
+    outlines[1] = "# Edited slide"
+    generated = []
+    run(
+        generate_deck(get_fingerprints(outlines), generated, True), fake_crud, metrics
+    )
+
+    assert generated == [1, 3]
+
+
+def test_fresh_generation_ignores_existing_checkpoints():
+    fake_crud = FakeGenerationCheckpointCRUD()
+    metrics = GenerationCheckpointMetrics()
+    fingerprints = get_fingerprints(["# A", "# B"])
+
+    try:
+        run(generate_deck(fingerprints, [], False, fail_at=1), fake_crud, metrics)
+    except RuntimeError:
+        pass
+
+    generated = []
+    run(generate_deck(fingerprints, generated, False), fake_crud, metrics)
+
+    assert generated == [0, 1]
+
+
+def test_plan_is_restored():
+    fake_crud = FakeGenerationCheckpointCRUD()
+    metrics = GenerationCheckpointMetrics()
+    outlines = PresentationOutlineModel(
+        slides=[SlideOutlineModel(content="# A"), SlideOutlineModel(content="# B")]
+    )
+    structure = PresentationStructureModel(slides=[0, 2])
+
+    async def save_and_load():
+        await GenerationCheckpoints("presentation-1").save_plan(outlines, structure)
+        return await GenerationCheckpoints("presentation-1").load_plan()
+
+    assert run(save_and_load(), fake_crud, metrics) == (outlines, structure)
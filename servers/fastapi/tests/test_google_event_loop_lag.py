@@ -0,0 +1,175 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from google.genai.types import (
+    Candidate,
+    Content,
+    GenerateContentResponse,
+    Part,
+)
+
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMUserMessage
+from services.llm_client import LLMClient
+
+
+CHUNKS = 6
+CHUNK_LATENCY = 0.05
+
+
+def get_event(text: str) -> GenerateContentResponse:
+    return GenerateContentResponse(
+        candidates=[Candidate(content=Content(role="model", parts=[Part(text=text)]))]
+    )
+
+
+class FakeGoogleModels:
+    """Streams chunks with network latency, blocking in the sync client"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content_stream(self, **kwargs):
+        self.calls += 1
+        for i in range(CHUNKS):
+            time.sleep(CHUNK_LATENCY)
+            yield get_event(str(i))
+
+    def generate_content(self, **kwargs):
+        self.calls += 1
+        time.sleep(CHUNK_LATENCY)
+        return get_event("done")
+
+
+class FakeAsyncGoogleModels:
+    """Counts the requests in flight at the same time"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _start(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    async def generate_content_stream(self, **kwargs):
+        async def stream():
+            self._start()
+            try:
+                for i in range(CHUNKS):
+                    await asyncio.sleep(CHUNK_LATENCY)
+                    yield get_event(str(i))
+            finally:
+                self.in_flight -= 1
+
+        return stream()
+
+    async def generate_content(self, **kwargs):
+        self._start()
+        try:
+            await asyncio.sleep(CHUNK_LATENCY)
+            return get_event("done")
+        finally:
+            self.in_flight -= 1
+
+
+def get_google_llm_client() -> LLMClient:
+    llm_client = LLMClient.__new__(LLMClient)
+    llm_client.llm_provider = LLMProvider.GOOGLE
+    llm_client._client = SimpleNamespace(
+        models=FakeGoogleModels(),
+        aio=SimpleNamespace(models=FakeAsyncGoogleModels()),
+    )
+    return llm_client
+
+
+async def measure_max_lag(work) -> float:
+    """Largest delay of a 5ms ticker while the work runs"""
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not done.is_set():
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_lag = max(max_lag, time.perf_counter() - started_at - 0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    await work
+    done.set()
+    await ticker_task
+    return max_lag
+
+
+def stream_google_concurrently(llm_client: LLMClient, n_streams: int):
+    messages = [LLMUserMessage(content="Hello")]
+
+    async def consume():
+        return [
+            chunk
+            async for chunk in llm_client._stream_google(
+                model="gemini", messages=messages
+            )
+        ]
+
+    async def run():
+        streams = asyncio.gather(*[consume() for _ in range(n_streams)])
+        return await measure_max_lag(streams), streams.result()
+
+    return asyncio.run(run())
+
+
+def generate_google_concurrently(llm_client: LLMClient, n_calls: int):
+    messages = [LLMUserMessage(content="Hello")]
+
+    async def run():
+        calls = asyncio.gather(
+            *[
+                llm_client._generate_google(model="gemini", messages=messages)
+                for _ in range(n_calls)
+            ]
+        )
+        return await measure_max_lag(calls), calls.result()
+
+    return asyncio.run(run())
+
+
+def test_concurrent_google_streams_use_the_async_client():
+    llm_client = get_google_llm_client()
+
+    _, results = stream_google_concurrently(llm_client, 8)
+
+    assert results[0] == [str(i) for i in range(CHUNKS)]
+    assert llm_client._client.models.calls == 0
+    # Every stream is read at the same time
+    assert llm_client._client.aio.models.max_in_flight == 8
+
+
+def test_google_generate_uses_the_async_client():
+    llm_client = get_google_llm_client()
+
+    _, results = generate_google_concurrently(llm_client, 8)
+
+    assert results == ["done"] * 8
+    assert llm_client._client.models.calls == 0
+    assert llm_client._client.aio.models.max_in_flight == 8
+
+
+@pytest.mark.benchmark
+def test_concurrent_google_streams_do_not_block_the_event_loop():
+    max_lag, _ = stream_google_concurrently(get_google_llm_client(), 8)
+
+    # A blocking chunk read would stall the loop for at least CHUNK_LATENCY
+    assert max_lag < CHUNK_LATENCY
+
+
+@pytest.mark.benchmark
+def test_google_generate_does_not_block_the_event_loop():
+    max_lag, _ = generate_google_concurrently(get_google_llm_client(), 8)
+
+    assert max_lag < CHUNK_LATENCY
@@ -0,0 +1,59 @@
+import asyncio
+
+from aiohttp import web
+
+from services.http_client_service import HttpClientService
+
+
+def test_requests_reuse_the_connections_of_the_shared_session():
+    http_client_service = HttpClientService()
+    peers = set()
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.Response(text="ok")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        http_client_service.start()
+        session = http_client_service.get_session()
+        for _ in range(5):
+            async with http_client_service.get_session().get(
+                f"http://127.0.0.1:{port}/"
+            ) as response:
+                assert await response.text() == "ok"
+
+        await http_client_service.close()
+        await runner.cleanup()
+        return session
+
+    session = asyncio.run(run())
+
+    # One keep-alive connection served every request
+    assert len(peers) == 1
+    assert session.closed
+
+
+def test_sessions_are_created_again_on_another_loop():
+    http_client_service = HttpClientService()
+
+    async def get_session():
+        return http_client_service.get_session(trust_env=True)
+
+    async def get_session_twice():
+        session = await get_session()
+        assert await get_session() is session
+        return session
+
+    first_session = asyncio.run(get_session_twice())
+    second_session = asyncio.run(get_session())
+
+    assert second_session is not first_session
+    assert second_session.trust_env
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from models.image_prompt import ImagePrompt
+from models.mongo.asset import AssetInDB
+from services.image_cache_service import ImageCacheService
+from services.image_generation_service import ImageGenerationService
+
+
+class FakeAssetsCollection:
+    """Cached images kept in memory, like the image cache methods of the asset CRUD"""
+
+    def __init__(self):
+        self.entries = {}
+        self.ttls = {}
+
+    async def get_image_cache_entry(self, cache_key):
+        return self.entries.get(cache_key)
+
+    async def set_image_cache_entry(self, cache_key, entry, ttl_seconds):
+        self.entries[cache_key] = entry
+        self.ttls[cache_key] = ttl_seconds
+
+    async def evict_image_cache_entries(self, max_entries):
+        return 0
+
+
+def generate_images(prompts, use_image_cache=True, provider_image="https://images.pexels.com/1.jpg"):
+    cache_service = ImageCacheService()
+    assets = FakeAssetsCollection()
+    get_image_from_pexels = AsyncMock(return_value=provider_image)
+
+    async def run():
+        with patch.dict("os.environ", {"IMAGE_PROVIDER": "pexels"}):
+            image_generation_service = ImageGenerationService(
+                "/tmp", use_image_cache=use_image_cache
+            )
+            image_generation_service.image_gen_func = get_image_from_pexels
+            return [
+                await image_generation_service.generate_image(ImagePrompt(prompt=prompt))
+                for prompt in prompts
+            ]
+
+    with patch(
+        "services.image_generation_service.IMAGE_CACHE_SERVICE", cache_service
+    ), patch("services.image_cache_service.asset_crud", assets):
+        images = asyncio.run(run())
+    return images, get_image_from_pexels, cache_service
+
+
+def test_cached_prompts_skip_the_provider():
+    images, get_image_from_pexels, cache_service = generate_images(
+        ["Mountain lake", "  mountain   LAKE ", "Desert"]
+    )
+
+    assert images == ["https://images.pexels.com/1.jpg"] * 3
+    assert get_image_from_pexels.await_count == 2
+    metrics = cache_service.get_metrics()
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 2
+    assert metrics["stored"] == 2
+
+
+def test_bypass_calls_the_provider_every_time():
+    images, get_image_from_pexels, cache_service = generate_images(
+        ["Mountain lake", "Mountain lake"], use_image_cache=False
+    )
+
+    assert len(images) == 2
+    assert get_image_from_pexels.await_count == 2
+    metrics = cache_service.get_metrics()
+    assert metrics["bypassed"] == 2
+    assert metrics["stored"] == 0
+
+
+def test_placeholder_images_are_not_cached():
+    _, get_image_from_pexels, cache_service = generate_images(
+        ["Mountain lake", "Mountain lake"], provider_image=None
+    )
+
+    assert get_image_from_pexels.await_count == 2
+    assert cache_service.get_metrics()["stored"] == 0
+
+
+def test_key_depends_on_the_provider_and_size():
+    cache_service = ImageCacheService()
+    key = cache_service.get_key("pexels", "Mountain lake", "large")
+
+    assert key == cache_service.get_key("pexels", " mountain  lake", "large")
+    assert key != cache_service.get_key("pixabay", "Mountain lake", "large")
+    assert key != cache_service.get_key("pexels", "Mountain lake", "medium")
+
+
+def test_url_only_entries_expire_sooner_than_stored_images():
+    cache_service = ImageCacheService()
+    assets = FakeAssetsCollection()
+    asset = AssetInDB(
+        filename="1.png",
+        file_path="/app_data/images/1.png",
+        file_size=10,
+        mime_type="image/png",
+        asset_type="image",
+        user_id="system",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+    async def run():
+        await cache_service.set(
+            "url", "pixabay", "Mountain lake", "large", "https://pixabay.com/1.jpg"
+        )
+        await cache_service.set("asset", "dall-e-3", "Mountain lake", None, asset)
+
+    with patch("services.image_cache_service.asset_crud", assets):
+        asyncio.run(run())
+
+    assert assets.ttls["url"] == 24 * 60 * 60
+    assert assets.ttls["asset"] == cache_service.ttl_seconds
+    assert assets.ttls["url"] < assets.ttls["asset"]
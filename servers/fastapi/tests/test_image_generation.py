@@ -133,12 +133,12 @@ class TestImageGenerationService:
                                     }]
                                 })
                                 
-                                mock_session = AsyncMock()
-                                mock_session.get = AsyncMock(return_value=mock_response)
-                                mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-                                mock_session.__aexit__ = AsyncMock(return_value=None)
+                                mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+                                mock_response.__aexit__ = AsyncMock(return_value=None)
+                                mock_session = Mock()
+                                mock_session.get = Mock(return_value=mock_response)
                                 
-                                with patch('aiohttp.ClientSession', return_value=mock_session):
+                                with patch('services.image_generation_service.HTTP_CLIENT_SERVICE.get_session', return_value=mock_session):
                                     result = await service.generate_image(sample_image_prompt)
                                     assert result == "https://example.com/image.jpg"
         
@@ -245,12 +245,12 @@ class TestImageGenerationService:
                     }]
                 })
                 
-                mock_session = AsyncMock()
-                mock_session.get = AsyncMock(return_value=mock_response)
-                mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session.__aexit__ = AsyncMock(return_value=None)
+                mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+                mock_response.__aexit__ = AsyncMock(return_value=None)
+                mock_session = Mock()
+                mock_session.get = Mock(return_value=mock_response)
                 
-                with patch('aiohttp.ClientSession', return_value=mock_session):
+                with patch('services.image_generation_service.HTTP_CLIENT_SERVICE.get_session', return_value=mock_session):
                     result = await service.get_image_from_pexels("sunset")
                     
                     assert result == "https://example.com/pexels_image.jpg"
@@ -276,12 +276,12 @@ class TestImageGenerationService:
                     }]
                 })
                 
-                mock_session = AsyncMock()
-                mock_session.get = AsyncMock(return_value=mock_response)
-                mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session.__aexit__ = AsyncMock(return_value=None)
+                mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+                mock_response.__aexit__ = AsyncMock(return_value=None)
+                mock_session = Mock()
+                mock_session.get = Mock(return_value=mock_response)
                 
-                with patch('aiohttp.ClientSession', return_value=mock_session):
+                with patch('services.image_generation_service.HTTP_CLIENT_SERVICE.get_session', return_value=mock_session):
                     result = await service.get_image_from_pixabay("sunset")
                     
                     assert result == "https://example.com/pixabay_image.jpg"
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+from PIL import Image
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.executor_service import EXECUTOR_SERVICE
+from services.image_transform_cache_service import ImageTransformCacheService
+from services.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    get_picture_transform,
+)
+
+
+def get_picture(image_path: str, width: int = 300) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(width=width, height=200),
+        border_radius=[20, 20, 20, 20],
+        picture=PptxPictureModel(is_network=False, path=image_path),
+    )
+
+
+def get_deck(image_path: str) -> PptxPresentationModel:
+    # The same picture on three slides, and a different size on the last one
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(shapes=[get_picture(image_path)]),
+            PptxSlideModel(shapes=[get_picture(image_path)]),
+            PptxSlideModel(shapes=[get_picture(image_path)]),
+            PptxSlideModel(shapes=[get_picture(image_path, width=500)]),
+        ]
+    )
+
+
+def export_picture_paths(cache_service, deck, temp_dir):
+    async def run():
+        pptx_creator = PptxPresentationCreator(deck, temp_dir)
+        await pptx_creator.transform_pictures()
+        return list(pptx_creator.get_transformed_picture_paths().values())
+
+    with patch(
+        "services.pptx_presentation_creator.IMAGE_TRANSFORM_CACHE_SERVICE",
+        cache_service,
+    ):
+        return asyncio.run(run())
+
+
+def test_repeated_transforms_are_processed_once(tmp_path):
+    image_path = str(tmp_path / "image.png")
+    Image.new("RGB", (800, 600), "red").save(image_path)
+    cache_directory = tmp_path / "cache"
+    cache_directory.mkdir()
+    cache_service = ImageTransformCacheService()
+
+    try:
+        with patch(
+            "services.image_transform_cache_service.get_image_transform_cache_directory",
+            return_value=str(cache_directory),
+        ):
+            first_export = export_picture_paths(
+                cache_service, get_deck(image_path), str(tmp_path)
+            )
+            first_metrics = cache_service.get_metrics()
+            # Downloaded again by the next export, to another path
+            copied_image_path = str(tmp_path / "image_copy.png")
+            Image.open(image_path).save(copied_image_path)
+            second_export = export_picture_paths(
+                cache_service, get_deck(copied_image_path), str(tmp_path)
+            )
+    finally:
+        EXECUTOR_SERVICE.shutdown()
+
+    assert first_metrics["misses"] == 2
+    assert first_metrics["deduplicated"] == 2
+    assert len(set(first_export)) == 2
+    assert sorted(os.listdir(cache_directory)) == sorted(
+        os.path.basename(each) for each in set(first_export)
+    )
+
+    assert second_export == first_export
+    metrics = cache_service.get_metrics()
+    assert metrics["hits"] == 2
+    assert metrics["misses"] == 2
+    assert metrics["hit_rate"] == 0.5
+
+
+def test_key_depends_on_the_image_and_the_transform(tmp_path):
+    image_path = str(tmp_path / "image.png")
+    Image.new("RGB", (80, 60), "red").save(image_path)
+    cache_service = ImageTransformCacheService()
+    transform = get_picture_transform(get_picture(image_path))
+
+    key = cache_service.get_key(image_path, transform)
+    assert key == cache_service.get_key(image_path, dict(transform))
+    assert key != cache_service.get_key(
+        image_path, get_picture_transform(get_picture(image_path, width=500))
+    )
+
+    Image.new("RGB", (80, 60), "blue").save(image_path)
+    assert key != cache_service.get_key(image_path, transform)
+
+
+def test_entries_unused_for_longer_than_the_ttl_are_pruned(tmp_path):
+    old_entry = tmp_path / "old.png"
+    recent_entry = tmp_path / "recent.png"
+    old_entry.write_bytes(b"old")
+    recent_entry.write_bytes(b"recent")
+    two_weeks_ago = time.time() - 14 * 24 * 60 * 60
+    os.utime(old_entry, (two_weeks_ago, two_weeks_ago))
+
+    with patch(
+        "services.image_transform_cache_service.get_image_transform_cache_directory",
+        return_value=str(tmp_path),
+    ):
+        pruned = ImageTransformCacheService().prune()
+
+    assert pruned == 1
+    assert os.listdir(tmp_path) == ["recent.png"]
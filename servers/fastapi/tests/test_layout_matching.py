@@ -0,0 +1,167 @@
+import time
+
+import pytest
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from utils.layout_matching import match_layouts
+
+
+def get_list_schema(field: str, min_items: int, max_items: int) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string"},
+            field: {
+                "type": "array",
+                "items": {"type": "object"},
+                "minItems": min_items,
+                "maxItems": max_items,
+            },
+        },
+    }
+
+
+TEXT_SCHEMA = {
+    "type": "object",
+    "properties": {"title": {"type": "string"}, "description": {"type": "string"}},
+}
+
+# Mirrors the layouts of the general template
+GENERAL_LAYOUT = PresentationLayoutModel(
+    name="general",
+    slides=[
+        SlideLayoutModel(
+            id="general-intro-slide",
+            name="Intro Slide",
+            description="A clean slide layout with title, description text, presenter info, and a supporting image.",
+            json_schema=TEXT_SCHEMA,
+        ),
+        SlideLayoutModel(
+            id="basic-info-slide",
+            name="Basic Info",
+            description="A clean slide layout with title, description text, and a supporting image.",
+            json_schema=TEXT_SCHEMA,
+        ),
+        SlideLayoutModel(
+            id="bullet-with-icons-slide",
+            name="Bullet with Icons",
+            description="A bullets style slide with main content, supporting image, and bullet points with icons and descriptions.",
+            json_schema=get_list_schema("bulletPoints", 1, 3),
+        ),
+        SlideLayoutModel(
+            id="numbered-bullets-slide",
+            name="Numbered Bullets",
+            description="A slide layout with large title, supporting image, and numbered bullet points with descriptions.",
+            json_schema=get_list_schema("bulletPoints", 1, 3),
+        ),
+        SlideLayoutModel(
+            id="metrics-slide",
+            name="Metrics",
+            description="A slide layout for showcasing key business metrics with large numbers and descriptive text boxes.",
+            json_schema=get_list_schema("metrics", 2, 3),
+        ),
+        SlideLayoutModel(
+            id="quote-slide",
+            name="Quote",
+            description="A slide layout with a heading, inspirational quote, and background image.",
+            json_schema=TEXT_SCHEMA,
+        ),
+        SlideLayoutModel(
+            id="table-of-contents-slide",
+            name="Table of Contents",
+            description="A professional table of contents layout with numbered sections.",
+            json_schema=get_list_schema("sections", 1, 10),
+        ),
+    ],
+)
+
+
+def get_layout_ids(outlines):
+    matches = match_layouts(
+        PresentationOutlineModel(
+            slides=[SlideOutlineModel(content=each) for each in outlines]
+        ),
+        GENERAL_LAYOUT,
+    )
+    return [GENERAL_LAYOUT.slides[index].id for index, _ in matches], matches
+
+
+def test_outlines_are_matched_by_their_features():
+    layout_ids, matches = get_layout_ids(
+        [
+            "# The Future of Solar Energy\nA look at the next decade",
+            "# Key Drivers\n- Falling panel costs\n- Storage\n- Policy support",
+            "# Traction\n- 150+ clients\n- 95% retention\n- $2M ARR",
+            "# Our Approach\nWe partner with local installers to bring rooftop solar to every home in the region.",
+            '# Closing\n> "The best way to predict the future is to create it." - Peter Drucker',
+        ]
+    )
+
+    assert layout_ids == [
+        "general-intro-slide",
+        "bullet-with-icons-slide",
+        "metrics-slide",
+        "basic-info-slide",
+        "quote-slide",
+    ]
+    assert all(confidence >= 0.5 for _, confidence in matches)
+
+
+def test_consecutive_slides_get_varied_layouts():
+    layout_ids, _ = get_layout_ids(
+        ["# Title"]
+        + [f"# Point {i}\n- First\n- Second\n- Third" for i in range(3)]
+    )
+
+    assert layout_ids[1:] == [
+        "bullet-with-icons-slide",
+        "numbered-bullets-slide",
+        "bullet-with-icons-slide",
+    ]
+
+
+def test_table_of_contents_layout_is_never_picked():
+    layout_ids, _ = get_layout_ids(
+        ["# Title", "# Agenda\n" + "\n".join(f"{i}. Section {i}" for i in range(1, 8))]
+    )
+
+    assert "table-of-contents-slide" not in layout_ids
+
+
+def test_unclear_outlines_have_low_confidence():
+    _, matches = get_layout_ids(["# Title", "# Notes"])
+
+    # A heading alone after the first slide could be anything
+    assert matches[1][1] < 0.5
+
+
+def test_matching_is_deterministic():
+    outlines = [
+        f"# Section {i}\n- Point A\n- Point B with {i}% growth\n- Point C"
+        for i in range(100)
+    ]
+
+    first, first_matches = get_layout_ids(outlines)
+    second, second_matches = get_layout_ids(outlines)
+
+    assert first == second
+    assert first_matches == second_matches
+    assert len(first) == 100
+
+
+@pytest.mark.benchmark
+def test_matching_a_long_deck_is_fast():
+    outlines = [
+        f"# Section {i}\n- Point A\n- Point B with {i}% growth\n- Point C"
+        for i in range(100)
+    ]
+
+    started_at = time.perf_counter()
+    get_layout_ids(outlines)
+    elapsed = time.perf_counter() - started_at
+
+    assert elapsed < 0.5
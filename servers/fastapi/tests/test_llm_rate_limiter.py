@@ -0,0 +1,128 @@
+import asyncio
+import time
+from contextlib import aclosing
+
+from enums.llm_request_priority import LLMRequestPriority
+from services.llm_client import LLMClient, LLMRateLimiter, TokenBucket
+
+
+def test_concurrency_is_capped_and_requests_queue():
+    limiter = LLMRateLimiter(max_concurrency=2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def call():
+        nonlocal in_flight, max_in_flight
+        async with limiter.limit():
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run():
+        await asyncio.gather(*[call() for _ in range(10)])
+
+    asyncio.run(run())
+    metrics = limiter.get_metrics()
+    assert max_in_flight == 2
+    assert metrics["admitted"] == 10
+    assert metrics["max_queue_depth"] >= 8
+    assert metrics["in_flight"] == 0
+    assert metrics["queue_depth"] == 0
+
+
+def test_interactive_requests_are_admitted_before_bulk():
+    limiter = LLMRateLimiter(max_concurrency=1)
+    order = []
+
+    async def call(name, priority):
+        async with limiter.limit(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        # Occupies the only slot so the rest are queued
+        first = asyncio.create_task(call("first", LLMRequestPriority.BULK))
+        await asyncio.sleep(0)
+        bulk = [
+            asyncio.create_task(call(f"bulk-{i}", LLMRequestPriority.BULK))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(
+            call("interactive", LLMRequestPriority.INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+        assert limiter.get_metrics()["queue_depth_by_priority"] == {
+            "interactive": 1,
+            "bulk": 3,
+        }
+        await asyncio.gather(first, interactive, *bulk)
+
+    asyncio.run(run())
+    assert order == ["first", "interactive", "bulk-0", "bulk-1", "bulk-2"]
+
+
+def test_requests_per_minute_bucket_delays_instead_of_failing():
+    # 1200 requests per minute refills one request every 50ms
+    limiter = LLMRateLimiter(max_concurrency=10, requests_per_minute=1200)
+    limiter.requests_bucket.tokens = 1
+
+    async def run():
+        started_at = time.perf_counter()
+        for _ in range(3):
+            async with limiter.limit():
+                pass
+        return time.perf_counter() - started_at
+
+    elapsed = asyncio.run(run())
+    assert elapsed >= 0.09
+    assert limiter.get_metrics()["admitted"] == 3
+
+
+def test_token_bucket_caps_oversized_requests():
+    bucket = TokenBucket(600)
+    bucket.consume(600)
+    # Waits for a full bucket, never forever
+    assert 0 < bucket.get_wait_time(10_000) <= 60
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = LLMRateLimiter(max_concurrency=1)
+
+    async def run():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        limiter.release()
+        async with limiter.limit():
+            pass
+
+    asyncio.run(asyncio.wait_for(run(), 1))
+    assert limiter.get_metrics()["in_flight"] == 0
+
+
+def test_streams_closed_early_give_their_slot_back():
+    llm_client = LLMClient.__new__(LLMClient)
+    llm_client.rate_limiter = LLMRateLimiter(max_concurrency=1)
+    llm_client.priority = LLMRequestPriority.BULK
+    closed = []
+
+    async def stream():
+        try:
+            for i in range(10):
+                yield str(i)
+        finally:
+            closed.append(True)
+
+    async def run():
+        async with aclosing(llm_client._limit_stream(stream(), 0)) as chunks:
+            async for _ in chunks:
+                assert llm_client.rate_limiter.get_metrics()["in_flight"] == 1
+                break
+        return llm_client.rate_limiter.get_metrics()["in_flight"]
+
+    assert asyncio.run(asyncio.wait_for(run(), 1)) == 0
+    assert closed == [True]
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from enums.llm_provider import LLMProvider
+from services.llm_client import LLMRoute, LLMRouter, get_llm_routes
+
+
+def get_router():
+    return LLMRouter(
+        [
+            LLMRoute(LLMProvider.OPENAI, "gpt-4.1"),
+            LLMRoute(LLMProvider.ANTHROPIC, "claude-sonnet-4-20250514"),
+        ]
+    )
+
+
+class FakeCall:
+    """Answers after the latency of the route, or fails for the failing routes"""
+
+    def __init__(self, latencies, failing=()):
+        self.latencies = latencies
+        self.failing = failing
+        self.calls = []
+
+    async def __call__(self, route):
+        self.calls.append(route.provider)
+        await asyncio.sleep(self.latencies.get(route.provider, 0))
+        if route.provider in self.failing:
+            raise HTTPException(status_code=503, detail="Overloaded")
+        return route.provider
+
+
+def test_failed_call_fails_over_to_the_next_route():
+    router = get_router()
+    fake_call = FakeCall({}, failing=[LLMProvider.OPENAI])
+
+    result = asyncio.run(router.call(fake_call, hedge=False))
+
+    assert result == LLMProvider.ANTHROPIC
+    assert fake_call.calls == [LLMProvider.OPENAI, LLMProvider.ANTHROPIC]
+    assert router.failovers == 1
+    assert router.routes[0].stats.error_rate == 1
+
+
+def test_last_error_is_raised_when_every_route_fails():
+    router = get_router()
+    fake_call = FakeCall({}, failing=[LLMProvider.OPENAI, LLMProvider.ANTHROPIC])
+
+    with pytest.raises(HTTPException):
+        asyncio.run(router.call(fake_call, hedge=False))
+
+
+def test_calls_go_to_the_healthiest_route():
+    router = get_router()
+    openai, anthropic = router.routes
+    for _ in range(10):
+        openai.stats.record_success(2.0)
+        anthropic.stats.record_success(0.5)
+    assert router.get_ranked_routes() == [anthropic, openai]
+
+    # Errors count against a route, and a route that keeps failing is skipped
+    for _ in range(3):
+        anthropic.stats.record_failure()
+    assert anthropic.stats.is_cooling_down
+    assert router.get_ranked_routes() == [openai, anthropic]
+
+
+def test_unmeasured_routes_keep_their_configured_order():
+    router = get_router()
+
+    assert [route.provider for route in router.get_ranked_routes()] == [
+        LLMProvider.OPENAI,
+        LLMProvider.ANTHROPIC,
+    ]
+
+
+def test_slow_call_is_hedged_and_the_first_answer_wins():
+    router = get_router()
+    openai = router.routes[0]
+    for _ in range(20):
+        openai.stats.record_success(0.05)
+    fake_call = FakeCall({LLMProvider.OPENAI: 1.0, LLMProvider.ANTHROPIC: 0.05})
+
+    started_at = time.perf_counter()
+    result = asyncio.run(router.call(fake_call, hedge=True))
+    elapsed = time.perf_counter() - started_at
+
+    assert result == LLMProvider.ANTHROPIC
+    assert elapsed < 0.5
+    assert router.hedged == 1
+    assert router.hedges_won == 1
+    # The cancelled request is not counted against its route
+    assert openai.stats.error_rate == 0
+
+
+def test_calls_are_not_hedged_before_the_p95_latency_is_known():
+    router = get_router()
+    fake_call = FakeCall({LLMProvider.OPENAI: 0.1})
+
+    result = asyncio.run(router.call(fake_call, hedge=True))
+
+    assert result == LLMProvider.OPENAI
+    assert router.hedged == 0
+
+
+def test_routes_are_read_from_the_environment():
+    with (
+        patch(
+            "services.llm_client.get_llm_routes_env",
+            return_value="openai:gpt-4.1-mini, anthropic, unknown:model",
+        ),
+        patch("utils.llm_provider.get_anthropic_model_env", return_value=None),
+    ):
+        routes = get_llm_routes()
+
+    assert [route.name for route in routes] == [
+        "openai:gpt-4.1-mini",
+        "anthropic:claude-sonnet-4-20250514",
+    ]
@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import patch
+
+from constants.llm import LLM_SDK_MAX_CLIENTS_PER_PROVIDER
+from services.llm_sdk_client_registry import LLMSDKClientRegistry
+
+
+def test_clients_are_reused_for_the_same_config():
+    registry = LLMSDKClientRegistry()
+
+    openai_client = registry.get_openai_client("key-1")
+    assert registry.get_openai_client("key-1") is openai_client
+    assert registry.get_anthropic_client("key-1") is registry.get_anthropic_client(
+        "key-1"
+    )
+    assert registry.get_google_client("key-1") is registry.get_google_client("key-1")
+
+    asyncio.run(registry.close())
+
+
+def test_each_key_of_a_provider_keeps_its_client():
+    registry = LLMSDKClientRegistry()
+
+    # Like an LLM key and a DALL-E key used in turns on the OpenAI SDK
+    llm_client = registry.get_openai_client("llm-key")
+    image_client = registry.get_openai_client("image-key")
+    for _ in range(50):
+        assert registry.get_openai_client("llm-key") is llm_client
+        assert registry.get_openai_client("image-key") is image_client
+    # Custom endpoints are tracked separately from OpenAI
+    custom_client = registry.get_openai_client("llm-key", base_url="http://localhost:1")
+
+    assert registry.get_client_count() == 3
+
+    asyncio.run(registry.close())
+    assert llm_client.is_closed()
+    assert image_client.is_closed()
+    assert custom_client.is_closed()
+
+
+def test_least_recently_used_clients_are_closed_after_the_grace_period():
+    registry = LLMSDKClientRegistry()
+
+    async def run():
+        first_client = registry.get_openai_client("key-0")
+        clients = [first_client] + [
+            registry.get_openai_client(f"key-{i}") for i in range(1, 10)
+        ]
+        count_before_grace = registry.get_client_count()
+        await asyncio.sleep(0.05)
+        return clients, count_before_grace
+
+    with patch(
+        "services.llm_sdk_client_registry.LLM_SDK_STALE_CLIENT_GRACE_SECONDS", 0.01
+    ):
+        clients, count_before_grace = asyncio.run(run())
+
+    assert count_before_grace == 10
+    assert registry.get_client_count() == LLM_SDK_MAX_CLIENTS_PER_PROVIDER
+    dropped = len(clients) - LLM_SDK_MAX_CLIENTS_PER_PROVIDER
+    assert all(client.is_closed() for client in clients[:dropped])
+    assert not any(client.is_closed() for client in clients[dropped:])
+
+    asyncio.run(registry.close())
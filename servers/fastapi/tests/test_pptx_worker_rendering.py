@@ -0,0 +1,153 @@
+import asyncio
+import io
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxFillModel,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from services.executor_service import EXECUTOR_SERVICE
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def get_image_heavy_deck(images_dir: str, n_slides: int) -> PptxPresentationModel:
+    """Slides with a cover image, a rounded thumbnail, a title and a shape each"""
+    image_paths = []
+    for i, color in enumerate(["red", "green", "blue", "orange"]):
+        image_path = os.path.join(images_dir, f"image_{i}.png")
+        Image.new("RGB", (800, 450), color).save(image_path)
+        image_paths.append(image_path)
+
+    slides = []
+    for i in range(n_slides):
+        image_path = image_paths[i % len(image_paths)]
+        slides.append(
+            PptxSlideModel(
+                background=PptxFillModel(color="FFFFFF"),
+                note=f"Notes of slide {i}",
+                shapes=[
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(left=0, top=0, width=640, height=720),
+                        object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+                        picture=PptxPictureModel(is_network=False, path=image_path),
+                    ),
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(
+                            left=700, top=400, width=300, height=200
+                        ),
+                        border_radius=[24, 24, 24, 24],
+                        opacity=0.8,
+                        picture=PptxPictureModel(is_network=False, path=image_path),
+                    ),
+                    PptxTextBoxModel(
+                        position=PptxPositionModel(left=700, top=80, width=500),
+                        paragraphs=[PptxParagraphModel(text=f"Slide {i}")],
+                    ),
+                    PptxAutoShapeBoxModel(
+                        type=MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE,
+                        position=PptxPositionModel(
+                            left=700, top=250, width=400, height=100
+                        ),
+                        fill=PptxFillModel(color="000000", opacity=0.5),
+                    ),
+                ],
+            )
+        )
+    return PptxPresentationModel(name="Benchmark", slides=slides)
+
+
+async def measure_max_lag(work) -> float:
+    """Largest delay of a 10ms ticker while the work runs"""
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not done.is_set():
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - started_at - 0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    await work
+    done.set()
+    await ticker_task
+    return max_lag
+
+
+def get_shape_counts(pptx_bytes: bytes):
+    presentation = Presentation(io.BytesIO(pptx_bytes))
+    return [len(slide.shapes) for slide in presentation.slides]
+
+
+async def render_in_process(deck: PptxPresentationModel, temp_dir: str) -> bytes:
+    pptx_creator = PptxPresentationCreator(deck.model_copy(deep=True), temp_dir)
+    await pptx_creator.create_ppt()
+    return pptx_creator.get_bytes()
+
+
+async def render_in_worker(deck: PptxPresentationModel, temp_dir: str) -> bytes:
+    pptx_creator = PptxPresentationCreator(deck.model_copy(deep=True), temp_dir)
+    return await pptx_creator.create_ppt_in_worker()
+
+
+def run_with_cpu_pool(coroutine):
+    # Every picture is transformed by each render
+    try:
+        with patch.dict(os.environ, {"DISABLE_IMAGE_TRANSFORM_CACHE": "true"}):
+            return asyncio.run(coroutine)
+    finally:
+        EXECUTOR_SERVICE.shutdown()
+
+
+def test_worker_rendering_matches_in_process_rendering(tmp_path):
+    deck = get_image_heavy_deck(str(tmp_path), 3)
+
+    async def run():
+        return (
+            await render_in_process(deck, str(tmp_path)),
+            await render_in_worker(deck, str(tmp_path)),
+        )
+
+    in_process_bytes, in_worker_bytes = run_with_cpu_pool(run())
+
+    assert get_shape_counts(in_worker_bytes) == get_shape_counts(in_process_bytes)
+    assert get_shape_counts(in_worker_bytes) == [4] * 3
+
+
+@pytest.mark.benchmark
+def test_worker_rendering_keeps_the_event_loop_responsive(tmp_path):
+    deck = get_image_heavy_deck(str(tmp_path), 100)
+
+    async def run():
+        # Starts the workers of the CPU pool before measuring
+        await EXECUTOR_SERVICE.cpu.run(os.getpid)
+        in_process_lag = await measure_max_lag(
+            asyncio.ensure_future(render_in_process(deck, str(tmp_path)))
+        )
+        in_worker_lag = await measure_max_lag(
+            asyncio.ensure_future(render_in_worker(deck, str(tmp_path)))
+        )
+        return in_process_lag, in_worker_lag
+
+    in_process_lag, in_worker_lag = run_with_cpu_pool(run())
+
+    # Building the deck in process holds the loop for the whole deck
+    assert in_worker_lag < in_process_lag / 2
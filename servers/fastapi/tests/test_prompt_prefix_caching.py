@@ -0,0 +1,193 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from openai import NOT_GIVEN
+
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from models.presentation_layout import SlideLayoutModel
+from services.llm_client import LLMClient, LLMUsageTracker, estimate_llm_tokens
+from utils.llm_calls import generate_presentation_outlines, generate_slide_content
+
+
+SCHEMA = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+
+def get_llm_client(provider: LLMProvider) -> LLMClient:
+    # Skip provider client creation, only the message helpers are needed
+    llm_client = LLMClient.__new__(LLMClient)
+    llm_client.llm_provider = provider
+    return llm_client
+
+
+def test_static_prefix_is_identical_across_calls():
+    first = generate_slide_content.get_messages_with_schema(
+        SCHEMA, "# Intro", "English", tone="casual", instructions="Be brief"
+    )
+    second = generate_slide_content.get_messages_with_schema(
+        {"type": "object"}, "# Other", "French", verbosity="text-heavy"
+    )
+    batch = generate_slide_content.get_batch_messages(
+        [SlideLayoutModel(id="intro", json_schema=SCHEMA)], ["# Intro"], "English"
+    )
+    outline = generate_presentation_outlines.get_messages(
+        "AI", 5, "English", tone="funny", include_title_slide=False
+    )
+
+    assert first[0].content == second[0].content == batch[0].content
+    assert first[0].content == generate_slide_content.SYSTEM_PROMPT
+    assert outline[0].content == generate_presentation_outlines.SYSTEM_PROMPT
+    assert "casual" not in first[0].content
+    assert "casual" in first[1].content
+
+
+def test_provider_messages_keep_static_prefix_first():
+    messages = [
+        LLMSystemMessage(content="static"),
+        LLMSystemMessage(content="dynamic"),
+        LLMUserMessage(content="outline"),
+    ]
+
+    anthropic_system = get_llm_client(LLMProvider.ANTHROPIC)._get_anthropic_system(
+        messages
+    )
+    assert anthropic_system[0] == {"type": "text", "text": "static"}
+    assert anthropic_system[1] == {
+        "type": "text",
+        "text": "dynamic",
+        "cache_control": {"type": "ephemeral"},
+    }
+
+    openai_messages = get_llm_client(LLMProvider.OPENAI)._get_openai_messages(
+        messages
+    )
+    assert openai_messages == [
+        {"role": "system", "content": "static\ndynamic"},
+        {"role": "user", "content": "outline"},
+    ]
+
+
+def test_cached_anthropic_prefix_is_long_enough_to_be_cached():
+    # Text slide layout, about the smallest of the templates
+    schema = {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "minLength": 3, "maxLength": 40},
+            "description": {"type": "string", "minLength": 10, "maxLength": 150},
+        },
+        "required": ["title", "description"],
+    }
+    messages = generate_slide_content.get_messages_with_schema(
+        schema, "# Intro", "English"
+    )
+
+    anthropic_system = get_llm_client(LLMProvider.ANTHROPIC)._get_anthropic_system(
+        messages
+    )
+    breakpoint_index = next(
+        index
+        for index, block in enumerate(anthropic_system)
+        if "cache_control" in block
+    )
+    cached_prefix = [
+        LLMSystemMessage(content=block["text"])
+        for block in anthropic_system[: breakpoint_index + 1]
+    ]
+
+    # Anthropic does not cache prefixes shorter than 1024 tokens
+    assert estimate_llm_tokens(cached_prefix) >= 1024
+
+
+def test_cached_tokens_are_recorded_from_responses():
+    tracker = LLMUsageTracker()
+    anthropic_response = SimpleNamespace(
+        usage=SimpleNamespace(
+            input_tokens=100,
+            cache_read_input_tokens=900,
+            cache_creation_input_tokens=0,
+            output_tokens=50,
+        )
+    )
+    openai_response = SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=1000,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=768),
+            completion_tokens=50,
+        )
+    )
+    google_response = SimpleNamespace(
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=1000,
+            cached_content_token_count=None,
+            candidates_token_count=50,
+        )
+    )
+
+    with patch("services.llm_client.LLM_USAGE_TRACKER", tracker):
+        get_llm_client(LLMProvider.ANTHROPIC)._record_usage(anthropic_response)
+        get_llm_client(LLMProvider.OPENAI)._record_usage(openai_response)
+        get_llm_client(LLMProvider.GOOGLE)._record_usage(google_response)
+        # Responses without usage are ignored
+        get_llm_client(LLMProvider.OPENAI)._record_usage(SimpleNamespace())
+
+    metrics = tracker.get_metrics()
+    assert metrics["anthropic"]["input_tokens"] == 1000
+    assert metrics["anthropic"]["cached_input_tokens"] == 900
+    assert metrics["openai"]["cached_input_tokens"] == 768
+    assert metrics["openai"]["requests"] == 1
+    assert metrics["google"]["cached_input_tokens"] == 0
+
+
+class FakeOpenAICompletions:
+    """Streams one chunk, then the usage chunk if it was asked for"""
+
+    def __init__(self):
+        self.stream_options = []
+
+    async def create(self, stream_options=NOT_GIVEN, **kwargs):
+        self.stream_options.append(stream_options)
+
+        async def stream():
+            yield SimpleNamespace(
+                usage=None,
+                choices=[
+                    SimpleNamespace(delta=SimpleNamespace(content="{}", tool_calls=None))
+                ],
+            )
+            if stream_options is not NOT_GIVEN:
+                yield SimpleNamespace(
+                    usage=SimpleNamespace(
+                        prompt_tokens=1000,
+                        prompt_tokens_details=SimpleNamespace(cached_tokens=768),
+                        completion_tokens=5,
+                    ),
+                    choices=[],
+                )
+
+        return stream()
+
+
+def test_openai_streams_ask_for_usage_and_custom_streams_do_not():
+    tracker = LLMUsageTracker()
+    completions = FakeOpenAICompletions()
+
+    async def stream(provider: LLMProvider):
+        llm_client = get_llm_client(provider)
+        llm_client._client = SimpleNamespace(
+            chat=SimpleNamespace(completions=completions)
+        )
+        return [
+            chunk
+            async for chunk in llm_client._stream_openai(
+                model="gpt-4.1", messages=[LLMUserMessage(content="Hello")]
+            )
+        ]
+
+    with patch("services.llm_client.LLM_USAGE_TRACKER", tracker):
+        assert asyncio.run(stream(LLMProvider.OPENAI)) == ["{}"]
+        assert asyncio.run(stream(LLMProvider.CUSTOM)) == ["{}"]
+
+    assert completions.stream_options == [{"include_usage": True}, NOT_GIVEN]
+    assert tracker.get_metrics()["openai"]["cached_input_tokens"] == 768
+    assert "custom" not in tracker.get_metrics()
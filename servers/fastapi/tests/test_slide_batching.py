@@ -0,0 +1,182 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from services.llm_client import estimate_llm_tokens
+from utils.llm_calls import generate_slide_content
+
+
+SLIDE_LAYOUTS = [
+    SlideLayoutModel(
+        id=f"layout-{i}",
+        json_schema={
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "maxLength": 60},
+                "bulletPoints": {
+                    "type": "array",
+                    "items": {"type": "string", "maxLength": 120},
+                    "maxItems": 4,
+                },
+            },
+            "required": ["title", "bulletPoints"],
+        },
+    )
+    for i in range(3)
+]
+
+
+def get_outlines(n_slides: int):
+    return [
+        SlideOutlineModel(content=f"# Topic {i}\n- Point A of topic {i}\n- Point B")
+        for i in range(n_slides)
+    ]
+
+
+class FakeLLM:
+    """Fake LLM with a fixed per-request overhead and a per-slide generation time"""
+
+    def __init__(self, request_latency=0.03, slide_latency=0.005, drop_slides=()):
+        self.request_latency = request_latency
+        self.slide_latency = slide_latency
+        self.drop_slides = drop_slides
+        self.calls = 0
+        self.input_tokens = 0
+
+    def _content(self, outline: str) -> dict:
+        return {"title": outline.splitlines()[0][2:], "bulletPoints": ["Point A"]}
+
+    async def generate(self, model, messages, max_tokens=None):
+        self.calls += 1
+        self.input_tokens += estimate_llm_tokens(messages)
+        await asyncio.sleep(self.request_latency + self.slide_latency)
+        outline = messages[-1].content.split("(USE THIS CONTENT ONLY)")[1]
+        return json.dumps(self._content(outline.strip()))
+
+    async def generate_structured(self, model, messages, response_format, max_tokens=None):
+        self.calls += 1
+        self.input_tokens += estimate_llm_tokens(messages, response_format=response_format)
+        keys = response_format["required"]
+        await asyncio.sleep(self.request_latency + self.slide_latency * len(keys))
+        outlines = messages[-1].content.split("### ")[1:]
+        return {
+            key: self._content(outline.split("\n", 1)[1].strip())
+            for key, outline in zip(keys, outlines)
+            if key not in self.drop_slides
+        }
+
+
+def run_with_fake_llm(fake_llm: FakeLLM, coroutine_factory):
+    with (
+        patch.multiple(
+            generate_slide_content,
+            improved_llm_client=SimpleNamespace(llm_client=fake_llm),
+        ),
+        patch.dict("os.environ", {"LLM": "openai", "OPENAI_MODEL": "fake-model"}),
+    ):
+        return asyncio.run(coroutine_factory())
+
+
+def generate_per_slide(n_slides: int, concurrency: int):
+    outlines = get_outlines(n_slides)
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(i):
+            async with semaphore:
+                return await generate_slide_content.get_slide_content_from_type_and_outline(
+                    SLIDE_LAYOUTS[i % 3], outlines[i], "English", use_cache=False
+                )
+
+        return await asyncio.gather(*[generate(i) for i in range(n_slides)])
+
+    return run
+
+
+def generate_batched(n_slides: int, batch_size: int, concurrency: int):
+    outlines = get_outlines(n_slides)
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(start):
+            indices = range(start, min(start + batch_size, n_slides))
+            async with semaphore:
+                return await generate_slide_content.get_slides_content_from_types_and_outlines(
+                    [SLIDE_LAYOUTS[i % 3] for i in indices],
+                    [outlines[i] for i in indices],
+                    "English",
+                    use_cache=False,
+                )
+
+        batches = await asyncio.gather(
+            *[generate(start) for start in range(0, n_slides, batch_size)]
+        )
+        return [content for batch in batches for content in batch]
+
+    return run
+
+
+def test_batch_returns_slides_in_order():
+    contents = run_with_fake_llm(FakeLLM(), generate_batched(5, 5, 1))
+    assert [each["title"] for each in contents] == [f"Topic {i}" for i in range(5)]
+
+
+def test_invalid_batch_items_fall_back_to_per_slide_calls():
+    fake_llm = FakeLLM(drop_slides=("slide_2",))
+    contents = run_with_fake_llm(fake_llm, generate_batched(3, 3, 1))
+
+    assert [each["title"] for each in contents] == ["Topic 0", "Topic 1", "Topic 2"]
+    # One batched call and one retry for the dropped slide
+    assert fake_llm.calls == 2
+
+
+def test_failed_batch_falls_back_to_per_slide_calls():
+    fake_llm = FakeLLM()
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("invalid JSON")
+
+    fake_llm.generate_structured = fail
+    contents = run_with_fake_llm(fake_llm, generate_batched(3, 3, 1))
+
+    assert [each["title"] for each in contents] == ["Topic 0", "Topic 1", "Topic 2"]
+    assert fake_llm.calls == 3
+
+
+def test_batching_sends_fewer_calls_and_input_tokens():
+    n_slides = 24
+    batch_size = 4
+
+    per_slide_llm = FakeLLM(request_latency=0, slide_latency=0)
+    run_with_fake_llm(per_slide_llm, generate_per_slide(n_slides, 4))
+    batched_llm = FakeLLM(request_latency=0, slide_latency=0)
+    run_with_fake_llm(batched_llm, generate_batched(n_slides, batch_size, 4))
+
+    assert per_slide_llm.calls == n_slides
+    assert batched_llm.calls == n_slides // batch_size
+    assert batched_llm.input_tokens < per_slide_llm.input_tokens / 2
+
+
+@pytest.mark.benchmark
+def test_benchmark_batched_vs_per_slide_generation():
+    n_slides = 24
+    batch_size = 4
+    concurrency = 4
+
+    started_at = time.perf_counter()
+    run_with_fake_llm(FakeLLM(), generate_per_slide(n_slides, concurrency))
+    per_slide_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    run_with_fake_llm(FakeLLM(), generate_batched(n_slides, batch_size, concurrency))
+    batched_time = time.perf_counter() - started_at
+
+    assert batched_time < per_slide_time
@@ -0,0 +1,210 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from services.slide_content_cache_service import SlideContentCacheService
+from utils.llm_calls import generate_slide_content
+from utils.llm_calls.improved_llm_client import ImprovedLLMClient
+
+
+class FakeLLMCacheCRUD:
+    def __init__(self):
+        self.entries = {}
+
+    async def get_entry(self, key):
+        return self.entries.get(key)
+
+    async def set_entry(self, key, value, ttl_seconds):
+        self.entries[key] = value
+
+
+SCHEMA = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+
+def test_key_ignores_whitespace_around_lines_and_case_differences():
+    cache = SlideContentCacheService()
+    key = cache.get_key("gpt-4.1", SCHEMA, "# Intro\n- Hello world", "English")
+
+    assert key == cache.get_key(
+        "gpt-4.1", SCHEMA, "  # Intro  \n   - Hello world \n", "english"
+    )
+    assert key != cache.get_key("gpt-4.1", SCHEMA, "# Intro Hello", "English")
+    assert key != cache.get_key("gpt-4.1-mini", SCHEMA, "# Intro\n- Hello world", "English")
+
+
+def test_key_keeps_the_markdown_structure():
+    cache = SlideContentCacheService()
+
+    as_list = cache.get_key("gpt-4.1", SCHEMA, "# Intro\n- A\n- B", "English")
+    as_paragraph = cache.get_key("gpt-4.1", SCHEMA, "# Intro - A - B", "English")
+
+    assert as_list != as_paragraph
+
+
+def test_key_changes_with_the_prompt_version():
+    cache = SlideContentCacheService()
+    key = cache.get_key("gpt-4.1", SCHEMA, "# Intro", "English")
+
+    with patch(
+        "services.slide_content_cache_service.SLIDE_CONTENT_PROMPT_VERSION", 2
+    ):
+        assert cache.get_key("gpt-4.1", SCHEMA, "# Intro", "English") != key
+
+
+def test_memory_tier_is_lru_and_falls_back_to_mongo():
+    fake_crud = FakeLLMCacheCRUD()
+    with (
+        patch("services.slide_content_cache_service.llm_cache_crud", fake_crud),
+        patch.dict("os.environ", {"SLIDE_CONTENT_CACHE_SIZE": "2"}),
+    ):
+        cache = SlideContentCacheService()
+
+        async def run():
+            for key in ["a", "b", "c"]:
+                await cache.set(key, {"title": key})
+            # "a" was evicted from memory but is still in MongoDB
+            assert list(cache._entries.keys()) == ["b", "c"]
+            assert await cache.get("a") == {"title": "a"}
+            assert await cache.get("c") == {"title": "c"}
+            assert await cache.get("missing") is None
+
+        asyncio.run(run())
+
+    metrics = cache.get_metrics()
+    assert metrics["memory_hits"] == 1
+    assert metrics["mongo_hits"] == 1
+    assert metrics["misses"] == 1
+
+
+def test_expired_memory_entries_are_misses():
+    fake_crud = FakeLLMCacheCRUD()
+    with (
+        patch("services.slide_content_cache_service.llm_cache_crud", fake_crud),
+        patch("services.slide_content_cache_service.time") as fake_time,
+        patch.dict("os.environ", {"SLIDE_CONTENT_CACHE_TTL_SECONDS": "60"}),
+    ):
+        cache = SlideContentCacheService()
+
+        async def run():
+            fake_time.monotonic.return_value = 1000
+            await cache.set("key", {"title": "Intro"})
+            # Expired in MongoDB as well
+            fake_crud.entries.clear()
+            fake_time.monotonic.return_value = 1059
+            assert await cache.get("key") == {"title": "Intro"}
+            fake_time.monotonic.return_value = 1061
+            assert await cache.get("key") is None
+
+        asyncio.run(run())
+
+    assert "key" not in cache._entries
+    assert cache.get_metrics()["misses"] == 1
+
+
+def test_cached_values_are_copied():
+    with patch(
+        "services.slide_content_cache_service.llm_cache_crud", FakeLLMCacheCRUD()
+    ):
+        cache = SlideContentCacheService()
+
+        async def run():
+            content = {"title": "Intro"}
+            await cache.set("key", content)
+            content["title"] = "Changed"
+            cached = await cache.get("key")
+            cached["title"] = "Changed again"
+            return await cache.get("key")
+
+        assert asyncio.run(run()) == {"title": "Intro"}
+
+
+def test_cache_hit_skips_llm_call_and_opt_out_bypasses_it():
+    slide_layout = SlideLayoutModel(id="intro", json_schema=SCHEMA)
+    outline = SlideOutlineModel(content="# Intro")
+    cache = SlideContentCacheService()
+    generate = AsyncMock(return_value={"title": "Intro"})
+
+    with (
+        patch.object(generate_slide_content, "SLIDE_CONTENT_CACHE_SERVICE", cache),
+        patch("services.slide_content_cache_service.llm_cache_crud", FakeLLMCacheCRUD()),
+        patch.object(
+            generate_slide_content,
+            "_generate_slide_content_from_type_and_outline",
+            generate,
+        ),
+        patch.object(generate_slide_content, "get_model", return_value="gpt-4.1"),
+    ):
+
+        async def run():
+            await generate_slide_content.get_slide_content_from_type_and_outline(
+                slide_layout, outline, "English"
+            )
+            cached = await generate_slide_content.get_slide_content_from_type_and_outline(
+                slide_layout, outline, "English"
+            )
+            await generate_slide_content.get_slide_content_from_type_and_outline(
+                slide_layout, outline, "English", use_cache=False
+            )
+            return cached
+
+        cached = asyncio.run(run())
+
+    assert cached == {"title": "Intro"}
+    assert generate.await_count == 2
+
+
+class FailingLLMClient:
+    llm_provider = SimpleNamespace(value="openai")
+
+    def stream_structured(self, **kwargs):
+        return self.stream()
+
+    async def stream(self):
+        raise HTTPException(status_code=503, detail="LLM unavailable")
+        yield
+
+    async def generate(self, **kwargs):
+        raise HTTPException(status_code=503, detail="LLM unavailable")
+
+    async def generate_slide_content(self, **kwargs):
+        raise HTTPException(status_code=503, detail="LLM unavailable")
+
+
+def test_fallback_content_of_a_failing_provider_is_not_cached():
+    slide_layout = SlideLayoutModel(id="intro", json_schema=SCHEMA)
+    outline = SlideOutlineModel(content="# Intro")
+    fake_crud = FakeLLMCacheCRUD()
+    cache = SlideContentCacheService()
+    failing_improved_llm_client = ImprovedLLMClient()
+    failing_improved_llm_client._llm_client = FailingLLMClient()
+
+    async def stream():
+        async for _ in generate_slide_content.stream_slide_content_from_type_and_outline(
+            slide_layout, outline, "English"
+        ):
+            pass
+
+    with (
+        patch.object(generate_slide_content, "SLIDE_CONTENT_CACHE_SERVICE", cache),
+        patch("services.slide_content_cache_service.llm_cache_crud", fake_crud),
+        patch.object(
+            generate_slide_content, "improved_llm_client", failing_improved_llm_client
+        ),
+        patch.dict("os.environ", {"LLM": "openai", "OPENAI_MODEL": "gpt-4.1"}),
+    ):
+        with pytest.raises(HTTPException):
+            asyncio.run(
+                generate_slide_content.get_slide_content_from_type_and_outline(
+                    slide_layout, outline, "English"
+                )
+            )
+        with pytest.raises(HTTPException):
+            asyncio.run(stream())
+
+    assert fake_crud.entries == {}
+    assert len(cache._entries) == 0
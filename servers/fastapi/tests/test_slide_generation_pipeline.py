@@ -0,0 +1,163 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from utils.async_iterator import map_in_order, map_in_order_with_progress
+
+
+class FakeLLM:
+    """Fake slide content generator with injected latency"""
+
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_slide_content(self, index: int) -> dict:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latencies[index])
+            return {"title": f"Slide {index}"}
+        finally:
+            self.in_flight -= 1
+
+
+def test_results_are_yielded_in_slide_order():
+    fake_llm = FakeLLM([0.05, 0.01, 0.03, 0.0, 0.02])
+
+    async def run():
+        return [
+            each
+            async for each in map_in_order(
+                fake_llm.generate_slide_content, range(5), concurrency=5
+            )
+        ]
+
+    results = asyncio.run(run())
+    assert [each["title"] for each in results] == [f"Slide {i}" for i in range(5)]
+
+
+def test_concurrency_is_bounded_per_call_and_globally():
+    fake_llm = FakeLLM([0.01] * 20)
+
+    async def run():
+        global_semaphore = asyncio.Semaphore(3)
+        return [
+            each
+            async for each in map_in_order(
+                fake_llm.generate_slide_content,
+                range(20),
+                concurrency=5,
+                semaphore=global_semaphore,
+            )
+        ]
+
+    asyncio.run(run())
+    assert fake_llm.max_in_flight == 3
+
+
+def test_first_result_is_emitted_before_slow_slides_finish():
+    fake_llm = FakeLLM([0.0, 0.3, 0.3])
+
+    async def run():
+        async for each in map_in_order(
+            fake_llm.generate_slide_content, range(3), concurrency=3
+        ):
+            return each, fake_llm.in_flight
+
+    first, in_flight = asyncio.run(run())
+    assert first == {"title": "Slide 0"}
+    # The slow slides are still being generated
+    assert in_flight == 2
+
+
+def test_error_cancels_pending_slides():
+    completed = []
+
+    async def generate_slide_content(index: int):
+        if index == 1:
+            raise ValueError("LLM failed")
+        if index > 1:
+            await asyncio.sleep(0.2)
+        completed.append(index)
+
+    async def run():
+        async for _ in map_in_order(generate_slide_content, range(4), concurrency=4):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert completed == [0]
+
+
+def test_slides_are_generated_concurrently_up_to_the_limit():
+    fake_llm = FakeLLM([0.01] * 20)
+
+    async def run():
+        return [
+            each
+            async for each in map_in_order(
+                fake_llm.generate_slide_content, range(20), concurrency=5
+            )
+        ]
+
+    results = asyncio.run(run())
+    assert fake_llm.max_in_flight == 5
+    assert len(results) == 20
+
+
+@pytest.mark.benchmark
+def test_benchmark_pipelined_vs_sequential_generation():
+    n_slides = 20
+    concurrency = 5
+    rng = random.Random(7)
+    latencies = [rng.uniform(0.02, 0.06) for _ in range(n_slides)]
+    fake_llm = FakeLLM(latencies)
+
+    async def sequential():
+        return [await fake_llm.generate_slide_content(i) for i in range(n_slides)]
+
+    async def pipelined():
+        return [
+            each
+            async for each in map_in_order(
+                fake_llm.generate_slide_content, range(n_slides), concurrency
+            )
+        ]
+
+    started_at = time.perf_counter()
+    asyncio.run(sequential())
+    sequential_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    asyncio.run(pipelined())
+    pipelined_time = time.perf_counter() - started_at
+
+    # Sum of latencies vs. roughly sum / concurrency (bounded by the slowest slide)
+    assert sequential_time >= sum(latencies)
+    assert pipelined_time < sequential_time / 2
+
+
+def test_progress_is_forwarded_before_earlier_slides_finish():
+    async def generate_slide_content(index: int, report_progress):
+        await asyncio.sleep(0.05 if index == 0 else 0)
+        report_progress(f"partial {index}")
+        return f"Slide {index}"
+
+    async def run():
+        return [
+            each
+            async for each in map_in_order_with_progress(
+                generate_slide_content, range(2), concurrency=2
+            )
+        ]
+
+    events = asyncio.run(run())
+    assert events[0] == (1, "partial 1", False)
+    assert [each for each in events if each[2]] == [
+        (0, "Slide 0", True),
+        (1, "Slide 1", True),
+    ]
@@ -0,0 +1,150 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from utils.llm_calls import generate_slide_content
+from utils.llm_calls.improved_llm_client import ImprovedLLMClient
+
+
+SLIDE_LAYOUT = SlideLayoutModel(
+    id="basic-info-slide",
+    json_schema={
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "maxLength": 20},
+            "description": {"type": "string"},
+        },
+    },
+)
+OUTLINE = SlideOutlineModel(content="# Market Size\nThe market grows 20% a year")
+
+
+class FlakyStream:
+    """Fails the first `failures` calls, then streams a chunk and the content"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.models = []
+
+    def __call__(self, *args):
+        self.models.append(args[-1])
+        return self.stream(len(self.models))
+
+    async def stream(self, call):
+        yield '{"title": "Mar'
+        if call <= self.failures:
+            raise HTTPException(status_code=503, detail="LLM unavailable")
+        yield {"title": "Market Size"}
+
+
+class FailingLLMClient:
+    """Provider whose every call fails, streamed or not"""
+
+    llm_provider = SimpleNamespace(value="openai")
+
+    def __init__(self):
+        self.stream_models = []
+
+    def stream_structured(self, model, messages, response_format):
+        self.stream_models.append(model)
+        return self.stream()
+
+    async def stream(self):
+        raise HTTPException(status_code=503, detail="LLM unavailable")
+        yield
+
+    async def generate(self, **kwargs):
+        raise HTTPException(status_code=503, detail="LLM unavailable")
+
+    async def generate_slide_content(self, **kwargs):
+        raise HTTPException(status_code=503, detail="LLM unavailable")
+
+
+def get_failing_improved_llm_client() -> ImprovedLLMClient:
+    failing_improved_llm_client = ImprovedLLMClient()
+    failing_improved_llm_client._llm_client = FailingLLMClient()
+    return failing_improved_llm_client
+
+
+def collect(fake_stream=None, max_retries="2", fallback_model="backup-model"):
+    async def run():
+        items = []
+        async for each in generate_slide_content.stream_slide_content_with_retries(
+            SLIDE_LAYOUT, OUTLINE, "English", use_cache=False
+        ):
+            items.append(each)
+        return items
+
+    with (
+        patch.object(
+            generate_slide_content,
+            "stream_slide_content_from_type_and_outline",
+            fake_stream or generate_slide_content.stream_slide_content_from_type_and_outline,
+        ),
+        patch.dict("os.environ", {"LLM": "openai", "OPENAI_MODEL": "fake-model"}),
+        patch.object(
+            generate_slide_content,
+            "get_slide_generation_retry_delay_seconds",
+            return_value=0,
+        ),
+        patch(
+            "utils.slide_generation_utils.get_slide_generation_max_retries_env",
+            return_value=max_retries,
+        ),
+        patch(
+            "utils.slide_generation_utils.get_slide_generation_fallback_model_env",
+            return_value=fallback_model,
+        ),
+    ):
+        return asyncio.run(run())
+
+
+def test_failed_slide_is_retried_and_last_retry_uses_the_fallback_model():
+    fake_stream = FlakyStream(failures=2)
+
+    items = collect(fake_stream)
+
+    assert items[-1] == {"title": "Market Size"}
+    assert fake_stream.models == [None, None, "backup-model"]
+
+
+def test_failing_provider_counts_as_a_failure():
+    failing_improved_llm_client = get_failing_improved_llm_client()
+
+    with patch.object(
+        generate_slide_content, "improved_llm_client", failing_improved_llm_client
+    ):
+        with pytest.raises(HTTPException) as error:
+            collect()
+
+    # The non-streaming fallback failed as well instead of filling in defaults
+    assert "LLM unavailable" in error.value.detail
+    assert failing_improved_llm_client.llm_client.stream_models == [
+        "fake-model",
+        "fake-model",
+        "backup-model",
+    ]
+
+
+def test_last_error_is_raised_once_retries_are_used_up():
+    fake_stream = FlakyStream(failures=5)
+
+    with pytest.raises(HTTPException):
+        collect(fake_stream, max_retries="1", fallback_model=None)
+    assert fake_stream.models == [None, None]
+
+
+def test_failed_slide_placeholder_keeps_the_outline_title():
+    content = generate_slide_content.get_failed_slide_content(
+        SLIDE_LAYOUT, OUTLINE, "LLM unavailable"
+    )
+
+    assert content["title"] == "Market Size"
+    assert "description" in content
+    assert content["error"] == "LLM unavailable"
+    assert content[generate_slide_content.FAILED_SLIDE_KEY] is True
@@ -0,0 +1,171 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from models.presentation_structure_model import PresentationStructureModel
+from services.speculative_layout_selector import (
+    SpeculativeLayoutMetrics,
+    SpeculativeLayoutSelector,
+)
+
+
+LAYOUT = PresentationLayoutModel(
+    name="general",
+    slides=[
+        SlideLayoutModel(id=f"layout-{i}", json_schema={"type": "object"})
+        for i in range(3)
+    ],
+)
+
+
+class FakeStructureGenerator:
+    """
+    Picks `len(content) % 3` for every slide and records the size of each call.
+    Latency grows with the number of slides, like the output of a real call.
+    `events` records when calls start among the streamed outlines.
+    """
+
+    def __init__(self, latency=0.05, slide_latency=0.02, fail_first_call=False):
+        self.latency = latency
+        self.slide_latency = slide_latency
+        self.fail_first_call = fail_first_call
+        self.calls = []
+        self.instructions = []
+        self.events = []
+
+    async def __call__(self, presentation_outline, instructions=None, slide_offset=0):
+        n_slides = len(presentation_outline.slides)
+        self.calls.append(n_slides)
+        self.events.append(("pick", n_slides))
+        self.instructions.append(instructions)
+        should_fail = self.fail_first_call and len(self.calls) == 1
+        await asyncio.sleep(self.latency + self.slide_latency * n_slides)
+        if should_fail:
+            raise RuntimeError("rate limited")
+        return PresentationStructureModel(
+            slides=[len(each.content) % 3 for each in presentation_outline.slides]
+        )
+
+
+def get_outlines(n_slides: int):
+    return [SlideOutlineModel(content="x" * (i + 1)) for i in range(n_slides)]
+
+
+def run_selector(fake_generator, stream_outlines, final_outlines, chunk_size=2):
+    metrics = SpeculativeLayoutMetrics()
+
+    async def run():
+        selector = SpeculativeLayoutSelector(LAYOUT, chunk_size=chunk_size)
+        for i, outline in enumerate(stream_outlines):
+            fake_generator.events.append(("outline", i))
+            selector.add_outline(outline)
+            # Outline tokens keep streaming while the picks are made
+            await asyncio.sleep(0.03)
+        return await selector.reconcile(
+            PresentationOutlineModel(slides=final_outlines)
+        )
+
+    with (
+        patch.object(SpeculativeLayoutSelector, "_generate_structure", fake_generator),
+        patch(
+            "services.speculative_layout_selector.SPECULATIVE_LAYOUT_METRICS", metrics
+        ),
+    ):
+        structure = asyncio.run(run())
+    return structure, metrics.get_metrics()
+
+
+def test_picks_are_kept_when_outlines_do_not_change():
+    fake_generator = FakeStructureGenerator()
+    outlines = get_outlines(5)
+
+    structure, metrics = run_selector(fake_generator, outlines, outlines)
+
+    assert structure.slides == [1, 2, 0, 1, 2]
+    # Chunks of 2, 2 and the remaining 1
+    assert fake_generator.calls == [2, 2, 1]
+    assert fake_generator.instructions[0] is None
+    assert "from slide 3" in fake_generator.instructions[1]
+    assert metrics["kept_rate"] == 1
+    assert metrics["redo_calls"] == 0
+
+
+def test_changed_and_missing_outlines_are_redone():
+    fake_generator = FakeStructureGenerator()
+    outlines = get_outlines(4)
+    final_outlines = [
+        outlines[0],
+        SlideOutlineModel(content="changed"),
+        outlines[2],
+        outlines[3],
+        SlideOutlineModel(content="extra"),
+    ]
+
+    structure, metrics = run_selector(fake_generator, outlines, final_outlines)
+
+    assert structure.slides == [1, len("changed") % 3, 0, 1, len("extra") % 3]
+    # One redo call over the whole deck
+    assert fake_generator.calls[-1] == 5
+    assert metrics["kept"] == 3
+    assert metrics["redo_calls"] == 1
+
+
+def test_failed_chunks_are_redone():
+    fake_generator = FakeStructureGenerator(fail_first_call=True)
+    outlines = get_outlines(4)
+
+    structure, metrics = run_selector(fake_generator, outlines, outlines)
+
+    assert structure.slides == [1, 2, 0, 1]
+    assert metrics["kept"] == 2
+
+
+def test_layouts_are_picked_while_outlines_stream():
+    fake_generator = FakeStructureGenerator()
+    outlines = get_outlines(8)
+
+    run_selector(fake_generator, outlines, outlines)
+
+    # Each chunk is picked as soon as its outlines have streamed
+    assert fake_generator.events == [
+        ("outline", 0),
+        ("outline", 1),
+        ("pick", 2),
+        ("outline", 2),
+        ("outline", 3),
+        ("pick", 2),
+        ("outline", 4),
+        ("outline", 5),
+        ("pick", 2),
+        ("outline", 6),
+        ("outline", 7),
+        ("pick", 2),
+    ]
+
+
+@pytest.mark.benchmark
+def test_speculation_takes_layout_selection_off_the_critical_path():
+    outlines = get_outlines(8)
+
+    async def sequential():
+        # Outlines stream first, then the layouts of the whole deck are picked
+        for _ in outlines:
+            await asyncio.sleep(0.03)
+        await FakeStructureGenerator()(PresentationOutlineModel(slides=outlines))
+
+    started_at = time.perf_counter()
+    asyncio.run(sequential())
+    sequential_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    run_selector(FakeStructureGenerator(), outlines, outlines)
+    speculative_time = time.perf_counter() - started_at
+
+    assert speculative_time < sequential_time
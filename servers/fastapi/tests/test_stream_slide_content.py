@@ -0,0 +1,67 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from utils.llm_calls import generate_slide_content
+
+
+SLIDE_LAYOUT = SlideLayoutModel(
+    id="intro",
+    json_schema={
+        "type": "object",
+        "properties": {"title": {"type": "string"}, "body": {"type": "string"}},
+        "required": ["title", "body"],
+    },
+)
+OUTLINE = SlideOutlineModel(content="# Intro")
+
+
+def get_fake_improved_llm_client(chunks, error=None):
+    async def stream_structured(**kwargs):
+        for chunk in chunks:
+            yield chunk
+        if error:
+            raise error
+
+    fake = MagicMock()
+    fake.llm_client.stream_structured = stream_structured
+    return fake
+
+
+def collect(**patches):
+    async def run():
+        return [
+            each
+            async for each in generate_slide_content.stream_slide_content_from_type_and_outline(
+                SLIDE_LAYOUT, OUTLINE, "English", use_cache=False
+            )
+        ]
+
+    with patch.multiple(generate_slide_content, get_model=lambda: "gpt-4.1", **patches):
+        return asyncio.run(run())
+
+
+def test_partial_chunks_are_yielded_before_validated_content():
+    content = json.dumps({"title": "Intro", "body": "Hello"})
+    chunks = [content[:10], content[10:20], content[20:]]
+
+    events = collect(improved_llm_client=get_fake_improved_llm_client(chunks))
+
+    assert events[:-1] == chunks
+    assert events[-1] == {"title": "Intro", "body": "Hello"}
+
+
+def test_failed_stream_falls_back_to_complete_generation():
+    fallback = AsyncMock(return_value={"title": "Intro", "body": "Fallback"})
+
+    events = collect(
+        improved_llm_client=get_fake_improved_llm_client(
+            ['{"title": "In'], error=RuntimeError("connection reset")
+        ),
+        _generate_slide_content_from_type_and_outline=fallback,
+    )
+
+    assert events == ['{"title": "In', {"title": "Intro", "body": "Fallback"}]
+    assert fallback.await_count == 1
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from utils.streaming_json_parser import StreamingJsonParser, parse_first_json_object
+
+
+OUTLINES = {
+    "title": "Quarterly {review}",
+    "slides": [
+        {"content": "# Intro\nBraces } and \"quotes\" in text"},
+        {"content": "# Results", "notes": {"items": [1, 2]}},
+        {"content": "# Next steps"},
+    ],
+}
+
+
+def feed_in_chunks(parser: StreamingJsonParser, text: str, size: int):
+    completed_at = []
+    for start in range(0, len(text), size):
+        for item in parser.feed(text[start : start + size]):
+            completed_at.append((start + size, item))
+    return completed_at
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, 10_000])
+def test_slides_are_emitted_as_soon_as_they_close(chunk_size):
+    text = "```json\n" + json.dumps(OUTLINES) + "\n```"
+    parser = StreamingJsonParser(array_key="slides")
+
+    completed_at = feed_in_chunks(parser, text, chunk_size)
+
+    assert [item for _, item in completed_at] == OUTLINES["slides"]
+    assert parser.is_complete
+    assert json.loads(parser.root_text) == OUTLINES
+    if chunk_size == 1:
+        # First slide is available long before the stream ends
+        first_slide_end = text.index('in text"}') + len('in text"}')
+        assert completed_at[0][0] == first_slide_end
+
+
+def test_incomplete_stream_keeps_finished_slides():
+    text = json.dumps(OUTLINES)
+    parser = StreamingJsonParser(array_key="slides")
+
+    parser.feed(text[: text.index("# Next steps")])
+
+    assert parser.items == OUTLINES["slides"][:2]
+    assert not parser.is_complete
+    assert parser.root_text is None
+
+
+def test_parse_first_json_object_ignores_surrounding_text():
+    response = 'Here it is: {"title": "A } B", "items": [{"x": 1}]} Hope it helps {}'
+    assert parse_first_json_object(response) == {
+        "title": "A } B",
+        "items": [{"x": 1}],
+    }
+
+    with pytest.raises(ValueError):
+        parse_first_json_object("no json here")
+
+
+def test_brackets_before_the_object_are_ignored():
+    response = 'Here are [3] slides: {"slides": [{"content": "# Intro"}]}'
+
+    assert parse_first_json_object(response) == {"slides": [{"content": "# Intro"}]}
+
+    parser = StreamingJsonParser(array_key="slides")
+    assert parser.feed(response) == [{"content": "# Intro"}]
+    assert parser.is_complete
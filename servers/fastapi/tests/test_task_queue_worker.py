@@ -0,0 +1,286 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from models.mongo.task import Task, TaskInDB, TaskStatus, TaskType
+from services.task_queue_worker import TaskQueueWorker
+
+
+class FakeTaskCRUD:
+    """In-memory version of the job queue methods of TaskCRUD"""
+
+    def __init__(self):
+        self.tasks = {}
+        self.heartbeats = 0
+        self.revoked = set()
+        # Tasks whose worker hangs, their lease expires on the first heartbeat
+        self.hanging = set()
+
+    def enqueue(self, task_id: str, user_id: str, max_attempts: int = 3):
+        now = datetime.utcnow()
+        self.tasks[task_id] = TaskInDB(
+            id=task_id,
+            user_id=user_id,
+            task_type=TaskType.PRESENTATION_GENERATION,
+            payload={"n": task_id},
+            max_attempts=max_attempts,
+            available_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+
+    async def claim_task(self, task_type, worker_id, lease_seconds, per_user_limit):
+        running_by_user = {}
+        for task in self.tasks.values():
+            if task.status == TaskStatus.RUNNING:
+                running_by_user[task.user_id] = running_by_user.get(task.user_id, 0) + 1
+        for task in self.tasks.values():
+            if (
+                task.status == TaskStatus.PENDING
+                and task.available_at <= datetime.utcnow()
+                and running_by_user.get(task.user_id, 0) < per_user_limit
+            ):
+                task.status = TaskStatus.RUNNING
+                task.worker_id = worker_id
+                task.lease_expires_at = datetime.utcnow() + timedelta(
+                    seconds=lease_seconds
+                )
+                task.attempts += 1
+                return task.model_copy()
+        return None
+
+    async def heartbeat_task(self, task_id, worker_id, lease_seconds):
+        self.heartbeats += 1
+        if task_id in self.hanging:
+            self.tasks[task_id].lease_expires_at = datetime.utcnow() - timedelta(
+                seconds=1
+            )
+            return False
+        return task_id not in self.revoked
+
+    async def get_tasks_with_expired_lease(self, task_type, limit=100):
+        return [
+            task.model_copy()
+            for task in self.tasks.values()
+            if task.status == TaskStatus.RUNNING
+            and task.lease_expires_at < datetime.utcnow()
+        ]
+
+    async def expire_lease(self, task_id, error, retry_delay_seconds=None):
+        task = self.tasks[task_id]
+        task.error = error
+        task.lease_expires_at = None
+        if retry_delay_seconds is None:
+            task.status = TaskStatus.FAILED
+        else:
+            task.status = TaskStatus.PENDING
+            task.available_at = datetime.utcnow()
+        return True
+
+    async def release_task(self, task_id, worker_id):
+        task = self.tasks[task_id]
+        task.status = TaskStatus.PENDING
+        task.attempts -= 1
+
+    async def complete_task(self, task_id, worker_id, result=None):
+        self.tasks[task_id].status = TaskStatus.COMPLETED
+        self.tasks[task_id].result = result
+
+    async def fail_task(self, task_id, worker_id, error, retry_delay_seconds=None):
+        task = self.tasks[task_id]
+        task.error = error
+        if retry_delay_seconds is None:
+            task.status = TaskStatus.FAILED
+        else:
+            task.status = TaskStatus.PENDING
+            task.available_at = datetime.utcnow()
+
+
+def get_worker(handler, **kwargs):
+    return TaskQueueWorker(
+        TaskType.PRESENTATION_GENERATION,
+        handler,
+        concurrency=kwargs.pop("concurrency", 4),
+        per_user_limit=kwargs.pop("per_user_limit", 2),
+        lease_seconds=60,
+        heartbeat_seconds=kwargs.pop("heartbeat_seconds", 0.01),
+        poll_seconds=0.01,
+        **kwargs,
+    )
+
+
+async def run_until(fake_crud, worker, condition, timeout=2):
+    worker.start()
+    started_at = time.perf_counter()
+    while not condition() and time.perf_counter() - started_at < timeout:
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+
+def test_tasks_run_concurrently_within_the_per_user_limit():
+    fake_crud = FakeTaskCRUD()
+    for i in range(4):
+        fake_crud.enqueue(f"a{i}", "user-a")
+    fake_crud.enqueue("b0", "user-b")
+
+    running_by_user = {}
+    max_running_by_user = {}
+
+    async def handler(task):
+        running_by_user[task.user_id] = running_by_user.get(task.user_id, 0) + 1
+        max_running_by_user[task.user_id] = max(
+            max_running_by_user.get(task.user_id, 0), running_by_user[task.user_id]
+        )
+        await asyncio.sleep(0.05)
+        running_by_user[task.user_id] -= 1
+        return {"done": task.id}
+
+    worker = get_worker(handler)
+    with patch("services.task_queue_worker.task_crud", fake_crud):
+        asyncio.run(
+            run_until(
+                fake_crud,
+                worker,
+                lambda: all(
+                    task.status == TaskStatus.COMPLETED
+                    for task in fake_crud.tasks.values()
+                ),
+            )
+        )
+
+    assert all(task.status == TaskStatus.COMPLETED for task in fake_crud.tasks.values())
+    assert fake_crud.tasks["a0"].result == {"done": "a0"}
+    assert max_running_by_user == {"user-a": 2, "user-b": 1}
+    assert fake_crud.heartbeats > 0
+
+
+def test_failed_tasks_are_retried_until_max_attempts():
+    fake_crud = FakeTaskCRUD()
+    fake_crud.enqueue("flaky", "user-a", max_attempts=3)
+    fake_crud.enqueue("broken", "user-a", max_attempts=2)
+    attempts = {}
+    failed = []
+
+    async def handler(task):
+        attempts[task.id] = attempts.get(task.id, 0) + 1
+        if task.id == "broken" or attempts[task.id] < 2:
+            raise RuntimeError("LLM unavailable")
+        return {}
+
+    async def on_failed(task, e):
+        failed.append(task.id)
+
+    worker = get_worker(handler, on_failed=on_failed)
+    with (
+        patch("services.task_queue_worker.task_crud", fake_crud),
+        patch("services.task_queue_worker.get_retry_delay_seconds", return_value=0),
+    ):
+        asyncio.run(
+            run_until(
+                fake_crud,
+                worker,
+                lambda: fake_crud.tasks["flaky"].status == TaskStatus.COMPLETED
+                and fake_crud.tasks["broken"].status == TaskStatus.FAILED,
+            )
+        )
+
+    assert attempts == {"flaky": 2, "broken": 2}
+    assert failed == ["broken"]
+    assert worker.get_metrics()["retried"] == 2
+
+
+def test_task_is_cancelled_when_its_lease_is_lost():
+    fake_crud = FakeTaskCRUD()
+    fake_crud.enqueue("taken-over", "user-a")
+    fake_crud.revoked.add("taken-over")
+    cancelled = []
+
+    async def handler(task):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(task.id)
+            raise
+
+    worker = get_worker(handler)
+    with patch("services.task_queue_worker.task_crud", fake_crud):
+        asyncio.run(run_until(fake_crud, worker, lambda: bool(cancelled)))
+
+    assert cancelled == ["taken-over"]
+    # Another worker owns it now, so it is left as it is
+    assert fake_crud.tasks["taken-over"].status == TaskStatus.RUNNING
+
+
+def test_tasks_that_keep_losing_their_worker_end_up_failed():
+    fake_crud = FakeTaskCRUD()
+    fake_crud.enqueue("poison", "user-a", max_attempts=3)
+    fake_crud.hanging.add("poison")
+    attempts = []
+    failed = []
+
+    async def handler(task):
+        attempts.append(task.attempts)
+        await asyncio.sleep(10)
+
+    async def on_failed(task, e):
+        failed.append(task.id)
+
+    worker = get_worker(handler, on_failed=on_failed)
+    with (
+        patch("services.task_queue_worker.task_crud", fake_crud),
+        patch(
+            "services.task_queue_worker.get_retry_delay_seconds", return_value=0
+        ) as get_retry_delay_seconds,
+    ):
+        asyncio.run(
+            run_until(
+                fake_crud,
+                worker,
+                lambda: fake_crud.tasks["poison"].status == TaskStatus.FAILED,
+            )
+        )
+
+    assert fake_crud.tasks["poison"].status == TaskStatus.FAILED
+    assert attempts == [1, 2, 3]
+    assert failed == ["poison"]
+    # The expired attempts before the last one were retried with backoff
+    assert [each.args for each in get_retry_delay_seconds.call_args_list] == [
+        (1,),
+        (2,),
+    ]
+    assert worker.get_metrics()["retried"] == 2
+
+
+def test_stop_hands_running_tasks_back_to_the_queue():
+    fake_crud = FakeTaskCRUD()
+    fake_crud.enqueue("long", "user-a")
+    started = asyncio.Event()
+
+    async def handler(task):
+        started.set()
+        await asyncio.sleep(10)
+
+    async def run():
+        worker = get_worker(handler, heartbeat_seconds=5)
+        worker.start()
+        await started.wait()
+        await worker.stop(timeout=0.05)
+
+    with patch("services.task_queue_worker.task_crud", fake_crud):
+        asyncio.run(run())
+
+    assert fake_crud.tasks["long"].status == TaskStatus.PENDING
+    assert fake_crud.tasks["long"].attempts == 0
+
+
+def test_task_responses_leave_out_the_request_and_the_worker():
+    fake_crud = FakeTaskCRUD()
+    fake_crud.enqueue("task-1", "user-1")
+    task = fake_crud.tasks["task-1"].model_copy(update={"worker_id": "worker-1"})
+
+    response = Task(**task.model_dump()).model_dump()
+
+    assert "payload" not in response
+    assert "worker_id" not in response
+    assert response["attempts"] == 0
@@ -35,3 +35,15 @@ def get_uploads_directory():
     uploads_directory = os.path.join(app_data_dir, "uploads")
     os.makedirs(uploads_directory, exist_ok=True)
     return uploads_directory
+
+
+def get_image_transform_cache_directory():
+    app_data_dir = get_app_data_directory_env() or "./app_data"
+    # If relative path, resolve relative to project root (three levels up from fastapi dir)
+    if not os.path.isabs(app_data_dir):
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+        app_data_dir = os.path.join(project_root, app_data_dir.lstrip("./"))
+
+    cache_directory = os.path.join(app_data_dir, "cache", "image_transforms")
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
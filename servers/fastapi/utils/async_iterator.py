@@ -1,16 +1,88 @@
 import asyncio
-from typing import AsyncGenerator, Callable, Iterator, TypeVar
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
-def iterator_to_async(
-    func: Callable[..., Iterator[T]],
-) -> Callable[..., AsyncGenerator[T, None]]:
-    async def wrapper(*args, **kwargs) -> AsyncGenerator[T, None]:
-        iterator = func(*args, **kwargs)
-        for item in iterator:
-            yield item
-            await asyncio.sleep(0)
+async def map_in_order(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncGenerator[R, None]:
+    """
+    Runs func for every item with at most `concurrency` calls in flight and
+    yields the results in input order, as soon as each prefix is complete.
+    - `semaphore` is an optional shared limit acquired on top of `concurrency`,
+    so several callers can be capped together.
+    - The first exception is raised when its result is reached and every call
+    that is still pending is cancelled.
+    """
+    async with aclosing(
+        map_in_order_with_progress(
+            lambda item, _: func(item), items, concurrency, semaphore
+        )
+    ) as events:
+        async for _, result, _ in events:
+            yield result
 
-    return wrapper
+
+async def map_in_order_with_progress(
+    func: Callable[[T, Callable[[Any], None]], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncGenerator[Tuple[int, Any, bool], None]:
+    """
+    Same as map_in_order, but func also receives a callback to report progress.
+    - Yields (index, progress, False) as soon as progress is reported, from any item.
+    - Yields (index, result, True) in input order.
+    """
+    local_semaphore = asyncio.Semaphore(max(concurrency, 1))
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run(index: int, item: T) -> R:
+        def report_progress(progress: Any):
+            events.put_nowait((index, progress, False))
+
+        async with local_semaphore:
+            if semaphore is None:
+                return await func(item, report_progress)
+            async with semaphore:
+                return await func(item, report_progress)
+
+    tasks = [
+        asyncio.create_task(run(index, item)) for index, item in enumerate(items)
+    ]
+    for task in tasks:
+        # Wakes up the consumer so finished results are yielded
+        task.add_done_callback(lambda _: events.put_nowait(None))
+
+    next_index = 0
+    try:
+        while next_index < len(tasks):
+            if tasks[next_index].done():
+                yield next_index, tasks[next_index].result(), True
+                next_index += 1
+                continue
+            event = await events.get()
+            if event is not None:
+                yield event
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Retrieve the exception so it is not reported as unhandled
+                task.exception()
@@ -1,92 +1,134 @@
-import asyncio
 import os
 import mimetypes
-from typing import List, Optional
+from typing import Callable, List, Optional
 from urllib.parse import urlparse
 
-import aiohttp
+from services.http_client_service import HTTP_CLIENT_SERVICE
 
 import uuid
 
 
+# File signatures of the downloads whose URL and headers don't give an extension
+MAGIC_NUMBER_EXTENSIONS = [
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+    (b"II*\x00", ".tiff"),
+    (b"MM\x00*", ".tiff"),
+    (b"\x00\x00\x01\x00", ".ico"),
+    (b"%PDF", ".pdf"),
+]
+
+
+def get_extension_from_bytes(data: bytes) -> Optional[str]:
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    for magic_number, extension in MAGIC_NUMBER_EXTENSIONS:
+        if data.startswith(magic_number):
+            return extension
+    if b"<svg" in data[:1024]:
+        return ".svg"
+    return None
+
+
+def get_filename_from_headers(headers) -> Optional[str]:
+    content_disposition = headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        filename = content_disposition.split("filename=")[1].strip("\"'")
+        return os.path.basename(filename)
+
+    # Generic binary content is left to the file signature
+    content_type = headers.get("Content-Type", "").split(";")[0].strip()
+    if content_type and content_type != "application/octet-stream":
+        extension = mimetypes.guess_extension(content_type)
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+    return None
+
+
+async def fetch_file(
+    url: str,
+    save_directory: str,
+    headers: Optional[dict] = None,
+    unique_filename: bool = False,
+) -> str:
+    """
+    Downloads the file in a single GET request, raising on failures.
+    - The filename is taken from the URL, else from the response headers, else
+    an extension is picked from the first bytes of the body.
+    - With unique_filename, names taken from the URL or the headers are prefixed
+    so different URLs using the same name don't overwrite each other.
+    - The body is written to a temporary file renamed once complete, so a failed
+    download never leaves a partial file under the final name.
+    """
+    os.makedirs(save_directory, exist_ok=True)
+
+    parsed_url = urlparse(url)
+    filename = os.path.basename(parsed_url.path)
+    if not filename or "." not in filename:
+        filename = None
+
+    temp_path = None
+    try:
+        # Certificates of the hosts are not verified
+        session = HTTP_CLIENT_SERVICE.get_session(trust_env=True)
+        async with session.get(url, headers=headers, ssl=False) as response:
+            response.raise_for_status()
+            if response.status != 200:
+                raise Exception(f"Unexpected HTTP status: {response.status}")
+
+            filename = filename or get_filename_from_headers(response.headers)
+            if filename and unique_filename:
+                filename = f"{uuid.uuid4().hex[:8]}_{filename}"
+            temp_path = os.path.join(save_directory, f".{uuid.uuid4()}.part")
+            with open(temp_path, "wb") as file:
+                async for chunk in response.content.iter_chunked(8192):
+                    if not filename:
+                        extension = get_extension_from_bytes(chunk) or ""
+                        filename = f"{uuid.uuid4()}{extension}"
+                    file.write(chunk)
+
+        save_path = os.path.join(save_directory, filename or str(uuid.uuid4()))
+        os.replace(temp_path, save_path)
+        temp_path = None
+        return save_path
+
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
 ) -> Optional[str]:
     try:
-        os.makedirs(save_directory, exist_ok=True)
-
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-
-        if not filename or "." not in filename:
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector, trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        async with aiohttp.ClientSession(connector=connector, trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
-
+        save_path = await fetch_file(url, save_directory, headers)
+        print(f"File downloaded successfully: {save_path}")
+        return save_path
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
         return None
 
 
 async def download_files(
-    urls: List[str], save_directory: str, headers: Optional[dict] = None
+    urls: List[str],
+    save_directory: str,
+    headers: Optional[dict] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
 ) -> List[Optional[str]]:
+    """Downloads the files with bounded concurrency and retries, see BulkDownloader"""
+    from services.bulk_downloader import BulkDownloader
+
     print(f"Starting download of {len(urls)} files to {save_directory}")
-    coroutines = [download_file(url, save_directory, headers) for url in urls]
-    results = await asyncio.gather(*coroutines, return_exceptions=True)
-    final_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            print(f"Exception during download of {urls[i]}: {result}")
-            final_results.append(None)
-        else:
-            final_results.append(result)
+    bulk_downloader = BulkDownloader(save_directory, headers, on_progress)
+    final_results = await bulk_downloader.download(urls)
 
     successful_downloads = sum(1 for result in final_results if result is not None)
     print(
-        f"Download completed: {successful_downloads}/{len(urls)} files downloaded successfully"
+        f"Download completed: {successful_downloads}/{len(urls)} files downloaded successfully, "
+        f"{bulk_downloader.get_metrics()}"
     )
 
     return final_results
@@ -6,9 +6,11 @@ import uuid
 from fastapi import HTTPException
 from pathvalidate import sanitize_filename
 
+from constants.http import HTTP_EXPORT_TIMEOUT
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
 from services.pptx_presentation_creator import PptxPresentationCreator
+from services.http_client_service import HTTP_CLIENT_SERVICE
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.gridfs_service import get_gridfs_service
 from services.binary_storage_service import get_binary_storage_service
@@ -36,26 +38,27 @@ async def export_presentation(
             print("Warning: No user_id provided for token generation")
 
         # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            pptx_model_url = f"http://localhost:3000/api/presentation_to_pptx_model?id={presentation_id}"
-            if auth_token:
-                pptx_model_url += f"&token={auth_token}"
-            
-            async with session.get(pptx_model_url) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
+        session = HTTP_CLIENT_SERVICE.get_session()
+        pptx_model_url = f"http://localhost:3000/api/presentation_to_pptx_model?id={presentation_id}"
+        if auth_token:
+            pptx_model_url += f"&token={auth_token}"
+
+        async with session.get(
+            pptx_model_url, timeout=aiohttp.ClientTimeout(total=HTTP_EXPORT_TIMEOUT)
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
 
         # Create PPTX file using the converted model
         pptx_model = PptxPresentationModel(**pptx_model_data)
         temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
         pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
 
         # Generate filename
         filename = f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx"
@@ -63,7 +66,7 @@ async def export_presentation(
         # Save to local filesystem first
         export_directory = get_exports_directory()
         pptx_path = os.path.join(export_directory, filename)
-        pptx_creator.save(pptx_path)
+        await pptx_creator.create_and_save(pptx_path)
 
         # Save to MongoDB if requested and user_id provided
         mongodb_path = pptx_path
@@ -127,38 +130,39 @@ async def export_presentation(
             s3_pdf_url=mongodb_path if export_as == "pdf" else None,
         )
     else:
-        async with aiohttp.ClientSession() as session:
-            # Get authentication token for PDF export
-            auth_token = None
-            if user_id:
-                # For now, we'll use a simple approach - in production you might want to 
-                # generate a temporary token or use a different authentication method
-                try:
-                    # Try to get token from environment or generate one
-                    auth_token = os.getenv("PDF_EXPORT_TOKEN")
-                    if not auth_token:
-                        # Generate a temporary token for PDF export
-                        from auth.jwt_handler import create_access_token
-                        auth_token = create_access_token(data={"sub": user_id}, expires_delta=None)
-                except Exception as e:
-                    print(f"Warning: Could not generate auth token for PDF export: {e}")
-            
-            async with session.post(
-                "http://localhost:3000/api/export-as-pdf-canvas",
-                json={
-                    "id": str(presentation_id),
-                    "title": sanitize_filename(title or str(uuid.uuid4())),
-                    "token": auth_token,
-                },
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to export PDF: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to export presentation as PDF",
-                    )
-                response_json = await response.json()
+        # Get authentication token for PDF export
+        auth_token = None
+        if user_id:
+            # For now, we'll use a simple approach - in production you might want to 
+            # generate a temporary token or use a different authentication method
+            try:
+                # Try to get token from environment or generate one
+                auth_token = os.getenv("PDF_EXPORT_TOKEN")
+                if not auth_token:
+                    # Generate a temporary token for PDF export
+                    from auth.jwt_handler import create_access_token
+                    auth_token = create_access_token(data={"sub": user_id}, expires_delta=None)
+            except Exception as e:
+                print(f"Warning: Could not generate auth token for PDF export: {e}")
+
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.post(
+            "http://localhost:3000/api/export-as-pdf-canvas",
+            json={
+                "id": str(presentation_id),
+                "title": sanitize_filename(title or str(uuid.uuid4())),
+                "token": auth_token,
+            },
+            timeout=aiohttp.ClientTimeout(total=HTTP_EXPORT_TIMEOUT),
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to export PDF: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to export presentation as PDF",
+                )
+            response_json = await response.json()
 
         return PresentationAndPath(
             presentation_id=str(presentation_id),
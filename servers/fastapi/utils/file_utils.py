@@ -42,3 +42,13 @@ def set_file_ext(file_path: str, ext: str) -> str:
     if get_file_ext_or_none(file_path):
         return f"{os.path.splitext(file_path)[0]}{ext}"
     return f"{file_path}{ext}"
+
+
+def write_file(file_path: str, content: bytes):
+    with open(file_path, "wb") as f:
+        f.write(content)
+
+
+def read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
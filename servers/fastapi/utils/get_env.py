@@ -104,3 +104,169 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_slide_generation_concurrency_env():
+    return os.getenv("SLIDE_GENERATION_CONCURRENCY")
+
+
+def get_global_slide_generation_concurrency_env():
+    return os.getenv("GLOBAL_SLIDE_GENERATION_CONCURRENCY")
+
+
+def get_slide_generation_window_size_env():
+    return os.getenv("SLIDE_GENERATION_WINDOW_SIZE")
+
+
+def get_llm_max_concurrency_env(provider: str):
+    return os.getenv(f"{provider.upper()}_MAX_CONCURRENCY") or os.getenv(
+        "LLM_MAX_CONCURRENCY"
+    )
+
+
+def get_llm_requests_per_minute_env(provider: str):
+    return os.getenv(f"{provider.upper()}_REQUESTS_PER_MINUTE") or os.getenv(
+        "LLM_REQUESTS_PER_MINUTE"
+    )
+
+
+def get_llm_tokens_per_minute_env(provider: str):
+    return os.getenv(f"{provider.upper()}_TOKENS_PER_MINUTE") or os.getenv(
+        "LLM_TOKENS_PER_MINUTE"
+    )
+
+
+def get_disable_slide_content_cache_env():
+    return os.getenv("DISABLE_SLIDE_CONTENT_CACHE")
+
+
+def get_slide_content_cache_size_env():
+    return os.getenv("SLIDE_CONTENT_CACHE_SIZE")
+
+
+def get_slide_content_cache_ttl_seconds_env():
+    return os.getenv("SLIDE_CONTENT_CACHE_TTL_SECONDS")
+
+
+def get_slide_generation_batch_size_env():
+    return os.getenv("SLIDE_GENERATION_BATCH_SIZE")
+
+
+def get_slide_generation_max_retries_env():
+    return os.getenv("SLIDE_GENERATION_MAX_RETRIES")
+
+
+def get_slide_generation_fallback_model_env():
+    return os.getenv("SLIDE_GENERATION_FALLBACK_MODEL")
+
+
+def get_speculative_layout_selection_env():
+    return os.getenv("SPECULATIVE_LAYOUT_SELECTION")
+
+
+def get_speculative_layout_chunk_size_env():
+    return os.getenv("SPECULATIVE_LAYOUT_CHUNK_SIZE")
+
+
+def get_disable_layout_matching_env():
+    return os.getenv("DISABLE_LAYOUT_MATCHING")
+
+
+def get_layout_matching_min_confidence_env():
+    return os.getenv("LAYOUT_MATCHING_MIN_CONFIDENCE")
+
+
+def get_task_queue_in_process_worker_env():
+    return os.getenv("TASK_QUEUE_IN_PROCESS_WORKER")
+
+
+def get_task_queue_worker_concurrency_env():
+    return os.getenv("TASK_QUEUE_WORKER_CONCURRENCY")
+
+
+def get_task_queue_per_user_concurrency_env():
+    return os.getenv("TASK_QUEUE_PER_USER_CONCURRENCY")
+
+
+def get_task_queue_max_attempts_env():
+    return os.getenv("TASK_QUEUE_MAX_ATTEMPTS")
+
+
+def get_task_queue_lease_seconds_env():
+    return os.getenv("TASK_QUEUE_LEASE_SECONDS")
+
+
+def get_generation_checkpoint_ttl_seconds_env():
+    return os.getenv("GENERATION_CHECKPOINT_TTL_SECONDS")
+
+
+def get_llm_routes_env():
+    return os.getenv("LLM_ROUTES")
+
+
+def get_llm_hedging_env():
+    return os.getenv("LLM_HEDGING")
+
+
+def get_disable_event_loop_monitor_env():
+    return os.getenv("DISABLE_EVENT_LOOP_MONITOR")
+
+
+def get_event_loop_monitor_debug_env():
+    return os.getenv("EVENT_LOOP_MONITOR_DEBUG")
+
+
+def get_event_loop_blocking_threshold_ms_env():
+    return os.getenv("EVENT_LOOP_BLOCKING_THRESHOLD_MS")
+
+
+def get_io_executor_workers_env():
+    return os.getenv("IO_EXECUTOR_WORKERS")
+
+
+def get_cpu_executor_workers_env():
+    return os.getenv("CPU_EXECUTOR_WORKERS")
+
+
+def get_libreoffice_concurrency_env():
+    return os.getenv("LIBREOFFICE_CONCURRENCY")
+
+
+def get_disable_pptx_worker_rendering_env():
+    return os.getenv("DISABLE_PPTX_WORKER_RENDERING")
+
+
+def get_disable_image_transform_cache_env():
+    return os.getenv("DISABLE_IMAGE_TRANSFORM_CACHE")
+
+
+def get_image_transform_cache_ttl_seconds_env():
+    return os.getenv("IMAGE_TRANSFORM_CACHE_TTL_SECONDS")
+
+
+def get_disable_image_cache_env():
+    return os.getenv("DISABLE_IMAGE_CACHE")
+
+
+def get_image_cache_ttl_seconds_env():
+    return os.getenv("IMAGE_CACHE_TTL_SECONDS")
+
+
+def get_image_cache_max_entries_env():
+    return os.getenv("IMAGE_CACHE_MAX_ENTRIES")
+
+
+def get_bulk_download_concurrency_env():
+    return os.getenv("BULK_DOWNLOAD_CONCURRENCY")
+
+
+def get_bulk_download_per_host_concurrency_env():
+    return os.getenv("BULK_DOWNLOAD_PER_HOST_CONCURRENCY")
+
+
+def get_bulk_download_timeout_seconds_env():
+    return os.getenv("BULK_DOWNLOAD_TIMEOUT_SECONDS")
+
+
+def get_bulk_download_max_retries_env():
+    return os.getenv("BULK_DOWNLOAD_MAX_RETRIES")
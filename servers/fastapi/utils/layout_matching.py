@@ -0,0 +1,212 @@
+import re
+from typing import List, Optional, Set, Tuple
+
+from constants.presentation import DEFAULT_LAYOUT_MATCHING_MIN_CONFIDENCE
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import PresentationOutlineModel
+from utils.get_env import (
+    get_disable_layout_matching_env,
+    get_layout_matching_min_confidence_env,
+)
+from utils.parsers import parse_bool_or_none, parse_float_or_none
+
+
+# Score of a layout that clearly fits an outline, maps to a confidence of 1
+STRONG_MATCH_SCORE = 4.0
+# Subtracted when the previous slide got the same layout, keeps decks varied
+REPEATED_LAYOUT_PENALTY = 0.75
+
+# Kinds of content that only fit layouts made for them
+LAYOUT_KIND_PATTERNS = {
+    # Most descriptions mention a title field, so "title" alone is not enough
+    "title": r"\b(intro|introduction|cover|opening|title slide)\b",
+    "toc": r"\b(table[\s-]*of[\s-]*contents|agenda|toc)\b",
+    "metrics": r"\b(metrics?|statistics?|stats|kpis?|numbers)\b",
+    "chart": r"\b(charts?|graphs?)\b",
+    "quote": r"\b(quotes?|testimonials?)\b",
+    "team": r"\b(team|members?|people)\b",
+    "table": r"\btables?\b",
+}
+
+OUTLINE_KIND_PATTERNS = {
+    "quote": r"^\s*>|[\"“].{20,}[\"”]|\bquote\b",
+    "team": r"\b(our team|team members?|founders?|co-founders?|ceo|cto|leadership)\b",
+    "table": r"^\s*\|.*\|\s*$|\b(comparison table|table)\b",
+    "chart": r"\b(growth|trend|revenue|forecast|market size|share|year over year|yoy)\b",
+}
+
+BULLET_REGEX = re.compile(r"^\s*([-*•]|\d+[.)])\s+")
+NUMBERED_BULLET_REGEX = re.compile(r"^\s*\d+[.)]\s+")
+METRIC_REGEX = re.compile(
+    r"[$€£]\s?\d[\d,.]*\s?[kmb]?\b|\b\d[\d,.]*\s?(%|x\b|\+|k\b|m\b|bn?\b|million|billion)",
+    re.IGNORECASE,
+)
+
+
+def is_layout_matching_enabled() -> bool:
+    return not (parse_bool_or_none(get_disable_layout_matching_env()) or False)
+
+
+def get_layout_matching_min_confidence() -> float:
+    min_confidence = parse_float_or_none(get_layout_matching_min_confidence_env())
+    if min_confidence is None:
+        return DEFAULT_LAYOUT_MATCHING_MIN_CONFIDENCE
+    return min_confidence
+
+
+def get_outline_features(content: str, index: int) -> dict:
+    lines = [line for line in content.splitlines() if line.strip()]
+    headings = [line for line in lines if line.lstrip().startswith("#")]
+    bullets = [line for line in lines if BULLET_REGEX.match(line)]
+    body = " ".join(line for line in lines if not line.lstrip().startswith("#"))
+    body_words = len(body.split())
+
+    kinds: Set[str] = {
+        kind
+        for kind, pattern in OUTLINE_KIND_PATTERNS.items()
+        if re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
+    }
+    n_metrics = len(METRIC_REGEX.findall(content))
+    if n_metrics >= 2:
+        kinds |= {"metrics", "chart"}
+    elif n_metrics == 0:
+        # Charts need data
+        kinds.discard("chart")
+    heading_only = bool(headings) and body_words <= 12
+    # Heading-only slides later in the deck could be anything, so none is preferred
+    if index == 0:
+        kinds.add("title")
+
+    return {
+        "kinds": kinds,
+        "bullets": len(bullets),
+        "numbered": bool(bullets)
+        and all(NUMBERED_BULLET_REGEX.match(line) for line in bullets),
+        "metrics": n_metrics,
+        "heading_only": heading_only,
+        "body_words": body_words,
+    }
+
+
+def _get_array_fields(schema: dict) -> List[dict]:
+    return [
+        property
+        for property in (schema.get("properties") or {}).values()
+        if isinstance(property, dict) and property.get("type") == "array"
+    ]
+
+
+def get_layout_features(slide_layout: SlideLayoutModel) -> dict:
+    schema = slide_layout.json_schema or {}
+    text = " ".join(
+        each
+        for each in [
+            slide_layout.id,
+            slide_layout.name,
+            slide_layout.description,
+            schema.get("title"),
+            " ".join((schema.get("properties") or {}).keys()),
+        ]
+        if each
+    ).lower()
+
+    kinds = {
+        kind
+        for kind, pattern in LAYOUT_KIND_PATTERNS.items()
+        if re.search(pattern, text, re.IGNORECASE)
+    }
+    array_fields = _get_array_fields(schema)
+    # The largest list of the layout holds the bullets of the outline
+    list_field = max(
+        array_fields, key=lambda each: each.get("maxItems") or 0, default=None
+    )
+
+    return {
+        "kinds": kinds,
+        "fields": len(schema.get("properties") or {}),
+        "has_list": list_field is not None,
+        "min_items": (list_field or {}).get("minItems") or 1,
+        "max_items": (list_field or {}).get("maxItems") or 6,
+        "numbered": "numbered" in text,
+    }
+
+
+def score_layout(outline_features: dict, layout_features: dict) -> float:
+    score = 0.0
+    outline_kinds = outline_features["kinds"]
+    layout_kinds = layout_features["kinds"]
+
+    # Table of contents slides are inserted separately
+    if "toc" in layout_kinds:
+        return -5.0
+
+    matched_kinds = outline_kinds & layout_kinds
+    if matched_kinds:
+        score += STRONG_MATCH_SCORE
+        if "title" in matched_kinds and outline_features["bullets"] > 2:
+            score -= 2
+    # Specialized layouts are only for the content they are made for
+    score -= 3 * len(layout_kinds - outline_kinds)
+
+    bullets = outline_features["bullets"]
+    if bullets:
+        if not layout_features["has_list"]:
+            score -= 1.5
+        elif layout_features["min_items"] <= bullets <= layout_features["max_items"]:
+            score += 3
+        elif bullets > layout_features["max_items"]:
+            # Bullets can be merged to fit
+            score += 1
+        else:
+            score += 0.5
+        if outline_features["numbered"] and layout_features["numbered"]:
+            score += 1
+    elif layout_features["has_list"]:
+        score -= 1
+    elif not outline_features["heading_only"]:
+        # Paragraph content fits layouts with a single block of text
+        score += 2
+
+    return score
+
+
+def match_layouts(
+    presentation_outline: PresentationOutlineModel,
+    presentation_layout: PresentationLayoutModel,
+    slide_offset: int = 0,
+) -> List[Tuple[int, float]]:
+    """
+    Scores every outline against every slide layout.
+    Returns the picked layout index and a confidence between 0 and 1 per slide.
+    Picks only depend on the inputs, so the same deck always gets the same layouts.
+    `slide_offset` is the position of the first outline in the deck.
+    """
+    layout_features = [
+        get_layout_features(slide_layout)
+        for slide_layout in presentation_layout.slides
+    ]
+    if not layout_features:
+        return []
+
+    matches: List[Tuple[int, float]] = []
+    previous_index: Optional[int] = None
+    for index, outline in enumerate(presentation_outline.slides):
+        outline_features = get_outline_features(
+            outline.content, slide_offset + index
+        )
+        scores = [
+            score_layout(outline_features, features) for features in layout_features
+        ]
+        # Ties go to the first layout, after the repetition penalty
+        layout_index = max(
+            range(len(scores)),
+            key=lambda i: (
+                scores[i] - (REPEATED_LAYOUT_PENALTY if i == previous_index else 0),
+                -i,
+            ),
+        )
+        confidence = max(0.0, min(1.0, scores[layout_index] / STRONG_MATCH_SCORE))
+        matches.append((layout_index, confidence))
+        previous_index = layout_index
+
+    return matches
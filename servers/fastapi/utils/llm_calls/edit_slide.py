@@ -1,11 +1,11 @@
 from datetime import datetime
 from typing import Optional
+from enums.llm_request_priority import LLMRequestPriority
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import SlideLayoutModel
 from models.mongo.slide import SlideInDB
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
-from utils.llm_provider import get_model
 from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
 
 
@@ -85,8 +85,6 @@ async def get_edited_slide_content(
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
 ):
-    model = get_model()
-
     response_schema = remove_fields_from_schema(
         slide_layout.json_schema, ["__image_url__", "__icon_url__"]
     )
@@ -103,17 +101,16 @@ async def get_edited_slide_content(
         True,
     )
 
-    # Initialize LLM client lazily to ensure environment variables are set
-    from services.llm_client import LLMClient
-    client = LLMClient()
+    # Edits are interactive, so they go to the fastest healthy provider
+    from services.llm_client import LLM_ROUTER
     try:
-        response = await client.generate_structured(
-            model=model,
+        response = await LLM_ROUTER.generate_structured(
             messages=get_messages(
                 prompt, slide.content, language, tone, verbosity, instructions
             ),
             response_format=response_schema,
             strict=False,
+            priority=LLMRequestPriority.INTERACTIVE,
         )
         return response
 
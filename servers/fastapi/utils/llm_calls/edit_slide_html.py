@@ -1,8 +1,8 @@
 from typing import Optional
+from enums.llm_request_priority import LLMRequestPriority
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
-from utils.llm_provider import get_model
 
 system_prompt = """
     You are an expert HTML slide editor. Your task is to modify slide HTML content based on user prompts while maintaining proper structure, styling, and functionality.
@@ -48,18 +48,15 @@ def get_user_prompt(prompt: str, html: str):
 
 
 async def get_edited_slide_html(prompt: str, html: str):
-    model = get_model()
-
-    # Initialize LLM client lazily to ensure environment variables are set
-    from services.llm_client import LLMClient
-    client = LLMClient()
+    # Edits are interactive, so they go to the fastest healthy provider
+    from services.llm_client import LLM_ROUTER
     try:
-        response = await client.generate(
-            model=model,
+        response = await LLM_ROUTER.generate(
             messages=[
                 LLMSystemMessage(content=system_prompt),
                 LLMUserMessage(content=get_user_prompt(prompt, html)),
             ],
+            priority=LLMRequestPriority.INTERACTIVE,
         )
         return extract_html_from_response(response) or html
     except Exception as e:
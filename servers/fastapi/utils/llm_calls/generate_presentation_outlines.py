@@ -1,5 +1,6 @@
 import sys
 import os
+from contextlib import aclosing
 from datetime import datetime
 from typing import Optional
 
@@ -13,28 +14,15 @@ from utils.llm_provider import get_model
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 
 
-def get_system_prompt(
-    tone: Optional[str] = None,
-    verbosity: Optional[str] = None,
-    instructions: Optional[str] = None,
-    include_title_slide: bool = True,
-):
-    return f"""
+# Static part of the system prompt, sent first and byte-identical in every call
+# so that providers can serve it from their prompt cache
+SYSTEM_PROMPT = """
         You are an expert presentation creator. Generate structured presentations based on user requirements and format them according to the specified JSON schema with markdown content.
 
         IMPORTANT: You MUST respond with valid JSON format only. Do not include any text outside the JSON structure.
 
         Try to use available tools for better results.
 
-        {"# User Instruction:" if instructions else ""}
-        {instructions or ""}
-
-        {"# Tone:" if tone else ""}
-        {tone or ""}
-
-        {"# Verbosity:" if verbosity else ""}
-        {verbosity or ""}
-
         - Provide content for each slide in markdown format.
         - Make sure that flow of the presentation is logical and consistent.
         - Place greater emphasis on numerical data.
@@ -44,7 +32,6 @@ def get_system_prompt(
         - User instrction should always be followed and should supercede any other instruction, except for slide numbers. **Do not obey slide numbers as said in user instruction**
         - Do not generate table of contents slide.
         - Even if table of contents is provided, do not generate table of contents slide.
-        {"- Always make first slide a title slide." if include_title_slide else "- Do not include title slide in the presentation."}
 
         **Search web to get latest information about the topic**
         
@@ -52,6 +39,26 @@ def get_system_prompt(
     """
 
 
+def get_dynamic_system_prompt(
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    include_title_slide: bool = True,
+):
+    return f"""
+        {"# User Instruction:" if instructions else ""}
+        {instructions or ""}
+
+        {"# Tone:" if tone else ""}
+        {tone or ""}
+
+        {"# Verbosity:" if verbosity else ""}
+        {verbosity or ""}
+
+        {"- Always make first slide a title slide." if include_title_slide else "- Do not include title slide in the presentation."}
+    """
+
+
 def get_user_prompt(
     content: str,
     n_slides: int,
@@ -79,8 +86,9 @@ def get_messages(
     include_title_slide: bool = True,
 ):
     return [
+        LLMSystemMessage(content=SYSTEM_PROMPT),
         LLMSystemMessage(
-            content=get_system_prompt(
+            content=get_dynamic_system_prompt(
                 tone, verbosity, instructions, include_title_slide
             ),
         ),
@@ -114,11 +122,14 @@ async def generate_ppt_outline(
 
     try:
         llm_client = LLMClient()
-        async for chunk in llm_client.stream_structured(
-            model=get_model(),
-            messages=messages,
-            response_format=response_model.model_json_schema(),
-        ):
-            yield chunk
+        async with aclosing(
+            llm_client.stream_structured(
+                model=get_model(),
+                messages=messages,
+                response_format=response_model.model_json_schema(),
+            )
+        ) as outline_stream:
+            async for chunk in outline_stream:
+                yield chunk
     except Exception as e:
         yield handle_llm_client_exceptions(e)
@@ -1,16 +1,24 @@
 import sys
 import os
-from typing import Optional
+from typing import List, Optional
 
 # Add the app directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
 
 from app.core.llm_client import generate_structured
+from enums.llm_request_priority import LLMRequestPriority
+from services.llm_client import estimate_llm_tokens, get_llm_rate_limiter
+from utils.llm_provider import get_llm_provider
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_outline_model import PresentationOutlineModel
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.get_dynamic_models import get_presentation_structure_model_with_n_slides
+from utils.layout_matching import (
+    get_layout_matching_min_confidence,
+    is_layout_matching_enabled,
+    match_layouts,
+)
 from models.presentation_structure_model import PresentationStructureModel
 
 
@@ -108,41 +116,106 @@ def get_messages_for_slides_markdown(
     ]
 
 
+def get_outlines_text(
+    presentation_outline: PresentationOutlineModel,
+    indices: List[int],
+    slide_offset: int = 0,
+) -> str:
+    """Outlines of the given slides, numbered by their position in the deck"""
+    message = ""
+    for index in indices:
+        message += f"## Slide {slide_offset + index + 1}:\n"
+        message += f"  - Content: {presentation_outline.slides[index]} \n"
+    return message
+
+
 async def generate_presentation_structure(
     presentation_outline: PresentationOutlineModel,
     presentation_layout: PresentationLayoutModel,
     instructions: Optional[str] = None,
     using_slides_markdown: bool = False,
+    slide_offset: int = 0,
 ) -> PresentationStructureModel:
 
+    n_slides = len(presentation_outline.slides)
+    # Layouts are matched locally first, the LLM only picks the uncertain slides
+    if is_layout_matching_enabled():
+        matches = match_layouts(presentation_outline, presentation_layout, slide_offset)
+        min_confidence = get_layout_matching_min_confidence()
+        uncertain_indices = [
+            index
+            for index, (_, confidence) in enumerate(matches)
+            if confidence < min_confidence
+        ]
+        if not uncertain_indices:
+            print(f"Matched layouts of {len(matches)} slides without the LLM")
+            return PresentationStructureModel(
+                slides=[layout_index for layout_index, _ in matches]
+            )
+    else:
+        matches = None
+        uncertain_indices = list(range(n_slides))
+
     response_model = get_presentation_structure_model_with_n_slides(
-        len(presentation_outline.slides)
+        len(uncertain_indices)
     )
+    if matches is None:
+        outlines_text = presentation_outline.to_string()
+    else:
+        # Confident slides are left out, the uncertain ones keep their deck numbers
+        outlines_text = get_outlines_text(
+            presentation_outline, uncertain_indices, slide_offset
+        )
 
     # Create the prompt for structure generation
     if using_slides_markdown:
         system_prompt = get_messages_for_slides_markdown(
             presentation_layout,
-            len(presentation_outline.slides),
-            presentation_outline.to_string(),
+            len(uncertain_indices),
+            outlines_text,
             instructions,
         )[0].content
     else:
         system_prompt = get_messages(
             presentation_layout,
-            len(presentation_outline.slides),
-            presentation_outline.to_string(),
+            len(uncertain_indices),
+            outlines_text,
             instructions,
         )[0].content
     
-    user_prompt = presentation_outline.to_string()
+    user_prompt = outlines_text
     full_prompt = f"{system_prompt}\n\n{user_prompt}"
 
+    response_format = response_model.model_json_schema()
     try:
-        response = await generate_structured(
-            full_prompt,
-            response_model.model_json_schema(),
-        )
-        return PresentationStructureModel(**response)
+        # Goes through the same admission control as the rest of the LLM calls
+        async with get_llm_rate_limiter(get_llm_provider()).limit(
+            LLMRequestPriority.BULK,
+            estimate_llm_tokens(
+                [LLMUserMessage(content=full_prompt)], response_format=response_format
+            ),
+        ):
+            response = await generate_structured(
+                full_prompt,
+                response_format,
+            )
+        llm_structure = PresentationStructureModel(**response)
     except Exception as e:
         raise handle_llm_client_exceptions(e)
+
+    if matches is None:
+        return llm_structure
+
+    # Confident matches are kept, missing or invalid LLM picks fall back to them
+    print(
+        f"LLM picked layouts of {len(uncertain_indices)} of "
+        f"{n_slides} slides"
+    )
+    slides = [layout_index for layout_index, _ in matches]
+    for llm_index, index in enumerate(uncertain_indices):
+        if llm_index >= len(llm_structure.slides):
+            break
+        llm_layout_index = llm_structure.slides[llm_index]
+        if 0 <= llm_layout_index < len(presentation_layout.slides):
+            slides[index] = llm_layout_index
+    return PresentationStructureModel(slides=slides)
@@ -1,22 +1,30 @@
+import asyncio
+from contextlib import aclosing
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import List, Optional, Dict, Any
 import json
+from fastapi import HTTPException
+from constants.presentation import FAILED_SLIDE_KEY, MAX_SLIDE_BATCH_OUTPUT_TOKENS
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import SlideLayoutModel
 from models.presentation_outline_model import SlideOutlineModel
 from services.llm_client import LLMClient
+from services.slide_content_cache_service import SLIDE_CONTENT_CACHE_SERVICE
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
 from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
+from utils.streaming_json_parser import parse_first_json_object
 from utils.llm_calls.improved_llm_client import improved_llm_client
+from utils.slide_generation_utils import (
+    get_slide_generation_fallback_model,
+    get_slide_generation_max_retries,
+    get_slide_generation_retry_delay_seconds,
+)
 
 
-def get_system_prompt(
-    tone: Optional[str] = None,
-    verbosity: Optional[str] = None,
-    instructions: Optional[str] = None,
-):
-    return f"""
+# Static part of the system prompt, sent first and byte-identical in every call
+# so that providers can serve it from their prompt cache
+SYSTEM_PROMPT = """
         You are a presentation generation model.
         Generate slides strictly from the provided outline.
 
@@ -25,16 +33,7 @@ def get_system_prompt(
         - Use the same title and create concise content based on that section.
         - No generic placeholders (like 'Product Overview', 'Market Validation', etc.).
         - Maintain order and logical flow from the outline.
-        - Output must be JSON: {{ "slides": [ {{ "title": "", "content": "" }} ] }}.
-
-        {"# User Instructions:" if instructions else ""}
-        {instructions or ""}
-
-        {"# Tone:" if tone else ""}
-        {tone or ""}
-
-        {"# Verbosity:" if verbosity else ""}
-        {verbosity or ""}
+        - Output must be JSON: { "slides": [ { "title": "", "content": "" } ] }.
 
         # Steps
         1. Analyze the outline content carefully.
@@ -72,16 +71,50 @@ def get_system_prompt(
         - Provide output in json format and **don't include <parameters> tags**.
 
         # Image and Icon Output Format
-        image: {{
+        image: {
             __image_prompt__: string,
-        }}
-        icon: {{
+        }
+        icon: {
             __icon_query__: string,
-        }}
+        }
+
+    """
+
+
+def get_dynamic_system_prompt(
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+):
+    return f"""
+        {"# User Instructions:" if instructions else ""}
+        {instructions or ""}
+
+        {"# Tone:" if tone else ""}
+        {tone or ""}
+
+        {"# Verbosity:" if verbosity else ""}
+        {verbosity or ""}
 
     """
 
 
+def get_system_messages(
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    schema_prompt: str = "",
+) -> List[LLMSystemMessage]:
+    """Static prefix first, then everything that changes between calls"""
+    return [
+        LLMSystemMessage(content=SYSTEM_PROMPT),
+        LLMSystemMessage(
+            content=get_dynamic_system_prompt(tone, verbosity, instructions)
+            + schema_prompt
+        ),
+    ]
+
+
 def get_user_prompt(outline: str, language: str):
     return f"""
         ## Current Date and Time
@@ -107,23 +140,82 @@ def get_messages(
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
 ):
-    system_prompt = get_system_prompt(tone, verbosity, instructions)
     user_prompt = get_user_prompt(outline, language)
     
     # Debug logging
-    print(f"🔍 System Prompt (first 200 chars): {system_prompt[:200]}...")
     print(f"🔍 User Prompt (first 200 chars): {user_prompt[:200]}...")
 
     return [
-        LLMSystemMessage(
-            content=system_prompt,
-        ),
+        *get_system_messages(tone, verbosity, instructions),
         LLMUserMessage(
             content=user_prompt,
         ),
     ]
 
 
+def get_schema_prompt(schema: dict):
+    return f"""
+
+# CRITICAL: REQUIRED OUTPUT SCHEMA
+You MUST generate content that matches this EXACT schema structure. DO NOT use the old format with "slides" array.
+
+REQUIRED SCHEMA:
+{json.dumps(schema, indent=2)}
+
+# CRITICAL INSTRUCTIONS:
+1. Generate a SINGLE object (not an array with "slides")
+2. Include ALL required fields: {list(schema.get('required', []))}
+3. For image fields, ALWAYS include:
+   {{
+       "__image_url__": "/static/images/placeholder.jpg",
+       "__image_prompt__": "detailed description of the image"
+   }}
+4. For icon fields, ALWAYS include:
+   {{
+       "__icon_url__": "/static/icons/placeholder.svg", 
+       "__icon_query__": "description of the icon"
+   }}
+
+# EXAMPLE OUTPUT FORMAT:
+{{
+    "title": "Your slide title",
+    "image": {{
+        "__image_url__": "/static/images/placeholder.jpg",
+        "__image_prompt__": "AI technology and human collaboration"
+    }},
+    "bulletPoints": [
+        {{
+            "title": "Point 1",
+            "icon": {{
+                "__icon_url__": "/static/icons/placeholder.svg",
+                "__icon_query__": "technology icon"
+            }}
+        }}
+    ]
+}}
+
+IMPORTANT: Your response must be a valid JSON object that matches the schema above exactly. DO NOT use the old "slides" array format.
+"""
+
+
+def get_messages_with_schema(
+    schema: dict,
+    outline: str,
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+):
+    return [
+        *get_system_messages(
+            tone, verbosity, instructions, schema_prompt=get_schema_prompt(schema)
+        ),
+        LLMUserMessage(
+            content=get_user_prompt(outline, language),
+        ),
+    ]
+
+
 async def get_slide_content_from_type_and_outline(
     slide_layout: SlideLayoutModel,
     outline: SlideOutlineModel,
@@ -131,6 +223,365 @@ async def get_slide_content_from_type_and_outline(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    use_cache: bool = True,
+):
+    cache_key = _get_cache_key(
+        use_cache, slide_layout, outline, language, tone, verbosity, instructions
+    )
+    if cache_key:
+        cached_content = await SLIDE_CONTENT_CACHE_SERVICE.get(cache_key)
+        if cached_content is not None:
+            print(f"🔍 Slide content cache hit: {cache_key[:12]}")
+            return cached_content
+
+    slide_content = await _generate_slide_content_from_type_and_outline(
+        slide_layout, outline, language, tone, verbosity, instructions
+    )
+    await _cache_slide_content(cache_key, slide_content)
+    return slide_content
+
+
+async def stream_slide_content_from_type_and_outline(
+    slide_layout: SlideLayoutModel,
+    outline: SlideOutlineModel,
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    use_cache: bool = True,
+    model: Optional[str] = None,
+):
+    """
+    Streams slide content as the LLM generates it.
+    - Yields partial JSON text chunks, then the validated slide content as a dict.
+    - Cache hits yield only the content.
+    - If streaming fails, the content is generated without streaming, so the last
+    item is always the complete slide content.
+    - `model` overrides the model of the selected provider.
+    """
+    cache_key = _get_cache_key(
+        use_cache, slide_layout, outline, language, tone, verbosity, instructions, model
+    )
+    if cache_key:
+        cached_content = await SLIDE_CONTENT_CACHE_SERVICE.get(cache_key)
+        if cached_content is not None:
+            print(f"🔍 Slide content cache hit: {cache_key[:12]}")
+            yield cached_content
+            return
+
+    messages = get_messages_with_schema(
+        slide_layout.json_schema,
+        outline.content,
+        language,
+        tone,
+        verbosity,
+        instructions,
+    )
+
+    chunks = []
+    try:
+        async with aclosing(
+            improved_llm_client.llm_client.stream_structured(
+                model=model or get_model(),
+                messages=messages,
+                response_format=slide_layout.json_schema,
+            )
+        ) as content_stream:
+            async for chunk in content_stream:
+                chunks.append(chunk)
+                yield chunk
+        slide_content = get_validated_slide_content(
+            parse_first_json_object("".join(chunks)), slide_layout
+        )
+    except Exception as e:
+        print(f"🔍 Error streaming slide content, generating without streaming: {e}")
+        slide_content = await _generate_slide_content_from_type_and_outline(
+            slide_layout, outline, language, tone, verbosity, instructions, model
+        )
+
+    await _cache_slide_content(cache_key, slide_content)
+    yield slide_content
+
+
+async def stream_slide_content_with_retries(
+    slide_layout: SlideLayoutModel,
+    outline: SlideOutlineModel,
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    use_cache: bool = True,
+):
+    """
+    Same as stream_slide_content_from_type_and_outline, but a slide that fails is
+    retried with backoff, the last retry with the fallback model if one is set.
+    Raises the last error once the retries are used up.
+    Chunks of a failed attempt were already yielded, the next attempt starts over.
+    """
+    max_retries = get_slide_generation_max_retries()
+    fallback_model = get_slide_generation_fallback_model()
+
+    for attempt in range(max_retries + 1):
+        model = fallback_model if attempt and attempt == max_retries else None
+        try:
+            async with aclosing(
+                stream_slide_content_from_type_and_outline(
+                    slide_layout,
+                    outline,
+                    language,
+                    tone,
+                    verbosity,
+                    instructions,
+                    use_cache,
+                    model,
+                )
+            ) as slide_stream:
+                async for each in slide_stream:
+                    yield each
+            return
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = get_slide_generation_retry_delay_seconds(attempt + 1)
+            print(
+                f"🔍 Slide content failed on attempt {attempt + 1}/{max_retries + 1}, "
+                f"retrying in {delay:.1f}s: {e}"
+            )
+            await asyncio.sleep(delay)
+
+
+def get_failed_slide_content(
+    slide_layout: SlideLayoutModel, outline: SlideOutlineModel, error: str
+) -> dict:
+    """
+    Placeholder for a slide whose content could not be generated.
+    It carries the title of its outline and is marked failed so it can be regenerated.
+    """
+    title = next(
+        (
+            line.strip().lstrip("#").strip()
+            for line in outline.content.splitlines()
+            if line.strip()
+        ),
+        "",
+    )
+    content = validate_slide_content_against_schema(
+        {"title": title} if title else {}, slide_layout.json_schema
+    )
+    content["__speaker_note__"] = ""
+    content[FAILED_SLIDE_KEY] = True
+    content["error"] = error
+    return content
+
+
+def _get_cache_key(
+    use_cache: bool,
+    slide_layout: SlideLayoutModel,
+    outline: SlideOutlineModel,
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Optional[str]:
+    if not (use_cache and SLIDE_CONTENT_CACHE_SERVICE.enabled):
+        return None
+    return SLIDE_CONTENT_CACHE_SERVICE.get_key(
+        model or get_model(),
+        slide_layout.json_schema,
+        outline.content,
+        language,
+        tone,
+        verbosity,
+        instructions,
+    )
+
+
+async def _cache_slide_content(cache_key: Optional[str], slide_content):
+    # Failed generations raise before getting here, see
+    # _generate_slide_content_from_type_and_outline, so they are retried next time
+    if cache_key and isinstance(slide_content, dict):
+        await SLIDE_CONTENT_CACHE_SERVICE.set(cache_key, slide_content)
+
+
+def get_batch_key(index: int) -> str:
+    return f"slide_{index + 1}"
+
+
+def get_batch_response_schema(slide_layouts: List[SlideLayoutModel]) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            get_batch_key(index): slide_layout.json_schema
+            for index, slide_layout in enumerate(slide_layouts)
+        },
+        "required": [get_batch_key(index) for index in range(len(slide_layouts))],
+    }
+
+
+def get_batch_messages(
+    slide_layouts: List[SlideLayoutModel],
+    outlines: List[str],
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+):
+    schema = get_batch_response_schema(slide_layouts)
+    schema_prompt = f"""
+
+# CRITICAL: REQUIRED OUTPUT SCHEMA
+Generate content for {len(slide_layouts)} slides in a SINGLE JSON object.
+Use the keys {", ".join(schema["required"])}, one for each slide outline and in the same order.
+The value of every key must match the schema of that slide exactly.
+
+REQUIRED SCHEMA:
+{json.dumps(schema, indent=2)}
+
+# CRITICAL INSTRUCTIONS:
+1. Every slide is generated ONLY from its own outline
+2. For image fields, ALWAYS include:
+   {{
+       "__image_url__": "/static/images/placeholder.jpg",
+       "__image_prompt__": "detailed description of the image"
+   }}
+3. For icon fields, ALWAYS include:
+   {{
+       "__icon_url__": "/static/icons/placeholder.svg",
+       "__icon_query__": "description of the icon"
+   }}
+
+IMPORTANT: Your response must be a valid JSON object that matches the schema above exactly.
+"""
+
+    slide_outlines = "\n\n".join(
+        f"### {get_batch_key(index)}\n{outline}" for index, outline in enumerate(outlines)
+    )
+    user_prompt = f"""
+        ## Current Date and Time
+        {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+        ## Icon Query And Image Prompt Language
+        English
+
+        ## Slide Content Language
+        {language}
+
+        ## Slide Outlines (USE THIS CONTENT ONLY)
+        {slide_outlines}
+
+        IMPORTANT: Generate slide content based STRICTLY on the outlines above. Do not add generic content or placeholder titles.
+    """
+
+    return [
+        *get_system_messages(tone, verbosity, instructions, schema_prompt=schema_prompt),
+        LLMUserMessage(content=user_prompt),
+    ]
+
+
+def _is_valid_batch_item(content: Any, slide_layout: SlideLayoutModel) -> bool:
+    if not isinstance(content, dict):
+        return False
+    return all(
+        field in content for field in slide_layout.json_schema.get("required", [])
+    )
+
+
+def _can_be_batched(slide_layout: SlideLayoutModel) -> bool:
+    # References would point to the wrong place once nested in the batch schema
+    schema = json.dumps(slide_layout.json_schema)
+    return '"$ref"' not in schema
+
+
+async def get_slides_content_from_types_and_outlines(
+    slide_layouts: List[SlideLayoutModel],
+    outlines: List[SlideOutlineModel],
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Generates the content of several slides with a single LLM call, so the rules
+    and the request overhead are paid once per batch instead of once per slide.
+    - Cached slides are not sent to the LLM.
+    - Slides missing from the response or failing validation, and every slide
+    of a failed batch, are generated one by one.
+    """
+    contents: List[Optional[Dict[str, Any]]] = [None] * len(slide_layouts)
+    cache_keys = [
+        _get_cache_key(
+            use_cache, slide_layout, outline, language, tone, verbosity, instructions
+        )
+        for slide_layout, outline in zip(slide_layouts, outlines)
+    ]
+    for index, cache_key in enumerate(cache_keys):
+        if cache_key:
+            contents[index] = await SLIDE_CONTENT_CACHE_SERVICE.get(cache_key)
+
+    batch_indices = [
+        index
+        for index, content in enumerate(contents)
+        if content is None and _can_be_batched(slide_layouts[index])
+    ]
+    if len(batch_indices) > 1:
+        batch_layouts = [slide_layouts[index] for index in batch_indices]
+        try:
+            response = await improved_llm_client.llm_client.generate_structured(
+                model=get_model(),
+                messages=get_batch_messages(
+                    batch_layouts,
+                    [outlines[index].content for index in batch_indices],
+                    language,
+                    tone,
+                    verbosity,
+                    instructions,
+                ),
+                response_format=get_batch_response_schema(batch_layouts),
+                max_tokens=min(4000 * len(batch_indices), MAX_SLIDE_BATCH_OUTPUT_TOKENS),
+            )
+            for batch_index, index in enumerate(batch_indices):
+                content = response.get(get_batch_key(batch_index))
+                if not _is_valid_batch_item(content, slide_layouts[index]):
+                    print(f"🔍 Batched slide {index} failed validation, retrying alone")
+                    continue
+                contents[index] = get_validated_slide_content(
+                    content, slide_layouts[index]
+                )
+                await _cache_slide_content(cache_keys[index], contents[index])
+        except Exception as e:
+            print(f"🔍 Batched slide generation failed, retrying one by one: {e}")
+
+    missing_indices = [index for index, content in enumerate(contents) if content is None]
+    missing_contents = await asyncio.gather(
+        *[
+            get_slide_content_from_type_and_outline(
+                slide_layouts[index],
+                outlines[index],
+                language,
+                tone,
+                verbosity,
+                instructions,
+                use_cache,
+            )
+            for index in missing_indices
+        ]
+    )
+    for index, content in zip(missing_indices, missing_contents):
+        contents[index] = content
+
+    return contents
+
+
+async def _generate_slide_content_from_type_and_outline(
+    slide_layout: SlideLayoutModel,
+    outline: SlideOutlineModel,
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    model: Optional[str] = None,
 ):
     try:
         # Debug logging
@@ -148,39 +599,51 @@ async def get_slide_content_from_type_and_outline(
             language=language,
             tone=tone,
             verbosity=verbosity,
-            instructions=instructions
-        )
-        
-        # Validate the response against the schema
-        validated_response = validate_slide_content_against_schema(
-            content=response,
-            schema=slide_layout.json_schema
+            instructions=instructions,
+            model=model,
         )
-        
-        # Debug the response
-        print(f"🔍 Generated slide content: {str(validated_response)[:200]}...")
-        print(f"🔍 Validation completed successfully")
-        print(f"🔍 Final content type: {type(validated_response)}")
-        print(f"🔍 Final content keys: {list(validated_response.keys()) if isinstance(validated_response, dict) else 'Not a dict'}")
-        
-        # Extract individual slide content if the response contains a slides array
-        if isinstance(validated_response, dict) and 'slides' in validated_response:
-            slides_array = validated_response['slides']
-            if isinstance(slides_array, list) and len(slides_array) > 0:
-                # Return the first slide content
-                slide_content = slides_array[0]
-                print(f"🔍 Extracted individual slide content: {slide_content}")
-                return slide_content
-            else:
-                print(f"🔍 No slides found in response, returning original content")
-                return validated_response
-        else:
-            return validated_response
+        # Every provider call failed, checked before validation fills in defaults
+        if isinstance(response, dict) and "error" in response:
+            raise HTTPException(
+                status_code=502, detail=f"LLM API error: {response['error']}"
+            )
 
+        return get_validated_slide_content(response, slide_layout)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise handle_llm_client_exceptions(e)
 
 
+def get_validated_slide_content(response: Dict[str, Any], slide_layout: SlideLayoutModel):
+    # Validate the response against the schema
+    validated_response = validate_slide_content_against_schema(
+        content=response,
+        schema=slide_layout.json_schema
+    )
+    
+    # Debug the response
+    print(f"🔍 Generated slide content: {str(validated_response)[:200]}...")
+    print(f"🔍 Validation completed successfully")
+    print(f"🔍 Final content type: {type(validated_response)}")
+    print(f"🔍 Final content keys: {list(validated_response.keys()) if isinstance(validated_response, dict) else 'Not a dict'}")
+    
+    # Extract individual slide content if the response contains a slides array
+    if isinstance(validated_response, dict) and 'slides' in validated_response:
+        slides_array = validated_response['slides']
+        if isinstance(slides_array, list) and len(slides_array) > 0:
+            # Return the first slide content
+            slide_content = slides_array[0]
+            print(f"🔍 Extracted individual slide content: {slide_content}")
+            return slide_content
+        else:
+            print(f"🔍 No slides found in response, returning original content")
+            return validated_response
+    else:
+        return validated_response
+
+
 async def generate_slide_content_with_schema(
     slide_layout: SlideLayoutModel,
     outline: str,
@@ -188,6 +651,7 @@ async def generate_slide_content_with_schema(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    model: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Generate slide content using the specific layout schema"""
     
@@ -290,65 +754,24 @@ async def generate_slide_content_with_schema(
     # Use the original LLM client with schema-based generation
     try:
         # Get the system and user prompts with schema
-        system_prompt = get_system_prompt(tone, verbosity, instructions)
         user_prompt = get_user_prompt(outline, language)
         
         # Add schema to the system prompt
         print(f"🔍 SCHEMA DEBUG: {json.dumps(schema, indent=2)}")
-        system_prompt += f"""
-
-# CRITICAL: REQUIRED OUTPUT SCHEMA
-You MUST generate content that matches this EXACT schema structure. DO NOT use the old format with "slides" array.
-
-REQUIRED SCHEMA:
-{json.dumps(schema, indent=2)}
-
-# CRITICAL INSTRUCTIONS:
-1. Generate a SINGLE object (not an array with "slides")
-2. Include ALL required fields: {list(schema.get('required', []))}
-3. For image fields, ALWAYS include:
-   {{
-       "__image_url__": "/static/images/placeholder.jpg",
-       "__image_prompt__": "detailed description of the image"
-   }}
-4. For icon fields, ALWAYS include:
-   {{
-       "__icon_url__": "/static/icons/placeholder.svg", 
-       "__icon_query__": "description of the icon"
-   }}
-
-# EXAMPLE OUTPUT FORMAT:
-{{
-    "title": "Your slide title",
-    "image": {{
-        "__image_url__": "/static/images/placeholder.jpg",
-        "__image_prompt__": "AI technology and human collaboration"
-    }},
-    "bulletPoints": [
-        {{
-            "title": "Point 1",
-            "icon": {{
-                "__icon_url__": "/static/icons/placeholder.svg",
-                "__icon_query__": "technology icon"
-            }}
-        }}
-    ]
-}}
-
-IMPORTANT: Your response must be a valid JSON object that matches the schema above exactly. DO NOT use the old "slides" array format.
-"""
 
         # Use the original LLM client with schema-aware prompts
         from services.llm_client import LLMSystemMessage, LLMUserMessage
         from utils.llm_provider import get_model
         
         messages = [
-            LLMSystemMessage(content=system_prompt),
+            *get_system_messages(
+                tone, verbosity, instructions, schema_prompt=get_schema_prompt(schema)
+            ),
             LLMUserMessage(content=user_prompt)
         ]
         
         response = await improved_llm_client.llm_client.generate(
-            model=get_model(),
+            model=model or get_model(),
             messages=messages,
             max_tokens=4000
         )
@@ -358,15 +781,10 @@ IMPORTANT: Your response must be a valid JSON object that matches the schema abo
             print(f"🔍 Schema-based response parsed successfully: {parsed_response}")
             return parsed_response
         except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract JSON from the response
-            import re
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                parsed_json = json.loads(json_match.group())
-                print(f"🔍 Extracted JSON from response: {parsed_json}")
-                return parsed_json
-            else:
-                raise ValueError(f"Failed to parse JSON response: {response}")
+            # If JSON parsing fails, extract the first complete JSON object from the response
+            parsed_json = parse_first_json_object(response)
+            print(f"🔍 Extracted JSON from response: {parsed_json}")
+            return parsed_json
             
     except Exception as e:
         print(f"🔍 Error in schema-aware generation: {str(e)}")
@@ -425,14 +843,11 @@ def _clean_content(content: Dict[str, Any]) -> Dict[str, Any]:
     if 'content' in content and isinstance(content['content'], str):
         try:
             # Look for JSON in the content string
-            import re
-            json_match = re.search(r'\{.*\}', content['content'], re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                parsed_json = json.loads(json_str)
+            parsed_json = parse_first_json_object(content['content'])
+            if isinstance(parsed_json, dict):
                 # Merge the parsed JSON into cleaned content (this takes priority)
                 cleaned.update(parsed_json)
-        except (json.JSONDecodeError, AttributeError):
+        except (ValueError, AttributeError):
             # If we can't parse JSON, skip this field
             pass
     
@@ -1,10 +1,10 @@
+from enums.llm_request_priority import LLMRequestPriority
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
 from models.slide_layout_index import SlideLayoutIndex
 from models.mongo.slide import SlideInDB
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
-from utils.llm_provider import get_model
 
 
 def get_messages(
@@ -42,16 +42,13 @@ async def get_slide_layout_from_prompt(
     slide: SlideInDB,
 ) -> SlideLayoutModel:
 
-    # Initialize LLM client lazily to ensure environment variables are set
-    from services.llm_client import LLMClient
-    client = LLMClient()
-    model = get_model()
+    # Edits are interactive, so they go to the fastest healthy provider
+    from services.llm_client import LLM_ROUTER
 
     slide_layout_index = layout.get_slide_layout_index(slide.layout)
 
     try:
-        response = await client.generate_structured(
-            model=model,
+        response = await LLM_ROUTER.generate_structured(
             messages=get_messages(
                 prompt,
                 slide.content,
@@ -60,6 +57,7 @@ async def get_slide_layout_from_prompt(
             ),
             response_format=SlideLayoutIndex.model_json_schema(),
             strict=True,
+            priority=LLMRequestPriority.INTERACTIVE,
         )
         index = SlideLayoutIndex(**response).index
         return layout.slides[index]
@@ -44,7 +44,10 @@ def is_custom_llm_selected():
 
 
 def get_model():
-    selected_llm = get_llm_provider()
+    return get_model_for_provider(get_llm_provider())
+
+
+def get_model_for_provider(selected_llm: LLMProvider):
     if selected_llm == LLMProvider.OPENAI:
         return get_openai_model_env() or DEFAULT_OPENAI_MODEL
     elif selected_llm == LLMProvider.GOOGLE:
@@ -1,8 +1,9 @@
 import asyncio
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from models.image_prompt import ImagePrompt
 from models.mongo.asset import AssetInDB
 from models.mongo.slide import SlideInDB
+from services.asset_fetch_deduplicator import AssetFetchDeduplicator
 from services.icon_finder_service import ICON_FINDER_SERVICE
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
@@ -12,7 +13,20 @@ from utils.dict_utils import get_dict_at_path, get_dict_paths_with_key, set_dict
 async def process_slide_and_fetch_assets(
     image_generation_service: ImageGenerationService,
     slide: SlideInDB,
+    asset_deduplicator: Optional[AssetFetchDeduplicator] = None,
 ) -> List[AssetInDB]:
+    """
+    Fetches the images and icons of the slide and sets their urls in its content.
+    - Slides of one generation pass the same deduplicator, so an image prompt or
+    icon query repeated across them is requested once.
+    """
+
+    # Without a deduplicator, every image and icon is requested
+    generate_image = image_generation_service.generate_image
+    search_icons = ICON_FINDER_SERVICE.search_icons
+    if asset_deduplicator:
+        generate_image = asset_deduplicator.generate_image
+        search_icons = asset_deduplicator.search_icons
 
     async_tasks = []
 
@@ -28,7 +42,7 @@ async def process_slide_and_fetch_assets(
     for image_path in image_paths:
         __image_prompt__parent = get_dict_at_path(content, image_path)
         async_tasks.append(
-            image_generation_service.generate_image(
+            generate_image(
                 ImagePrompt(
                     prompt=__image_prompt__parent["__image_prompt__"],
                 )
@@ -40,7 +54,7 @@ async def process_slide_and_fetch_assets(
         icon_query = __icon_query__parent["__icon_query__"]
         print(f"🔍 ICON PROCESSING: Searching for icon with query: '{icon_query}' at path: {icon_path}")
         async_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(icon_query)
+            search_icons(icon_query)
         )
 
     results = await asyncio.gather(*async_tasks)
@@ -0,0 +1,85 @@
+import asyncio
+import random
+from typing import Optional
+
+from constants.presentation import (
+    DEFAULT_GLOBAL_SLIDE_GENERATION_CONCURRENCY,
+    DEFAULT_SLIDE_GENERATION_BATCH_SIZE,
+    DEFAULT_SLIDE_GENERATION_CONCURRENCY,
+    DEFAULT_SLIDE_GENERATION_MAX_RETRIES,
+    DEFAULT_SLIDE_GENERATION_WINDOW_SIZE,
+    SLIDE_GENERATION_RETRY_BASE_SECONDS,
+    SLIDE_GENERATION_RETRY_MAX_SECONDS,
+)
+from services.concurrent_service import CONCURRENT_SERVICE
+from utils.get_env import (
+    get_global_slide_generation_concurrency_env,
+    get_slide_generation_batch_size_env,
+    get_slide_generation_concurrency_env,
+    get_slide_generation_fallback_model_env,
+    get_slide_generation_max_retries_env,
+    get_slide_generation_window_size_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+def get_slide_generation_concurrency() -> int:
+    """Number of slides of a single presentation generated at the same time"""
+    return (
+        parse_int_or_none(get_slide_generation_concurrency_env())
+        or DEFAULT_SLIDE_GENERATION_CONCURRENCY
+    )
+
+
+def get_slide_generation_window_size() -> int:
+    """Number of slide content requests kept in flight by background generation"""
+    return max(
+        parse_int_or_none(get_slide_generation_window_size_env())
+        or DEFAULT_SLIDE_GENERATION_WINDOW_SIZE,
+        1,
+    )
+
+
+def get_slide_generation_batch_size() -> int:
+    """Number of slides whose content is generated with a single LLM call"""
+    return max(
+        parse_int_or_none(get_slide_generation_batch_size_env())
+        or DEFAULT_SLIDE_GENERATION_BATCH_SIZE,
+        1,
+    )
+
+
+def get_slide_generation_max_retries() -> int:
+    """Retries of a slide whose content failed, 0 disables retries"""
+    max_retries = parse_int_or_none(get_slide_generation_max_retries_env())
+    if max_retries is None:
+        return DEFAULT_SLIDE_GENERATION_MAX_RETRIES
+    return max(max_retries, 0)
+
+
+def get_slide_generation_fallback_model() -> Optional[str]:
+    """Model of the same provider used by the last retry of a failing slide"""
+    return get_slide_generation_fallback_model_env() or None
+
+
+def get_slide_generation_retry_delay_seconds(retry: int) -> float:
+    """Exponential backoff with jitter, `retry` starts at 1"""
+    delay = min(
+        SLIDE_GENERATION_RETRY_BASE_SECONDS * 2 ** (retry - 1),
+        SLIDE_GENERATION_RETRY_MAX_SECONDS,
+    )
+    return random.uniform(delay / 2, delay)
+
+
+def get_global_slide_generation_concurrency() -> int:
+    """Number of slides generated at the same time across all presentations"""
+    return (
+        parse_int_or_none(get_global_slide_generation_concurrency_env())
+        or DEFAULT_GLOBAL_SLIDE_GENERATION_CONCURRENCY
+    )
+
+
+def get_global_slide_generation_semaphore() -> asyncio.Semaphore:
+    return CONCURRENT_SERVICE.get_semaphore(
+        "slide_generation", get_global_slide_generation_concurrency()
+    )
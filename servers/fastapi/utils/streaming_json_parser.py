@@ -0,0 +1,154 @@
+import json
+from typing import Any, List, Optional
+
+import dirtyjson
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return dirtyjson.loads(text)
+
+
+class StreamingJsonParser:
+    """
+    Incremental JSON parser for streamed LLM output.
+    - Every chunk is scanned once, keeping track of strings, keys and nesting.
+    - Objects inside the array under `array_key` are parsed and returned by
+    `feed` as soon as their closing brace arrives.
+    - Text before the first character of `root_chars` (e.g. markdown fences or
+    a "[3]" in the prose) is ignored. The root is an object by default, pass
+    "{[" to also accept an array.
+    """
+
+    def __init__(self, array_key: Optional[str] = "slides", root_chars: str = "{"):
+        self.array_key = array_key
+        self.root_chars = root_chars
+        self.items: List[Any] = []
+
+        self._parts: List[str] = []
+        self._offset = 0
+
+        # Each entry is (container type, key of the container in its parent)
+        self._stack: List[tuple] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_chars: List[str] = []
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+
+        self._item_parts: Optional[List[str]] = None
+        self._item_depth = 0
+
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def is_complete(self) -> bool:
+        return self._root_end is not None
+
+    @property
+    def root_text(self) -> Optional[str]:
+        """Text of the first complete top-level JSON value, if any"""
+        if self._root_start is None or self._root_end is None:
+            return None
+        return self.text[self._root_start : self._root_end]
+
+    def _is_in_target_array(self) -> bool:
+        return bool(self._stack) and self._stack[-1] == ("array", self.array_key)
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consumes a chunk and returns the items completed by it"""
+        self._parts.append(chunk)
+        completed = []
+        # Start of the item text within this chunk
+        item_start = 0 if self._item_parts is not None else None
+
+        for index, char in enumerate(chunk):
+            if self._root_end is not None:
+                break
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = "".join(self._string_chars)
+                else:
+                    self._string_chars.append(char)
+                continue
+
+            if not self._stack and char not in self.root_chars:
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_chars = []
+            elif char == ":":
+                self._pending_key = self._last_string
+            elif char == ",":
+                self._pending_key = None
+            elif char in "{[":
+                if not self._stack:
+                    self._root_start = self._offset + index
+                if (
+                    char == "{"
+                    and self._item_parts is None
+                    and self.array_key is not None
+                    and self._is_in_target_array()
+                ):
+                    self._item_parts = []
+                    self._item_depth = len(self._stack) + 1
+                    item_start = index
+
+                key = None
+                if self._stack and self._stack[-1][0] == "object":
+                    key = self._pending_key
+                self._stack.append(("object" if char == "{" else "array", key))
+                self._pending_key = None
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                if (
+                    char == "}"
+                    and self._item_parts is not None
+                    and len(self._stack) == self._item_depth
+                ):
+                    self._item_parts.append(chunk[item_start : index + 1])
+                    item_text = "".join(self._item_parts)
+                    self._item_parts = None
+                    item_start = None
+                    try:
+                        item = _loads(item_text)
+                        self.items.append(item)
+                        completed.append(item)
+                    except Exception as e:
+                        print(f"Failed to parse streamed item: {e}")
+                self._stack.pop()
+                if not self._stack:
+                    self._root_end = self._offset + index + 1
+
+        if self._item_parts is not None and item_start is not None:
+            self._item_parts.append(chunk[item_start:])
+
+        self._offset += len(chunk)
+        return completed
+
+
+def parse_first_json_object(text: str) -> Any:
+    """
+    Parses the first complete top-level JSON object in text, ignoring anything
+    around it. Raises ValueError if there is none.
+    """
+    parser = StreamingJsonParser(array_key=None)
+    parser.feed(text)
+    if parser.root_text is None:
+        raise ValueError(f"No JSON object found in response: {text}")
+    return _loads(parser.root_text)
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import os
+import signal
+
+from api.v1.ppt.endpoints.presentation import get_presentation_generation_worker
+from crud.asset_crud import asset_crud
+from crud.generation_checkpoint_crud import generation_checkpoint_crud
+from crud.llm_cache_crud import llm_cache_crud
+from crud.task_crud import task_crud
+from db.mongo import close_mongo_connection, connect_to_mongo
+from services.event_loop_monitor import (
+    EVENT_LOOP_MONITOR,
+    is_event_loop_monitor_enabled,
+)
+from services.executor_service import EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.image_transform_cache_service import IMAGE_TRANSFORM_CACHE_SERVICE
+from services.llm_sdk_client_registry import LLM_SDK_CLIENT_REGISTRY
+from utils.get_env import get_app_data_directory_env
+
+
+async def main(concurrency: int | None):
+    app_data_dir = get_app_data_directory_env() or "./app_data"
+    os.makedirs(app_data_dir, exist_ok=True)
+
+    if is_event_loop_monitor_enabled():
+        EVENT_LOOP_MONITOR.start()
+
+    HTTP_CLIENT_SERVICE.start()
+    await connect_to_mongo()
+    await llm_cache_crud.ensure_indexes()
+    await task_crud.ensure_indexes()
+    await generation_checkpoint_crud.ensure_indexes()
+    await asset_crud.ensure_image_cache_indexes()
+    await EXECUTOR_SERVICE.io.run(IMAGE_TRANSFORM_CACHE_SERVICE.prune)
+
+    worker = get_presentation_generation_worker()
+    if concurrency:
+        worker.concurrency = concurrency
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    worker.start()
+    await stop_event.wait()
+
+    print(f"Stopping worker {worker.worker_id}")
+    await worker.stop()
+    await LLM_SDK_CLIENT_REGISTRY.close()
+    await HTTP_CLIENT_SERVICE.close()
+    EXECUTOR_SERVICE.shutdown()
+    await close_mongo_connection()
+    await EVENT_LOOP_MONITOR.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a worker for queued presentation generation tasks",
+        epilog=(
+            "Files uploaded with a request are read from their path on the API "
+            "server, so the worker must share its TEMP_DIRECTORY."
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of tasks run at the same time by this worker",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency))